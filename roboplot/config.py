@@ -22,6 +22,7 @@ else:
 # Debugging image paths
 debug_image_file_path = os.path.join(resources_dir, 'Challenge_2_Test_Images', 'multiplePaths_test2.png')
 debug_output_folder = os.path.join(resources_dir, 'DebugImages')
+trajectory_file_path = os.path.join(debug_output_folder, 'Trajectory.trj')
 
 # Camera constants
 X_PIXELS_TO_MILLIMETRE_SCALE = 0.237
@@ -0,0 +1,123 @@
+"""
+Curve Cache Module
+
+This module keeps the points into which curves have recently been split, so that a curve which is followed more than
+once (e.g. when the same job is drawn again, or when the plotter moves to the start of a curve before following it)
+need only be split once.
+
+Entries are keyed by the geometry of the curve rather than by the curve object, so that identical curves (e.g. those
+parsed again from the same svg file) share an entry. The cache is bounded by the total number of bytes in the arrays
+it holds, and when full it discards the least recently used entries. Since the same array may be handed to several
+callers, the arrays are made read-only.
+"""
+
+import collections
+import threading
+
+import numpy as np
+
+default_max_bytes = 32 * 2 ** 20
+
+
+class CacheStatistics:
+    """A snapshot of the performance of a CurveCache."""
+
+    def __init__(self, hits: int, misses: int, evictions: int, num_entries: int, num_bytes: int, max_bytes: int):
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self.num_entries = num_entries
+        self.num_bytes = num_bytes
+        self.max_bytes = max_bytes
+
+    @property
+    def hit_rate(self) -> float:
+        """The proportion of lookups which were found in the cache, or NaN if there have been none."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else np.nan
+
+    def __str__(self):
+        return ('{} hits, {} misses ({:.0%} hit rate), {} evictions; {} entries using {:.1f} of {:.1f} MiB'
+                .format(self.hits, self.misses, self.hit_rate, self.evictions, self.num_entries,
+                        self.num_bytes / 2 ** 20, self.max_bytes / 2 ** 20))
+
+
+class CurveCache:
+    """A least recently used cache of arrays, bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes: int = default_max_bytes):
+        """
+        Args:
+            max_bytes (int): The largest total size of the arrays to hold. Arrays larger than this are never held.
+        """
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self.clear()
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int):
+        with self._lock:
+            self._max_bytes = value
+            self._evict_until_within_size()
+
+    def get_or_compute(self, key, compute) -> np.ndarray:
+        """
+        Look up an array, computing and storing it if it is not held.
+
+        Args:
+            key: A hashable key which identifies the array.
+            compute (callable): A function of no arguments which returns the array.
+
+        Returns:
+            np.ndarray: The array, which is read-only.
+        """
+        with self._lock:
+            array = self._entries.get(key)
+            if array is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return array
+            self._misses += 1
+
+        # Compute outside the lock so that other threads aren't held up. At worst, two threads compute the same array.
+        array = np.asarray(compute())
+        array.flags.writeable = False
+
+        with self._lock:
+            if key not in self._entries and array.nbytes <= self._max_bytes:
+                self._entries[key] = array
+                self._num_bytes += array.nbytes
+                self._evict_until_within_size()
+
+        return array
+
+    def clear(self) -> None:
+        """Discard all the entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._num_bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    @property
+    def statistics(self) -> CacheStatistics:
+        with self._lock:
+            return CacheStatistics(hits=self._hits, misses=self._misses, evictions=self._evictions,
+                                   num_entries=len(self._entries), num_bytes=self._num_bytes,
+                                   max_bytes=self._max_bytes)
+
+    def _evict_until_within_size(self):
+        while self._num_bytes > self._max_bytes:
+            _, array = self._entries.popitem(last=False)
+            self._num_bytes -= array.nbytes
+            self._evictions += 1
+
+
+# The cache used by Curve.to_series_of_points()
+cache = CurveCache()
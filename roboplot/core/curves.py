@@ -4,8 +4,12 @@ Defines the curves which Robo-Plot is capable of drawing.
 All distances in the module are expressed in MILLIMETRES.
 """
 
+import math
+
 import numpy as np
 
+import roboplot.core.curve_cache as curve_cache
+
 
 class Curve:
     @property
@@ -13,6 +17,15 @@ class Curve:
         """The total length of the curve (in MILLIMETRES)."""
         raise NotImplementedError("The total length property must be overriden in derived classes.")
 
+    @property
+    def bounding_box(self) -> np.ndarray:
+        """
+        A box containing the whole curve, as a 2x2 matrix whose first row is the smallest (y,x) point and whose second
+        row is the largest (in MILLIMETRES). This should be cheap to compute, since it is used to check whether the
+        curve might cross the soft limits before following it.
+        """
+        raise NotImplementedError("The bounding box property must be overriden in derived classes.")
+
     @property
     def first_point(self) -> np.ndarray:
         """The first point on the curve"""
@@ -21,15 +34,59 @@ class Curve:
     def to_series_of_points(self, interval_millimetres: float, include_last_point: bool = True) -> np.ndarray:
         """Express the curve by a series of points.
 
+        The points are kept in curve_cache.cache, so following the same curve again need not recompute them.
+
         Args:
             interval_millimetres (float): The size of each interval (in MILLIMETRES)
             include_last_point (bool): If true then the series of points will include the last point on the curve.
                                        Otherwise it will not, which is useful when chaining svg_curves.
 
         Returns:
-            np.ndarray: An nx2 matrix whose ith row is the ith point (in MILLIMETRES) to which to move the axes.
+            np.ndarray: An nx2 matrix whose ith row is the ith point (in MILLIMETRES) to which to move the axes. If the
+                        points were cached then the matrix is read-only.
+
+        """
+        return self._cached_points(('interval', interval_millimetres, include_last_point),
+                                   lambda: self._compute_series_of_points(interval_millimetres, include_last_point))
+
+    def to_series_of_points_within_tolerance(self, tolerance_millimetres: float,
+                                             include_last_point: bool = True) -> np.ndarray:
+        """Express the curve by as few points as possible, such that the chord between each consecutive pair of points
+        lies within a tolerance of the curve.
+
+        Unlike to_series_of_points(), this spends points where the curve bends, rather than evenly along its length. A
+        straight line needs only its two end points, however long it is.
+
+        Args:
+            tolerance_millimetres (float): The greatest distance allowed between a chord and the curve (in MILLIMETRES)
+            include_last_point (bool): As for to_series_of_points()
+
+        Returns:
+            np.ndarray: An nx2 matrix whose ith row is the ith point (in MILLIMETRES) to which to move the axes. If the
+                        points were cached then the matrix is read-only.
+        """
+        return self._cached_points(('tolerance', tolerance_millimetres, include_last_point),
+                                   lambda: self._compute_series_of_points_within_tolerance(tolerance_millimetres,
+                                                                                           include_last_point))
+
+    def _cached_points(self, sampling_key: tuple, compute) -> np.ndarray:
+        """Look up a series of points in curve_cache.cache, identified by the way in which the curve was sampled."""
+        geometry_key = self._geometry_key
+        if geometry_key is None:
+            return compute()
+        else:
+            return curve_cache.cache.get_or_compute((geometry_key,) + sampling_key, compute)
 
+    @property
+    def _geometry_key(self):
+        """
+        A hashable value which is equal for curves with the same geometry, or None if the points on the curve should not
+        be cached. This should be overridden in derived classes.
         """
+        return None
+
+    def _compute_series_of_points(self, interval_millimetres: float, include_last_point: bool) -> np.ndarray:
+        """Compute the series of points returned by to_series_of_points()."""
         arc_lengths = np.arange(0, self.total_millimetres, interval_millimetres, dtype=float)
 
         if include_last_point:
@@ -37,6 +94,37 @@ class Curve:
 
         return self.evaluate_at(arc_lengths)
 
+    # So that the midpoint of a curve which doubles back on itself (e.g. a circle) is not mistaken for the middle of a
+    # straight line
+    _min_intervals_within_tolerance = 4
+
+    def _compute_series_of_points_within_tolerance(self, tolerance_millimetres: float,
+                                                   include_last_point: bool) -> np.ndarray:
+        """
+        Compute the series of points returned by to_series_of_points_within_tolerance().
+
+        This general version repeatedly halves each interval whose midpoint lies outside the tolerance of its chord.
+        Derived classes which can do better should override it.
+        """
+        arc_lengths = np.linspace(0, self.total_millimetres, self._min_intervals_within_tolerance + 1)
+        points = self.evaluate_at(arc_lengths)
+
+        while True:
+            mid_arc_lengths = (arc_lengths[:-1] + arc_lengths[1:]) / 2
+            mid_points = self.evaluate_at(mid_arc_lengths)
+
+            # An interval no longer than twice the tolerance cannot stray any further than that from its chord
+            needs_splitting = _distances_from_chords(mid_points, points[:-1], points[1:]) > tolerance_millimetres
+            needs_splitting &= np.diff(arc_lengths) > 2 * tolerance_millimetres
+            if not np.any(needs_splitting):
+                break
+
+            insert_at = np.flatnonzero(needs_splitting) + 1
+            arc_lengths = np.insert(arc_lengths, insert_at, mid_arc_lengths[needs_splitting])
+            points = np.insert(points, insert_at, mid_points[needs_splitting], axis=0)
+
+        return points if include_last_point else points[:-1]
+
     def evaluate_at(self, arc_lengths: np.ndarray) -> np.ndarray:
         """
         This method should be overridden in derived classes to return the coordinates on the curve at (a) given
@@ -64,6 +152,10 @@ class Curve:
     def offset(self, amount_by_which_to_offset):
         return OffsetCurve(self, amount_by_which_to_offset)
 
+    def reversed(self):
+        """Returns: Curve: the same curve, traversed from its end to its start."""
+        return ReversedCurve(self)
+
 
 class OffsetCurve(Curve):
     def __init__(self, original_curve: Curve, offset: np.ndarray):
@@ -81,13 +173,62 @@ class OffsetCurve(Curve):
     def total_millimetres(self):
         return self._original_curve.total_millimetres
 
+    @property
+    def bounding_box(self):
+        return self._original_curve.bounding_box + self._offset
+
+    @property
+    def _geometry_key(self):
+        original_key = self._original_curve._geometry_key
+        return None if original_key is None else ('OffsetCurve', original_key, tuple(np.reshape(self._offset, 2)))
+
     def evaluate_at(self, arc_lengths: np.ndarray):
         return self._original_curve.evaluate_at(arc_lengths) + self._offset
 
+    def _compute_series_of_points_within_tolerance(self, tolerance_millimetres: float,
+                                                   include_last_point: bool) -> np.ndarray:
+        return self._original_curve.to_series_of_points_within_tolerance(tolerance_millimetres,
+                                                                         include_last_point) + self._offset
+
     def get_start_point(self):
         return self._original_curve.get_start_point() + self._offset
 
 
+class ReversedCurve(Curve):
+    def __init__(self, original_curve: Curve):
+        """
+        Create a curve which traverses another curve backwards.
+
+        Args:
+            original_curve: the original curve
+        """
+        self._original_curve = original_curve
+
+    @property
+    def total_millimetres(self):
+        return self._original_curve.total_millimetres
+
+    @property
+    def bounding_box(self):
+        return self._original_curve.bounding_box
+
+    @property
+    def _geometry_key(self):
+        original_key = self._original_curve._geometry_key
+        return None if original_key is None else ('ReversedCurve', original_key)
+
+    def evaluate_at(self, arc_lengths: np.ndarray):
+        return self._original_curve.evaluate_at(self.total_millimetres - np.asarray(arc_lengths, dtype=float))
+
+    def _compute_series_of_points_within_tolerance(self, tolerance_millimetres: float,
+                                                   include_last_point: bool) -> np.ndarray:
+        points = self._original_curve.to_series_of_points_within_tolerance(tolerance_millimetres)[::-1]
+        return points if include_last_point else points[:-1]
+
+    def reversed(self):
+        return self._original_curve
+
+
 class LineSegment(Curve):
     def __init__(self, start: np.ndarray, end: np.ndarray):
         """Define a line segment.
@@ -107,6 +248,14 @@ class LineSegment(Curve):
     def total_millimetres(self) -> float:
         return np.linalg.norm(self.end - self.start)
 
+    @property
+    def bounding_box(self) -> np.ndarray:
+        return np.vstack((np.minimum(self.start, self.end), np.maximum(self.start, self.end)))
+
+    @property
+    def _geometry_key(self):
+        return 'LineSegment', tuple(self.start), tuple(self.end)
+
     def evaluate_at(self, arc_lengths: np.ndarray) -> np.ndarray:
         arc_lengths = np.reshape(arc_lengths, (-1, 1))  # Make it a column vector
         with np.errstate(divide='ignore', invalid='ignore'):
@@ -114,9 +263,86 @@ class LineSegment(Curve):
             t[np.isnan(t)] = 0
         return (1 - t) * self.start + t * self.end
 
+    def _compute_series_of_points_within_tolerance(self, tolerance_millimetres: float,
+                                                   include_last_point: bool) -> np.ndarray:
+        return np.vstack((self.start, self.end) if include_last_point else (self.start,)).astype(float)
+
     def get_start_point(self):
         return self.start
 
+    def reversed(self):
+        return LineSegment(self.end, self.start)
+
+
+class Polyline(Curve):
+    def __init__(self, vertices: np.ndarray):
+        """
+        Define a polyline: the line segments joining a series of vertices, followed as a single curve.
+
+        This is much cheaper than a list of LineSegment objects when there are many vertices, since a point on it is
+        found by searching the cumulative lengths of its segments.
+
+        Args:
+            vertices (np.ndarray): An nx2 matrix whose ith row is the ith (y,x) vertex (in MILLIMETRES). There must be
+                                   at least one vertex.
+        """
+        self.vertices = np.array(vertices, dtype=float).reshape(-1, 2)
+        assert len(self.vertices) > 0, "A polyline must have at least one vertex!"
+        self.vertices.flags.writeable = False
+
+        # The arc length at each vertex
+        self.cumulative_millimetres = _cumulative_chord_lengths(self.vertices)
+        self._key = 'Polyline', self.vertices.tobytes()
+
+    @property
+    def total_millimetres(self) -> float:
+        return self.cumulative_millimetres[-1]
+
+    @property
+    def bounding_box(self) -> np.ndarray:
+        return np.vstack((np.min(self.vertices, axis=0), np.max(self.vertices, axis=0)))
+
+    @property
+    def _geometry_key(self):
+        return self._key
+
+    def evaluate_at(self, arc_lengths: np.ndarray) -> np.ndarray:
+        arc_lengths = np.reshape(arc_lengths, -1).astype(float)
+        if len(self.vertices) == 1:
+            return np.repeat(self.vertices, len(arc_lengths), axis=0)
+
+        # Taking the last segment which starts at or before each arc length skips over segments of no length
+        segments = np.searchsorted(self.cumulative_millimetres, arc_lengths, side='right') - 1
+        segments = np.clip(segments, 0, len(self.vertices) - 2)
+
+        segment_starts = self.cumulative_millimetres[segments]
+        segment_lengths = self.cumulative_millimetres[segments + 1] - segment_starts
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.where(segment_lengths > 0, (arc_lengths - segment_starts) / segment_lengths, 0)
+
+        start_points = self.vertices[segments]
+        return start_points + t[:, np.newaxis] * (self.vertices[segments + 1] - start_points)
+
+    def _compute_series_of_points(self, interval_millimetres: float, include_last_point: bool) -> np.ndarray:
+        # Keep the vertices, as a list of line segments would, so that the corners are not cut
+        arc_lengths = np.union1d(np.arange(0, self.total_millimetres, interval_millimetres, dtype=float),
+                                 self.cumulative_millimetres[:-1])
+
+        if include_last_point:
+            arc_lengths = np.append(arc_lengths, self.total_millimetres)
+
+        return self.evaluate_at(arc_lengths)
+
+    def _compute_series_of_points_within_tolerance(self, tolerance_millimetres: float,
+                                                   include_last_point: bool) -> np.ndarray:
+        return self.vertices.copy() if include_last_point else self.vertices[:-1].copy()
+
+    def get_start_point(self):
+        return self.vertices[0]
+
+    def reversed(self):
+        return Polyline(self.vertices[::-1])
+
 
 class CircularArc(Curve):
     def __init__(self, centre: np.ndarray, radius: float, start_degrees: float, end_degrees: float):
@@ -142,6 +368,24 @@ class CircularArc(Curve):
         radians = np.deg2rad(self.end_degrees - self.start_degrees)
         return abs(radians) * self.radius
 
+    @property
+    def bounding_box(self) -> np.ndarray:
+        # The extremes of the arc lie at its ends, or where it crosses an axis through the centre (i.e. at a multiple
+        # of 90 degrees). Note that, like evaluate_at(), this takes the arc to run anticlockwise from the start angle.
+        start_radians = np.deg2rad(self.start_degrees)
+        end_radians = start_radians + self.total_millimetres / self.radius if self.radius != 0 else start_radians
+        first_quadrant = np.ceil(start_radians / (np.pi / 2))
+        last_quadrant = min(np.floor(end_radians / (np.pi / 2)), first_quadrant + 3)
+
+        radians = np.concatenate(([start_radians, end_radians],
+                                  np.arange(first_quadrant, last_quadrant + 1) * np.pi / 2))
+        points = self.radius * np.column_stack((np.sin(radians), np.cos(radians))) + self.centre  # (y,x)
+        return np.vstack((np.min(points, axis=0), np.max(points, axis=0)))
+
+    @property
+    def _geometry_key(self):
+        return 'CircularArc', tuple(self.centre), self.radius, self.start_degrees, self.end_degrees
+
     def evaluate_at(self, arc_lengths: np.ndarray) -> np.ndarray:
         if self.radius == 0:
             return np.copy(self.centre.reshape(1, 2))
@@ -152,6 +396,18 @@ class CircularArc(Curve):
             points = self.radius * points + self.centre
             return points
 
+    def _compute_series_of_points_within_tolerance(self, tolerance_millimetres: float,
+                                                   include_last_point: bool) -> np.ndarray:
+        # A chord spanning an angle a lies at most r(1 - cos(a/2)) from the arc
+        if self.radius == 0:
+            num_intervals = 1
+        else:
+            max_radians = 2 * np.arccos(max(1 - tolerance_millimetres / self.radius, -1))
+            num_intervals = max(int(np.ceil(self.total_millimetres / self.radius / max_radians)), 1)
+
+        arc_lengths = np.linspace(0, self.total_millimetres, num_intervals + 1)
+        return self.evaluate_at(arc_lengths if include_last_point else arc_lengths[:-1])
+
     def get_start_point(self):
         return self.centre + np.array([self.radius * np.cos(np.deg2rad(self.start_degrees)),
                                        self.radius * np.sin(np.deg2rad(self.start_degrees))])
@@ -171,3 +427,240 @@ class Circle(CircularArc):
                              radius=radius,
                              start_degrees=0,
                              end_degrees=360)
+
+
+class ParametricCurve(Curve):
+    """
+    A curve defined by its points at a parameter, t, running from 0 to 1, which need not be proportional to arc length.
+
+    Derived classes need only implement _points_at(). The arc length at closely spaced values of t is tabulated when it
+    is first needed, and arc lengths are then mapped to values of t by interpolating in the table.
+    """
+
+    # The arc length between entries in the table
+    _arc_length_table_spacing_mm = 0.05
+
+    @property
+    def total_millimetres(self) -> float:
+        return self._arc_length_table[1][-1]
+
+    def evaluate_at(self, arc_lengths: np.ndarray) -> np.ndarray:
+        t_values, lengths = self._arc_length_table
+        return self._points_at(np.interp(np.reshape(arc_lengths, -1), lengths, t_values))
+
+    def _points_at(self, t: np.ndarray) -> np.ndarray:
+        """
+        This method should be overridden in derived classes to return the points at given values of the parameter.
+
+        Args:
+            t (np.ndarray): A vector of values of the parameter, between 0 and 1.
+
+        Returns:
+            np.ndarray: An nx2 matrix whose ith row is the (y,x) point at the ith value of t.
+        """
+        raise NotImplementedError("The parameterisation method must be overridden in derived classes.")
+
+    @property
+    def _arc_length_table(self):
+        """The values of t, and the arc lengths at which they lie, built on first use."""
+        if getattr(self, '_table', None) is None:
+            # Estimate the length from a coarse table, and then space the entries of the real one evenly
+            coarse_length = _cumulative_chord_lengths(self._points_at(np.linspace(0, 1, 65)))[-1]
+            num_intervals = 2 * max(int(np.ceil(coarse_length / self._arc_length_table_spacing_mm / 2)), 32)
+
+            t_values = np.linspace(0, 1, num_intervals + 1)
+            points = self._points_at(t_values)
+            lengths = _cumulative_chord_lengths(points)
+
+            # Chords fall short of the arc by an amount roughly proportional to the square of their length, so compare
+            # with chords twice as long to correct the total
+            total_length = (4 * lengths[-1] - _cumulative_chord_lengths(points[::2])[-1]) / 3
+            if lengths[-1] > 0:
+                lengths *= total_length / lengths[-1]
+
+            self._table = t_values, lengths
+        return self._table
+
+    def _uniform_points_within_tolerance(self, num_intervals: int, include_last_point: bool) -> np.ndarray:
+        """Split the parameter into equal intervals, which derived classes have found to be within the tolerance."""
+        t_values = np.linspace(0, 1, max(num_intervals, 1) + 1)
+        return self._points_at(t_values if include_last_point else t_values[:-1])
+
+
+class BezierCurve(ParametricCurve):
+    def __init__(self, control_points: np.ndarray):
+        """
+        Define a Bezier curve.
+
+        Args:
+            control_points (np.ndarray): An nx2 matrix whose rows are the (y,x) control points (in MILLIMETRES), from the
+                                         start point to the end point. The degree of the curve is one less than the
+                                         number of control points.
+        """
+        self.control_points = np.array(control_points, dtype=float).reshape(-1, 2)
+
+        # The coefficients of the polynomial in t for each axis, lowest power first
+        degree = len(self.control_points) - 1
+        self._coefficients = np.dot(_bernstein_to_power_basis(degree), self.control_points)
+
+    @property
+    def degree(self) -> int:
+        return len(self.control_points) - 1
+
+    def _points_at(self, t: np.ndarray) -> np.ndarray:
+        return np.dot(np.vander(t, self.degree + 1, increasing=True), self._coefficients)
+
+    @property
+    def bounding_box(self) -> np.ndarray:
+        # The extremes lie at the ends, or where the derivative along one of the axes is zero
+        t_values = [0, 1]
+        derivative_coefficients = self._coefficients[1:] * np.arange(1, self.degree + 1).reshape(-1, 1)
+        for axis in range(2):
+            roots = np.roots(derivative_coefficients[::-1, axis])
+            t_values.extend(t.real for t in roots if abs(t.imag) < 1e-12 and 0 < t.real < 1)
+
+        points = self._points_at(np.array(t_values))
+        return np.vstack((np.min(points, axis=0), np.max(points, axis=0)))
+
+    @property
+    def _geometry_key(self):
+        return 'BezierCurve', tuple(self.control_points.ravel())
+
+    def _compute_series_of_points_within_tolerance(self, tolerance_millimetres: float,
+                                                   include_last_point: bool) -> np.ndarray:
+        # Splitting a Bezier curve of degree d into n equal parameter intervals gives chords within d(d-1)M/(8n^2) of
+        # the curve, where M is the largest second difference of its control points
+        if self.degree < 2:
+            num_intervals = 1
+        else:
+            second_differences = np.diff(self.control_points, n=2, axis=0)
+            max_second_difference = np.max(np.linalg.norm(second_differences, axis=1))
+            num_intervals = int(np.ceil(np.sqrt(self.degree * (self.degree - 1) * max_second_difference /
+                                                (8 * tolerance_millimetres))))
+        return self._uniform_points_within_tolerance(num_intervals, include_last_point)
+
+
+class QuadraticBezier(BezierCurve):
+    def __init__(self, start: np.ndarray, control: np.ndarray, end: np.ndarray):
+        """
+        Define a quadratic Bezier curve.
+
+        Args:
+            start (np.ndarray): The 2D start point (in MILLIMETRES).
+            control (np.ndarray): The 2D control point (in MILLIMETRES).
+            end (np.ndarray): The 2D end point (in MILLIMETRES).
+        """
+        BezierCurve.__init__(self, [start, control, end])
+
+
+class CubicBezier(BezierCurve):
+    def __init__(self, start: np.ndarray, first_control: np.ndarray, second_control: np.ndarray, end: np.ndarray):
+        """
+        Define a cubic Bezier curve.
+
+        Args:
+            start (np.ndarray): The 2D start point (in MILLIMETRES).
+            first_control (np.ndarray): The 2D control point nearest the start (in MILLIMETRES).
+            second_control (np.ndarray): The 2D control point nearest the end (in MILLIMETRES).
+            end (np.ndarray): The 2D end point (in MILLIMETRES).
+        """
+        BezierCurve.__init__(self, [start, first_control, second_control, end])
+
+
+class EllipticalArc(ParametricCurve):
+    def __init__(self, centre: np.ndarray, x_radius: float, y_radius: float, rotation_degrees: float,
+                 start_degrees: float, end_degrees: float):
+        """
+        Define an arc of an ellipse.
+
+        Before it is rotated, the ellipse has radius x_radius along the x-axis and y_radius along the y-axis, and its
+        point at an angle a (the parametric angle, as in svg) is centre + (y_radius*sin(a), x_radius*cos(a)). Unlike a
+        CircularArc, the arc runs from start_degrees to end_degrees in whichever direction that is.
+
+        Args:
+            centre (np.ndarray): A 2-element vector specifying the centre of the ellipse (in MILLIMETRES)
+            x_radius (float): The radius along the first axis of the ellipse (in MILLIMETRES)
+            y_radius (float): The radius along the second axis of the ellipse (in MILLIMETRES)
+            rotation_degrees (float): The angle from the x-axis towards the y-axis of the first axis (in DEGREES)
+            start_degrees (float): The parametric angle at the start of the arc (in DEGREES)
+            end_degrees (float): The parametric angle at the end of the arc (in DEGREES)
+        """
+        self.centre = np.reshape(centre, 2).astype(float)
+        self.x_radius = x_radius
+        self.y_radius = y_radius
+        self.rotation_degrees = rotation_degrees
+        self.start_degrees = start_degrees
+        self.end_degrees = end_degrees
+
+    def _points_at(self, t: np.ndarray) -> np.ndarray:
+        return self._points_at_angles(np.deg2rad(self.start_degrees + t * (self.end_degrees - self.start_degrees)))
+
+    def _points_at_angles(self, radians: np.ndarray) -> np.ndarray:
+        rotation = np.deg2rad(self.rotation_degrees)
+        unrotated_x = self.x_radius * np.cos(radians)
+        unrotated_y = self.y_radius * np.sin(radians)
+        x = unrotated_x * np.cos(rotation) - unrotated_y * np.sin(rotation)
+        y = unrotated_x * np.sin(rotation) + unrotated_y * np.cos(rotation)
+        return np.column_stack((y, x)) + self.centre
+
+    @property
+    def bounding_box(self) -> np.ndarray:
+        # The extremes along each axis lie at the ends of the arc, or every half turn from where the derivative along
+        # that axis is zero
+        rotation = np.deg2rad(self.rotation_degrees)
+        first_radians, last_radians = sorted(np.deg2rad([self.start_degrees, self.end_degrees]))
+        radians = [first_radians, last_radians]
+        for turning_radians in (np.arctan2(-self.y_radius * np.sin(rotation), self.x_radius * np.cos(rotation)),
+                                np.arctan2(self.y_radius * np.cos(rotation), self.x_radius * np.sin(rotation))):
+            first_half_turn = np.ceil((first_radians - turning_radians) / np.pi)
+            last_half_turn = min(np.floor((last_radians - turning_radians) / np.pi), first_half_turn + 3)
+            radians.extend(turning_radians + np.pi * np.arange(first_half_turn, last_half_turn + 1))
+
+        points = self._points_at_angles(np.array(radians))
+        return np.vstack((np.min(points, axis=0), np.max(points, axis=0)))
+
+    @property
+    def _geometry_key(self):
+        return ('EllipticalArc', tuple(self.centre), self.x_radius, self.y_radius, self.rotation_degrees,
+                self.start_degrees, self.end_degrees)
+
+    def _compute_series_of_points_within_tolerance(self, tolerance_millimetres: float,
+                                                   include_last_point: bool) -> np.ndarray:
+        # As for a circular arc, using the larger radius since the ellipse is a circle of that radius squashed
+        radius = max(self.x_radius, self.y_radius)
+        if radius == 0:
+            num_intervals = 1
+        else:
+            max_radians = 2 * np.arccos(max(1 - tolerance_millimetres / radius, -1))
+            num_intervals = int(np.ceil(abs(np.deg2rad(self.end_degrees - self.start_degrees)) / max_radians))
+        return self._uniform_points_within_tolerance(num_intervals, include_last_point)
+
+
+def _bernstein_to_power_basis(degree: int) -> np.ndarray:
+    """The matrix which maps the control points of a Bezier curve to the coefficients of its polynomial in t."""
+    matrix = np.zeros((degree + 1, degree + 1))
+    for power in range(degree + 1):
+        for point in range(power + 1):
+            matrix[power, point] = (_binomial(degree, power) * _binomial(power, point) *
+                                    (-1) ** (power - point))
+    return matrix
+
+
+def _binomial(n: int, k: int) -> int:
+    return math.factorial(n) // (math.factorial(k) * math.factorial(n - k))
+
+
+def _cumulative_chord_lengths(points: np.ndarray) -> np.ndarray:
+    """The length along the chords joining a series of points, up to each point."""
+    return np.concatenate(([0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))))
+
+
+def _distances_from_chords(points: np.ndarray, chord_starts: np.ndarray, chord_ends: np.ndarray) -> np.ndarray:
+    """The distance of each point from the line through the corresponding chord (or its start, if it has no length)."""
+    chords = chord_ends - chord_starts
+    offsets = points - chord_starts
+    chord_lengths = np.linalg.norm(chords, axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        distances = np.abs(chords[:, 0] * offsets[:, 1] - chords[:, 1] * offsets[:, 0]) / chord_lengths
+    return np.where(chord_lengths > 0, distances, np.linalg.norm(offsets, axis=1))
@@ -1,7 +1,8 @@
 """
 Debug Movement Module
 
-This module creates a debug images showing the movement of the plotter.
+This module creates a debug images showing the movement of the plotter, either as it moves (DebugImage) or afterwards
+from a trajectory file (TrajectoryRenderer, see the trajectory_log module).
 
 """
 import os
@@ -22,20 +23,106 @@ class Colour:
     Purple = (255, 51, 153)
 
 
+# The colours used for pen-down drawing, in turn
+_pen_down_colours = [Colour.Pink, Colour.Light_Blue, Colour.Purple]
+
+
+def create_background(bgimage_path=None, pixels_per_mm=3):
+    """
+    Creates the image onto which the movement is drawn.
+
+    Args:
+        bgimage_path (str): An optional path to a background image, which is stretched to fit.
+        pixels_per_mm (float): This value should depend on the picture size chosen currently a 1:1 mappings
+
+    Returns:
+        np.ndarray: The image, large enough to show a sheet of A4 paper with a border.
+    """
+    a4paper_with_border = (315, 445.5)  # openCV asks for image dimensions as width then height.
+    image_dimensions_pixels = tuple(int(round(i * pixels_per_mm)) for i in a4paper_with_border)
+
+    if bgimage_path is not None:
+        image = cv2.imread(bgimage_path)
+
+        if image is None:
+            raise TypeError("Debug image could not be loaded")
+    else:
+        image = np.zeros(image_dimensions_pixels + (3,), np.uint8)
+
+    return cv2.resize(image, image_dimensions_pixels)
+
+
+class TrajectoryRenderer:
+    """
+    Draws the movement recorded in a trajectory file (see the trajectory_log module) onto images.
+
+    Pen-up movement is drawn in yellow, and each stretch of pen-down movement in the next of the pen-down colours.
+    """
+
+    def __init__(self, samples, pixels_per_mm=3):
+        """
+        Args:
+            samples (np.ndarray): The samples, with dtype trajectory_log.trajectory_sample_dtype.
+            pixels_per_mm (float): The scale of the images.
+        """
+        # The points are (y, x) but openCV asks for (x, y).
+        self._pixels = np.rint(samples['location'][:, ::-1] * pixels_per_mm).astype(np.int32)
+        pen_is_down = np.asarray(samples['pen_is_down'])
+
+        # Each stretch is drawn from the last point of the one before, as DebugImage does.
+        run_starts = np.flatnonzero(np.diff(pen_is_down)) + 1
+        self._run_first_points = np.concatenate(([0], run_starts - 1))
+        self._run_end_points = np.concatenate((run_starts, [len(pen_is_down)]))
+
+        run_is_down = pen_is_down[self._run_end_points - 1] if len(pen_is_down) > 0 else np.zeros(0, dtype=bool)
+        pen_down_runs = np.cumsum(run_is_down) - 1
+        self._run_colours = [_pen_down_colours[run % len(_pen_down_colours)] if is_down else Colour.Yellow
+                             for run, is_down in zip(pen_down_runs.tolist(), run_is_down.tolist())]
+
+    def __len__(self):
+        return len(self._pixels)
+
+    def draw(self, image, start=0, stop=None):
+        """
+        Draws part of the movement onto an image.
+
+        Drawing consecutive parts, e.g. one per frame of a video, gives the same image as drawing them all at once.
+
+        Args:
+            image (np.ndarray): The image to draw onto, e.g. as returned by create_background().
+            start (int): The index of the first sample to draw.
+            stop (int): The index after the last sample to draw, or None to draw up to the last sample.
+        """
+        stop = len(self) if stop is None else stop
+        # The stretches which end after the start and begin before the stop
+        first_run = np.searchsorted(self._run_end_points, start, side='right')
+        end_run = np.searchsorted(self._run_first_points, stop - 1, side='right')
+
+        for run in range(first_run, end_run):
+            # Carry on from the last sample drawn before this part
+            points = self._pixels[max(self._run_first_points[run], start - 1):min(self._run_end_points[run], stop)]
+            if len(points) == 1:
+                points = np.repeat(points, 2, axis=0)  # openCV draws nothing for a single point
+            cv2.polylines(image, [points], isClosed=False, color=self._run_colours[run])
+
+
 class DebugImage:
-    steps_since_save = 0
     image_index = 0
     colour_index = 0
     colour = Colour.Pink
     override_colour = None  # If not none, then this colour will be used instead of the 'colour' attribute
 
-    def __init__(self, millimetres_per_step, bgimage_path=None, pixels_per_mm=3):
+    # The number of points buffered before they are drawn onto the image
+    points_per_batch = 1024
+
+    def __init__(self, bgimage_path=None, pixels_per_mm=3):
         """
         Creates debug image.
 
+        The image is only saved when save_image() is called. To review the movement of the plotter, render the
+        trajectory file (see the trajectory_log module) afterwards instead.
+
         Args:
-            millimetres_per_step (float): The number of millimetres per step (used to compute the number of steps per
-                                          save)
             bgimage_path (str): An optional path to a background image to use for the debugger output.
             pixels_per_mm (float): This value should depend on the picture size chosen currently a 1:1 mappings
 
@@ -45,59 +132,57 @@ class DebugImage:
         if not os.path.exists(config.debug_output_folder):
             os.mkdir(config.debug_output_folder, 0o750)  # drwxr-x---
 
-        # Remove any existing debug files from folder
+        # Remove any existing debug files from folder, except the trajectory file (which may already be open, and is
+        # overwritten when opened anyway)
         file_list = [f for f in os.listdir(config.debug_output_folder) if os.path.isfile(os.path.join(config.debug_output_folder, f))]
         for file_name in file_list:
-            os.remove(config.debug_output_folder + "/" + file_name)
+            if os.path.join(config.debug_output_folder, file_name) != config.trajectory_file_path:
+                os.remove(config.debug_output_folder + "/" + file_name)
 
-        # Setup image dimensions
+        # Setup image
         self.pixels_per_mm = pixels_per_mm
-        a4paper_with_border = (315, 445.5)  # openCV asks for image dimensions as width then height.
-        self._image_dimensions_pixels = tuple(int(round(i * self.pixels_per_mm)) for i in a4paper_with_border)
-
-        # Background image
-        if bgimage_path is not None:
-            self.debug_image = cv2.imread(bgimage_path)
+        self.debug_image = create_background(bgimage_path, pixels_per_mm)
+        self._image_dimensions_pixels = self.debug_image.shape[1::-1]  # openCV gives width then height.
 
-            if self.debug_image is None:
-                raise TypeError("Debug image could not be loaded")
-        else:
-            self.debug_image = np.zeros(self._image_dimensions_pixels + (3,), np.uint8)
+        # The (y,x) points (in mm) not yet drawn, all of which are drawn in the same colour
+        self._points = np.empty((self.points_per_batch, 2))
+        self._num_points = 0
+        self._points_colour = None
 
-        self.debug_image = cv2.resize(self.debug_image, self._image_dimensions_pixels)
-
-        # Choose how often an image is saved.
-        self.millimeters_between_saves = 20
-        self.steps_between_saves = self.millimeters_between_saves / millimetres_per_step
-
-        # Initialise the image saver, and save the first image
+        # Initialise the image saver
         self._image_saver = ThreadedImageSaver()
-        self.save_image()
+
+    @property
+    def image(self) -> np.ndarray:
+        """The image, with all the points added so far drawn onto it. This is not a copy, so copy it before changing
+        it!"""
+        self._draw_points()
+        return self.debug_image
 
     def add_point(self, point):
         """
-        This function adds the locations to a buffer and periodically adds them to the image and displays the result.
+        This function adds the locations to a buffer and periodically adds them to the image.
 
         Args:
             point: Point to be added to the buffer (in mm)
         """
+        colour = self.override_colour or self.colour
+        if colour is not self._points_colour:
+            self._draw_points()
+            self._points_colour = colour
+        elif self._num_points == self.points_per_batch:
+            self._draw_points()
 
-        pixel = tuple(int(round(i * self.pixels_per_mm)) for i in point)
+        self._points[self._num_points] = point
+        self._num_points += 1
 
-        # The point is (y, x) and the shape is width height.
-        if 0 <= pixel[0] < self._image_dimensions_pixels[1] and \
-           0 <= pixel[1] < self._image_dimensions_pixels[0]:
-            self.debug_image[pixel] = self.override_colour or self.colour
-           # print(' Pixel: ' + str(pixel))
-        else:
-            warnings.warn('Tried to populate pixel out of image bounds.')
-
-
-        self.steps_since_save += 1
-
-        # If the buffer is sufficiently large save/display the image.
-        if self.steps_since_save > self.steps_between_saves:
-            self.save_image()
+    def end_line(self):
+        """
+        This function draws the buffered points, so that the next point added is not joined to them (for example
+        because the location has jumped rather than being stepped to).
+        """
+        self._draw_points()
+        self._num_points = 0
 
     def change_colour(self):
         """
@@ -105,20 +190,34 @@ class DebugImage:
         for pen-down drawing.
         """
 
-        scan = [Colour.Pink, Colour.Light_Blue, Colour.Purple]
-
-        self.colour_index = (self.colour_index + 1) % len(scan)
-        self.colour = scan[self.colour_index]
+        self.colour_index = (self.colour_index + 1) % len(_pen_down_colours)
+        self.colour = _pen_down_colours[self.colour_index]
 
     def save_image(self):
         savepath = os.path.join(config.debug_output_folder, "DebugImage_{i:04}.jpg".format(i=self.image_index))
 
         # Threaded in the hope that we can reduce time wasted waiting on IO
-        debug_image_copy = self.debug_image.copy()
+        debug_image_copy = self.image.copy()
         self._image_saver.save_image(img=debug_image_copy, savepath=savepath)
 
-        #self.image_index += 1
-        self.steps_since_save = 0
+        self.image_index += 1
+
+    def _draw_points(self):
+        """Draw the buffered points onto the image, as a line through them all."""
+        if self._num_points == 0:
+            return
+
+        # The points are (y, x) but openCV asks for (x, y).
+        pixels = np.rint(self._points[:self._num_points, ::-1] * self.pixels_per_mm).astype(np.int32)
+        if np.any(pixels < 0) or np.any(pixels >= self._image_dimensions_pixels):
+            warnings.warn('Tried to populate pixel out of image bounds.')
+        if len(pixels) == 1:
+            pixels = np.repeat(pixels, 2, axis=0)  # openCV draws nothing for a single point
+        cv2.polylines(self.debug_image, [pixels], isClosed=False, color=self._points_colour)
+
+        # Keep the last point, so that the next batch carries on from it.
+        self._points[0] = self._points[self._num_points - 1]
+        self._num_points = 1
 
 
 class ThreadedImageSaver:
@@ -151,7 +250,9 @@ class ThreadedImageSaver:
             self._restart_image_saver()
 
     def _restart_image_saver(self):
-        self._worker_thread = threading.Thread(target=self._image_saver_loop)
+        # Explicitly not a daemon (which it would otherwise be if we are called from a daemon thread, such as that
+        # running the plotter's moves), so that the program waits for the last images to be saved before exiting.
+        self._worker_thread = threading.Thread(target=self._image_saver_loop, daemon=False)
         self._worker_thread.start()
 
     def _image_saver_loop(self):
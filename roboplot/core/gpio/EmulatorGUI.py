@@ -11,6 +11,7 @@ draw_changes = False  # Set this to true at the top of scripts in order to view
 
 dictionaryPins = {}  # type: dict[str, PIN]
 dictionaryPinsTkinter = {}  # type: dict[str, Button]
+dictionaryEventDetects = {}  # type: dict[str, tuple]  # The (edge, callback) to trigger on changes to each input
 
 GPIONames = ["14", "15", "18", "23", "24", "25", "8", "7", "12", "16", "20", "21", "2", "3", "4", "17", "27", "22",
              "10", "9", "11", "5", "6", "13", "19", "26"]
@@ -294,6 +295,18 @@ def toggleButton(gpioID):
 
     objBtn["text"] = "gpio" + str(gpioID) + "\nIN=" + str(objPin.In)
 
+    triggerEventDetect(str(gpioID), objPin.In)
+
+
+def triggerEventDetect(gpioID, In):
+    if gpioID not in dictionaryEventDetects:
+        return
+
+    edge, callback = dictionaryEventDetects[gpioID]
+    if edge == GPIO.BOTH or (edge == GPIO.RISING and In == "1") or (edge == GPIO.FALLING and In == "0"):
+        if callback is not None:
+            callback(int(gpioID))
+
 
 def buttonClick(self):
     # print("clicked")
@@ -346,6 +359,9 @@ class GPIO:
     PUD_DOWN = 5
     PUD_UP = 6
     BCM = 7
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
 
     # flags
     setModeDone = False
@@ -412,8 +428,26 @@ class GPIO:
             dictionaryPins[str(channel)] = objTemp
 
     @staticmethod
-    @typeassert(int, int)
+    @typeassert((int, list, tuple), (int, list, tuple))
     def output(channel, outmode):
+        # As with RPi.GPIO, several channels may be written at once by passing a list or tuple of channels, along with
+        # either a single output mode for all of them or a list or tuple of output modes (one per channel).
+        if isinstance(channel, (list, tuple)):
+            if not isinstance(outmode, (list, tuple)):
+                outmode = [outmode] * len(channel)
+            if len(outmode) != len(channel):
+                raise Exception('Number of channels != number of output values')
+
+            for single_channel, single_outmode in zip(channel, outmode):
+                GPIO._output_single_channel(single_channel, single_outmode)
+        else:
+            if isinstance(outmode, (list, tuple)):
+                raise Exception('Only one output value may be given for a single channel')
+            GPIO._output_single_channel(channel, outmode)
+
+    @staticmethod
+    @typeassert(int, int)
+    def _output_single_channel(channel, outmode):
         global dictionaryPins
         channel = str(channel)
 
@@ -471,6 +505,35 @@ class GPIO:
                 elif objPin.In == "0":
                     return False
 
+    @staticmethod
+    @typeassert(int, int)
+    def add_event_detect(channel, edge, callback=None, bouncetime=-1):
+        # The callback is called (from the GUI thread) with the channel, as RPi.GPIO calls it from its own thread.
+        # Switch bounce is not emulated, so the bouncetime is ignored.
+        global dictionaryEventDetects
+        channel = str(channel)
+
+        GPIO.checkModeValidator()
+
+        if channel not in dictionaryPins:
+            raise Exception('gpio must be setup before used')
+        elif dictionaryPins[channel].SetMode != "IN":
+            raise Exception('gpio must be setup as IN')
+
+        if edge not in (GPIO.RISING, GPIO.FALLING, GPIO.BOTH):
+            raise Exception('Edge must be set to RISING/FALLING/BOTH')
+
+        if channel in dictionaryEventDetects:
+            raise RuntimeError('Conflicting edge detection already enabled for this GPIO channel')
+
+        dictionaryEventDetects[channel] = (edge, callback)
+
+    @staticmethod
+    @typeassert(int)
+    def remove_event_detect(channel):
+        dictionaryEventDetects.pop(str(channel), None)
+
     @staticmethod
     def cleanup():
         dictionaryPins.clear()
+        dictionaryEventDetects.clear()
@@ -34,8 +34,15 @@ x_limit_switches = (limit_switches.LimitSwitch(gpio_pin=8),  # Motor side
 y_limit_switches = (limit_switches.LimitSwitch(gpio_pin=9),  # Motor side
                     limit_switches.LimitSwitch(gpio_pin=11))  # Encoder side
 
-x_home_position = home_position.HomePosition(forwards=False, location=4.2)
-y_home_position = home_position.HomePosition(forwards=False, location=4)
+# Approach the switches quickly, then touch them again slowly for precision. The pretend switches used in simulation are
+# always hit precisely, so there we just home as fast as possible.
+if config.real_hardware:
+    homing_speeds = dict(approach_speed=25, approach_acceleration=100, retouch_speed=2)
+else:
+    homing_speeds = {}
+
+x_home_position = home_position.HomePosition(forwards=False, location=4.2, **homing_speeds)
+y_home_position = home_position.HomePosition(forwards=False, location=4, **homing_speeds)
 
 camera = camera_wrapper.Camera()
 
@@ -82,8 +89,11 @@ if not config.real_hardware:
 both_axes = stepper_control.AxisPair(y_axis, x_axis)
 
 pen = liftable_pen.LiftablePen(servo=servo, position_when_down=0.03, position_when_up=0.055)
-plotter = plotter_module.Plotter(both_axes, pen, camera, config.CAMERA_OFFSET)
 
 if __debug__:
+    # The plotter shares the axes, so that moves made through either are drawn on the same debug image and logged to
+    # the same trajectory file
     both_axes = stepper_control.AxisPairWithDebugImage.create_from(both_axes)
-    plotter = plotter_module.PlotterWithDebugImage.create_from(plotter)
+    plotter = plotter_module.PlotterWithDebugImage(both_axes, pen, camera, config.CAMERA_OFFSET)
+else:
+    plotter = plotter_module.Plotter(both_axes, pen, camera, config.CAMERA_OFFSET)
@@ -1,7 +1,32 @@
+import numpy as np
+
+
 class HomePosition:
     forwards = False
     location = 0
+    approach_speed = np.inf  # MILLIMETRES / SECOND
+    approach_acceleration = np.inf  # MILLIMETRES / SECOND^2
+    retouch_speed = None  # MILLIMETRES / SECOND
+
+    def __init__(self, forwards=forwards, location=location, approach_speed=approach_speed,
+                 approach_acceleration=approach_acceleration, retouch_speed=retouch_speed):
+        """
+        Describe how to home an axis.
+
+        The axis approaches the limit switch at the approach speed, accelerating from rest at the approach
+        acceleration, and then backs off. If a retouch speed is given then it then touches the switch a second time at
+        that (slower) speed, and the location of this second touch is used for homing. This allows a fast approach
+        without losing precision.
 
-    def __init__(self, forwards=forwards, location=location):
+        Args:
+            forwards (bool): true if the limit switch is in the 'forwards' direction
+            location (float): the location to set for the axis when the limit switch is pressed
+            approach_speed (float): the speed at which to approach the switch (np.inf for as fast as the motor allows)
+            approach_acceleration (float): the acceleration up to the approach speed (np.inf to start at full speed)
+            retouch_speed (float): the speed at which to touch the switch again after backing off (None to skip this)
+        """
         self.forwards = forwards
         self.location = location
+        self.approach_speed = approach_speed
+        self.approach_acceleration = approach_acceleration
+        self.retouch_speed = retouch_speed
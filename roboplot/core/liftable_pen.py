@@ -1,7 +1,16 @@
+from concurrent.futures import Future
+
 import roboplot.core.servo_motor as servo_motor
+import roboplot.core.timing as timing
 
 
 class LiftablePen:
+    """
+    A pen lifted and dropped by a servo.
+
+    The servo moves in the background, so lift() and drop() return straight away. Use wait() before moving the pen
+    across the paper.
+    """
 
     def __init__(self, servo: servo_motor.ServoMotor, position_when_down: float, position_when_up: float,
                  seconds_to_change_position: float = 0.25):
@@ -11,10 +20,91 @@ class LiftablePen:
         self._servo = servo
         self._position_when_down = position_when_down
         self._position_when_up = position_when_up
-        self._seconds_to_change_position = seconds_to_change_position
+        self.seconds_to_change_position = seconds_to_change_position
+
+        # Whether the pen is up (or is moving up), or None until we have first moved it
+        self._is_up = None
+
+        # The last move of the servo, and the time at which it is due to finish
+        self._last_move = Future()
+        self._last_move.set_result(None)
+        self._last_move_end_time = timing.now()
+
+    @property
+    def is_up(self):
+        """True if the pen is up (or moving up), False if it is down (or moving down), or None if it has not yet been
+        moved."""
+        return self._is_up
+
+    def lift(self, start_time: float = None) -> Future:
+        """
+        Lift the pen, unless it is already up.
+
+        Args:
+            start_time (float): the time (as given by timing.now()) at which to start lifting, or None for as soon as
+                                possible
+
+        Returns:
+            Future: completes once the pen is up
+        """
+        if self._is_up is not True:
+            self._move_servo(self._position_when_up, start_time, is_up=True)
+        return self._last_move
+
+    def drop(self, start_time: float = None) -> Future:
+        """
+        Drop the pen, unless it is already down.
+
+        Args:
+            start_time (float): the time (as given by timing.now()) at which to start dropping, or None for as soon as
+                                possible
+
+        Returns:
+            Future: completes once the pen is down
+        """
+        if self._is_up is not False:
+            self._move_servo(self._position_when_down, start_time, is_up=False)
+        return self._last_move
+
+    def wait(self, seconds_early: float = 0) -> None:
+        """
+        Block until the pen has finished moving.
+
+        Args:
+            seconds_early (float): if positive, then return this long before the pen is due to finish moving instead,
+                                   so that something else can start while the pen moves
+
+        Raises:
+            Exception: The exception raised by the last move of the servo, or CancelledError if that move was cancelled
+                       because an earlier move failed.
+        """
+        if seconds_early > 0:
+            timing.sleep_until(self._last_move_end_time - seconds_early)
+            if self._last_move.done():
+                self._last_move.result()  # Raise if the move has failed
+        else:
+            self._last_move.result()
+
+    def wait_for_servo(self) -> None:
+        """
+        Block until the servo has finished all its moves.
+
+        Raises:
+            Exception: The first exception raised by a move of the servo since the last call to wait_for_servo(). Once
+                       it has been raised, later moves of the servo are no longer cancelled.
+        """
+        self._servo.wait()
 
-    def lift(self):
-        self._servo.move_smoothly_to(self._position_when_up, self._seconds_to_change_position)
+    def _move_servo(self, position, start_time, is_up):
+        # The move starts once any earlier move has finished
+        start_time = max(timing.now() if start_time is None else start_time, self._last_move_end_time)
+        move = self._servo.move_smoothly_to(position, self.seconds_to_change_position, start_time)
+        self._last_move = move
+        self._last_move_end_time = start_time + self.seconds_to_change_position
+        self._is_up = is_up
 
-    def drop(self):
-        self._servo.move_smoothly_to(self._position_when_down, self._seconds_to_change_position)
+        # If the move fails then we no longer know where the pen is, so the next lift or drop must move the servo
+        def forget_position_on_failure(_):
+            if self._last_move is move and (move.cancelled() or move.exception() is not None):
+                self._is_up = None
+        move.add_done_callback(forget_position_on_failure)
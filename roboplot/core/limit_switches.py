@@ -13,18 +13,30 @@ class LimitSwitch:
         self._gpio_pin = gpio_pin
         GPIO.setup(self._gpio_pin, GPIO.IN)
 
+        # Rather than reading the pin whenever we want to know whether the switch is pressed (i.e. on every step), keep
+        # track of its state by detecting the edges on the pin. We enable the detection before the first read, so that
+        # an edge between the two cannot be missed.
+        GPIO.add_event_detect(self._gpio_pin, GPIO.BOTH, callback=self._on_edge)
+        self._is_pressed = self._read_pin()
+
     @property
     def is_pressed(self):
-        if GPIO.input(self._gpio_pin) == 0:
-            return True
-        else:
-            return False
+        return self._is_pressed
+
+    def _on_edge(self, channel):
+        self._is_pressed = self._read_pin()
+
+    def _read_pin(self):
+        return GPIO.input(self._gpio_pin) == 0
 
 
 class PretendLimitSwitch:
     """
     A replacement class to allow the scripts to run without hardware.
 
+    Rather than detecting edges on a pin, this class compares the location of its parent axis with its valid range each
+    time is_pressed is read. No GPIO is involved, so this is as cheap as reading the state kept by a LimitSwitch.
+
     Note that this class uses the Axis.current_location property, so if a limit switch with a valid range of 0 is
     used to home at 0, then a drift in the real position will be observed on repeated homes. Similarly for any other
     value for the home position.
@@ -0,0 +1,93 @@
+"""
+Motion Executor Module
+
+This module runs movements of the plotter on a background thread, so that the caller can get on with something else
+(e.g. planning the next move, or analysing a photo) while the motors are moving.
+
+Moves are run one at a time, in the order in which they were submitted. The queue of moves waiting to run is bounded,
+so a caller which submits moves faster than they can be carried out will be held up rather than running far ahead.
+"""
+
+import atexit
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class MotionExecutor:
+    default_max_queued_moves = 16
+
+    def __init__(self, max_queued_moves: int = default_max_queued_moves, name: str = 'Motion executor'):
+        """
+        Create a MotionExecutor and start its thread.
+
+        Args:
+            max_queued_moves (int): The number of moves which may wait to run before submit() blocks.
+            name (str): The name of the thread which runs the moves.
+        """
+        self._move_queue = queue.Queue(maxsize=max_queued_moves)
+        self._unreported_exception = None
+
+        self._worker = threading.Thread(target=self._process_move_queue, name=name, daemon=True)
+        self._worker.start()
+
+        # Since the thread is a daemon, make sure that a script does not exit with moves still to run
+        atexit.register(self.wait)
+
+    def submit(self, move, *args, **kwargs) -> Future:
+        """
+        Queue a move to be run after all those already submitted. This blocks while the queue is full.
+
+        If a move raises an exception, then any moves queued behind it are cancelled, since the plotter is no longer
+        where they expect it to be. The exception is re-raised by the next call to wait().
+
+        Args:
+            move (callable): The function which carries out the move. It is called with the remaining arguments.
+
+        Returns:
+            Future: A future which completes with the return value of the move.
+        """
+        future = Future()
+
+        # A move which itself submits a move must not wait for its own thread
+        if threading.current_thread() is self._worker:
+            self._run(future, move, args, kwargs)
+        else:
+            self._move_queue.put((future, move, args, kwargs))
+
+        return future
+
+    def wait(self) -> None:
+        """
+        Block until all the submitted moves have finished.
+
+        Raises:
+            Exception: The first exception raised by a move since the last call to wait().
+        """
+        self._move_queue.join()
+
+        exception, self._unreported_exception = self._unreported_exception, None
+        if exception is not None:
+            raise exception
+
+    def _process_move_queue(self):
+        while True:
+            future, move, args, kwargs = self._move_queue.get()
+            try:
+                if self._unreported_exception is not None:
+                    future.cancel()
+                else:
+                    self._run(future, move, args, kwargs)
+            finally:
+                self._move_queue.task_done()
+
+    def _run(self, future, move, args, kwargs):
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            future.set_result(move(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+            if self._unreported_exception is None:
+                self._unreported_exception = e
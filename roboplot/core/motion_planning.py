@@ -0,0 +1,207 @@
+"""
+Motion Planning Module
+
+This module plans the speed of the pen along a path of straight line moves, so that the axes accelerate and
+decelerate smoothly rather than starting and stopping at full speed on every move.
+
+The planner looks ahead along the whole path. The speed through each junction between two moves is limited according
+to the angle between them (using the 'junction deviation' approach), so that the pen slows for corners but can keep
+its speed along straight (or gently curving) runs. Each move then follows a trapezoidal velocity profile: accelerate,
+cruise, decelerate.
+
+All distances in the module are expressed in MILLIMETRES and all times in SECONDS.
+"""
+
+import math
+
+import numpy as np
+
+
+def plan_motion(points: np.ndarray,
+                max_speed: float,
+                acceleration: float = np.inf,
+                junction_deviation: float = 0.05,
+                max_axis_speeds=(np.inf, np.inf)):
+    """
+    Plan the motion of the pen along a path.
+
+    The pen starts and ends the path at rest.
+
+    Args:
+        points (np.ndarray): An nx2 matrix whose ith row is the ith (y,x) point on the path. (in MILLIMETRES)
+        max_speed (float): The maximum speed of the pen. (in MILLIMETRES / SECOND)
+        acceleration (float): The maximum acceleration of the pen. If this is infinite then the pen will move at a
+                              constant speed. (in MILLIMETRES / SECOND^2)
+        junction_deviation (float): Controls the speed through junctions between moves. Larger values allow higher
+                                    speeds around corners. (in MILLIMETRES)
+        max_axis_speeds (iterable): The maximum speeds of each of the (y,x) axes. (in MILLIMETRES / SECOND)
+
+    Returns:
+        MotionPlan: the planned motion
+    """
+    assert max_speed > 0, "The maximum speed must be positive!"
+    assert acceleration > 0, "The acceleration must be positive!"
+
+    points = np.reshape(points, (-1, 2))
+    point_indices = _indices_of_unrepeated_points(points)
+    points = points[point_indices]
+    if len(points) < 2:
+        return MotionPlan(points, *np.zeros((3, 0)), acceleration=acceleration, point_indices=point_indices)
+
+    lengths = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    directions = np.diff(points, axis=0) / lengths[:, np.newaxis]
+
+    # Limit the speed on each move so that neither axis exceeds its maximum speed
+    with np.errstate(divide='ignore'):
+        axis_limited_speeds = np.min(np.asarray(max_axis_speeds, dtype=float) / np.abs(directions), axis=1)
+    cruise_speeds = np.minimum(max_speed, axis_limited_speeds)
+
+    # Limit the speed at each junction, then make sure that these speeds are achievable from their neighbours
+    junction_speeds = _junction_speeds(directions, cruise_speeds, acceleration, junction_deviation)
+    junction_speeds = _limit_by_acceleration(junction_speeds, lengths, acceleration)
+
+    return MotionPlan(points, junction_speeds[:-1], cruise_speeds, junction_speeds[1:], acceleration=acceleration,
+                      point_indices=point_indices)
+
+
+def _indices_of_unrepeated_points(points):
+    is_repeat = np.concatenate(([False], np.all(np.diff(points, axis=0) == 0, axis=1)))
+    return np.flatnonzero(~is_repeat)
+
+
+def _junction_speeds(directions, cruise_speeds, acceleration, junction_deviation):
+    """Compute the maximum speed at each point on the path, including the (stationary) start and end."""
+    max_speeds = np.minimum(cruise_speeds[:-1], cruise_speeds[1:])
+
+    if not np.isinf(acceleration):
+        # The speed at which the centripetal acceleration around a circle (of a size determined by the junction
+        # deviation) tangent to both moves would equal the maximum acceleration.
+        cos_theta = np.clip(-np.sum(directions[:-1] * directions[1:], axis=1), -1, 1)
+        sin_half_theta = np.sqrt(0.5 * (1 - cos_theta))
+        with np.errstate(divide='ignore'):
+            max_speeds = np.minimum(
+                max_speeds,
+                np.sqrt(acceleration * junction_deviation * sin_half_theta / (1 - sin_half_theta)))
+
+    return np.concatenate(([0], max_speeds, [0]))
+
+
+def _limit_by_acceleration(speeds, lengths, acceleration):
+    """Reduce the speeds so that each one can be reached from both of its neighbours."""
+    if np.isinf(acceleration):
+        return speeds
+
+    speeds = speeds.tolist()
+    max_speed_change = (2 * acceleration * lengths).tolist()
+
+    # Backward pass, so that we can always decelerate in time...
+    for i in reversed(range(len(lengths))):
+        speeds[i] = min(speeds[i], math.sqrt(speeds[i + 1] ** 2 + max_speed_change[i]))
+
+    # ... and forward pass, so that we can always accelerate in time.
+    for i in range(len(lengths)):
+        speeds[i + 1] = min(speeds[i + 1], math.sqrt(speeds[i] ** 2 + max_speed_change[i]))
+
+    return np.array(speeds)
+
+
+class MotionPlan:
+    """
+    The planned motion of the pen along a path of straight line moves.
+
+    Each move follows a trapezoidal velocity profile from its entry speed, up to its cruise speed, and back down to its
+    exit speed. If the move is too short to reach its cruise speed then the profile is triangular instead.
+    """
+
+    def __init__(self, points, entry_speeds, cruise_speeds, exit_speeds, acceleration, point_indices=None):
+        """
+        Create a motion plan. Use plan_motion() to ensure that the speeds given are achievable.
+
+        Args:
+            points (np.ndarray): An nx2 matrix whose ith row is the ith (y,x) point on the path. (in MILLIMETRES)
+            entry_speeds (np.ndarray): The n-1 speeds at the start of each move. (in MILLIMETRES / SECOND)
+            cruise_speeds (np.ndarray): The n-1 maximum speeds during each move. (in MILLIMETRES / SECOND)
+            exit_speeds (np.ndarray): The n-1 speeds at the end of each move. (in MILLIMETRES / SECOND)
+            acceleration (float): The acceleration used to change speed. (in MILLIMETRES / SECOND^2)
+            point_indices (np.ndarray): The index of each point amongst the points originally passed to plan_motion()
+                                        (which may have included repeats). By default, 0 to n-1.
+        """
+        self.points = points
+        self.point_indices = np.arange(len(points)) if point_indices is None else point_indices
+        self.lengths = np.linalg.norm(np.diff(points, axis=0), axis=1)
+        self.acceleration = acceleration
+
+        self._entry_speeds = np.asarray(entry_speeds, dtype=float)
+        self._exit_speeds = np.asarray(exit_speeds, dtype=float)
+        self._cruise_speeds = np.asarray(cruise_speeds, dtype=float)
+
+        if np.isinf(acceleration):
+            self._accelerating_distances = np.zeros(len(self.lengths))
+            self._decelerating_distances = np.zeros(len(self.lengths))
+            with np.errstate(invalid='ignore'):
+                durations = np.nan_to_num(self.lengths / self._cruise_speeds)
+        else:
+            self._compute_trapezoids()
+            durations = self._time_to_travel(np.arange(len(self.lengths)), self.lengths)
+
+        self.segment_start_times = np.concatenate(([0], np.cumsum(durations)))
+
+    def _compute_trapezoids(self):
+        v0, v1, a = self._entry_speeds, self._exit_speeds, self.acceleration
+
+        with np.errstate(invalid='ignore'):
+            accelerating = (self._cruise_speeds ** 2 - v0 ** 2) / (2 * a)
+            decelerating = (self._cruise_speeds ** 2 - v1 ** 2) / (2 * a)
+
+        # Where the cruise speed cannot be reached, accelerate to the highest possible speed and then decelerate
+        is_triangular = ~(accelerating + decelerating <= self.lengths)
+        peak_speeds = np.sqrt((2 * a * self.lengths + v0 ** 2 + v1 ** 2) / 2)
+        self._cruise_speeds = np.where(is_triangular, peak_speeds, self._cruise_speeds)
+
+        self._accelerating_distances = (self._cruise_speeds ** 2 - v0 ** 2) / (2 * a)
+        self._decelerating_distances = np.where(is_triangular,
+                                                np.maximum(self.lengths - self._accelerating_distances, 0),
+                                                decelerating)
+
+    @property
+    def total_seconds(self) -> float:
+        """The time taken to complete the whole path (in SECONDS)."""
+        return self.segment_start_times[-1]
+
+    def times_at(self, segment_indices: np.ndarray, fractions: np.ndarray) -> np.ndarray:
+        """
+        Compute the times at which the pen reaches given positions along the path.
+
+        Args:
+            segment_indices (np.ndarray): A vector of indices for the moves along the path.
+            fractions (np.ndarray): A vector of fractions of the way along each of these moves.
+
+        Returns:
+            np.ndarray: The times at which the pen is at each position, measured from the start of the path.
+        """
+        segment_indices = np.asarray(segment_indices, dtype=int)
+        distances = np.asarray(fractions) * self.lengths[segment_indices]
+        return self.segment_start_times[segment_indices] + self._time_to_travel(segment_indices, distances)
+
+    def _time_to_travel(self, segment_indices, distances):
+        """The time taken to travel the given distances from the start of the given moves."""
+        cruise_speeds = self._cruise_speeds[segment_indices]
+
+        if np.isinf(self.acceleration):
+            with np.errstate(invalid='ignore'):
+                return np.nan_to_num(distances / cruise_speeds)
+
+        a = self.acceleration
+        entry_speeds = self._entry_speeds[segment_indices]
+        accelerating_distances = self._accelerating_distances[segment_indices]
+        decelerate_from = self.lengths[segment_indices] - self._decelerating_distances[segment_indices]
+
+        accelerating_time = (np.sqrt(entry_speeds ** 2 + 2 * a * np.minimum(distances, accelerating_distances))
+                             - entry_speeds) / a
+        cruising_time = (np.clip(distances, accelerating_distances, decelerate_from) - accelerating_distances) / \
+            cruise_speeds
+        decelerating_distances = np.maximum(distances - decelerate_from, 0)
+        decelerating_time = (cruise_speeds - np.sqrt(np.maximum(cruise_speeds ** 2 - 2 * a * decelerating_distances,
+                                                                0))) / a
+
+        return accelerating_time + cruising_time + decelerating_time
@@ -0,0 +1,254 @@
+"""
+Path Ordering Module
+
+This module reorders the paths in a drawing so as to reduce the distance the pen travels while lifted between them.
+
+A path is a sequence of curves which are drawn one after the other without lifting the pen (e.g. a continuous subpath
+of an svg file). The order is found in two stages:
+    - a nearest-neighbour tour, which repeatedly draws whichever remaining path starts nearest the pen, and then
+    - 2-opt, which repeatedly reverses whichever run of paths in the tour most shortens it, until no reversal helps.
+Paths may optionally be drawn backwards, and closed paths may optionally be started at any join between their curves.
+
+Once ordered, paths which follow on from one another can be chained together into single paths, so that the pen is not
+lifted and dropped again between them.
+
+All distances in the module are expressed in MILLIMETRES.
+"""
+
+import numpy as np
+
+from roboplot.core.curves import Curve
+
+
+class TravelReport:
+    """The distance the pen travels while lifted, before and after reordering the paths of a drawing."""
+
+    def __init__(self, original_millimetres: float, ordered_millimetres: float):
+        self.original_millimetres = original_millimetres
+        self.ordered_millimetres = ordered_millimetres
+
+    @property
+    def saved_millimetres(self) -> float:
+        return self.original_millimetres - self.ordered_millimetres
+
+    def __str__(self):
+        saved_fraction = self.saved_millimetres / self.original_millimetres if self.original_millimetres > 0 else 0
+        return 'Pen-up travel: {:.0f}mm in the original order, {:.0f}mm after ordering ({:.0%} saved)'.format(
+            self.original_millimetres, self.ordered_millimetres, saved_fraction)
+
+
+def order_paths(paths, start_location, allow_reversal: bool = True, choose_start_points: bool = True,
+                closed_tolerance: float = 0.01, max_two_opt_passes: int = 20):
+    """
+    Reorder the paths of a drawing to reduce the distance the pen travels between them.
+
+    Args:
+        paths (list): The paths, in their original order. Each is a list of curves drawn one after the other, or a
+                      single curve.
+        start_location (np.ndarray): The (y,x) location of the pen before drawing the first path.
+        allow_reversal (bool): If true, then a path may be drawn from its end to its start.
+        choose_start_points (bool): If true, then a closed path may be started at the start of any of its curves.
+        closed_tolerance (float): How close the ends of a path must be for it to count as closed.
+        max_two_opt_passes (int): The largest number of passes through the tour looking for runs of paths to reverse.
+
+    Returns:
+        tuple[list, TravelReport]: The reordered paths, each as a list of curves, and a report of the travel saved.
+    """
+    paths = [[path] if isinstance(path, Curve) else list(path) for path in paths]
+    start_location = np.reshape(start_location, 2).astype(float)
+    if len(paths) == 0:
+        return [], TravelReport(0, 0)
+
+    path_vertices = [_path_vertices(path) for path in paths]
+    is_closed = np.array([np.linalg.norm(vertices[-1] - vertices[0]) <= closed_tolerance
+                          for vertices in path_vertices])
+    original_travel = _travel(start_location,
+                              np.array([vertices[0] for vertices in path_vertices]),
+                              np.array([vertices[-1] for vertices in path_vertices]))
+
+    tour = _nearest_neighbour_tour(path_vertices, is_closed, start_location, allow_reversal, choose_start_points)
+    _two_opt(tour, is_closed | allow_reversal, start_location, max_two_opt_passes)
+
+    # Reversing a run of paths reverses the closed paths in it too, which makes no difference to the travel
+    tour.is_reversed[is_closed[tour.paths]] = False
+    if choose_start_points:
+        _choose_closed_start_points(tour, path_vertices, is_closed, start_location)
+
+    ordered_paths = [_oriented_path(paths[path_index], start_index, is_reversed)
+                     for path_index, start_index, is_reversed in zip(tour.paths, tour.start_indices, tour.is_reversed)]
+    return ordered_paths, TravelReport(original_travel, _travel(start_location, tour.entries, tour.exits))
+
+
+def chain_paths(paths, tolerance: float = 0.01) -> list:
+    """
+    Join paths which follow on from one another into single paths, so that the pen need not be lifted between them.
+
+    Only consecutive paths are joined, so this is best done after order_paths(), which puts paths which meet next to one
+    another.
+
+    Args:
+        paths (list): The paths, in order. Each is a list of curves drawn one after the other, or a single curve.
+        tolerance (float): How close the end of one path must be to the start of the next for them to be joined.
+
+    Returns:
+        list: The chained paths, each as a list of curves.
+    """
+    return list(iterate_chained_paths(paths, tolerance))
+
+
+def iterate_chained_paths(paths, tolerance: float = 0.01):
+    """
+    Join paths as in chain_paths(), yielding each chain as soon as the path after it is found not to join it.
+
+    This reads the paths one at a time, so the paths may be, for example, a generator of paths still being parsed.
+
+    Args:
+        paths (iterable): As for chain_paths().
+        tolerance (float): As for chain_paths().
+
+    Yields:
+        list: Each chained path, as a list of curves.
+    """
+    chain = []
+    chain_end = None
+    for path in paths:
+        path = [path] if isinstance(path, Curve) else list(path)
+        if len(path) == 0:
+            continue
+
+        vertices = _path_vertices(path)
+        if len(chain) > 0 and np.linalg.norm(vertices[0] - chain_end) > tolerance:
+            yield chain
+            chain = []
+        chain.extend(path)
+        chain_end = vertices[-1]
+
+    if len(chain) > 0:
+        yield chain
+
+
+class _Tour:
+    """The order in which to draw the paths, with the vertex at which each starts and whether it is reversed."""
+
+    def __init__(self, paths, start_indices, is_reversed, entries, exits):
+        self.paths = np.array(paths, dtype=int)
+        self.start_indices = np.array(start_indices, dtype=int)
+        self.is_reversed = np.array(is_reversed, dtype=bool)
+        self.entries = np.array(entries, dtype=float).reshape(-1, 2)
+        self.exits = np.array(exits, dtype=float).reshape(-1, 2)
+
+
+def _path_vertices(path) -> np.ndarray:
+    """The start of each curve in a path, followed by the end of the last."""
+    starts = [curve.evaluate_at(0).reshape(2) for curve in path]
+    return np.vstack(starts + [path[-1].evaluate_at(path[-1].total_millimetres).reshape(2)])
+
+
+def _nearest_neighbour_tour(path_vertices, is_closed, start_location, allow_reversal, choose_start_points) -> _Tour:
+    # List every way in which each path might be drawn
+    option_paths, option_start_indices, option_is_reversed, option_entries, option_exits = [], [], [], [], []
+
+    def add_option(path_index, start_index, is_reversed, entry, exit_):
+        option_paths.append(path_index)
+        option_start_indices.append(start_index)
+        option_is_reversed.append(is_reversed)
+        option_entries.append(entry)
+        option_exits.append(exit_)
+
+    for path_index, vertices in enumerate(path_vertices):
+        if is_closed[path_index]:
+            start_indices = range(len(vertices) - 1) if choose_start_points else [0]
+            for start_index in start_indices:
+                add_option(path_index, start_index, False, vertices[start_index], vertices[start_index])
+        else:
+            add_option(path_index, 0, False, vertices[0], vertices[-1])
+            if allow_reversal:
+                add_option(path_index, 0, True, vertices[-1], vertices[0])
+
+    option_paths = np.array(option_paths)
+    option_entries = np.array(option_entries)
+    is_available = np.ones(len(option_paths), dtype=bool)
+
+    # Repeatedly draw whichever remaining path can be started nearest to the pen
+    chosen_options = []
+    location = start_location
+    for _ in range(len(path_vertices)):
+        distances = np.where(is_available, np.linalg.norm(option_entries - location, axis=1), np.inf)
+        option = int(np.argmin(distances))
+        chosen_options.append(option)
+        is_available[option_paths == option_paths[option]] = False
+        location = option_exits[option]
+
+    return _Tour(paths=option_paths[chosen_options],
+                 start_indices=[option_start_indices[i] for i in chosen_options],
+                 is_reversed=[option_is_reversed[i] for i in chosen_options],
+                 entries=option_entries[chosen_options],
+                 exits=[option_exits[i] for i in chosen_options])
+
+
+def _two_opt(tour: _Tour, is_reversible: np.ndarray, start_location: np.ndarray, max_passes: int) -> None:
+    """Improve a tour in place by reversing runs of paths within it. Only reversible paths are reversed."""
+    num_paths = len(tour.paths)
+    for _ in range(max_passes):
+        improved = False
+        for first in range(num_paths):
+            # Only runs of reversible paths may be reversed
+            reversible = is_reversible[tour.paths[first:]]
+            run_length = len(reversible) if np.all(reversible) else int(np.argmin(reversible))
+            if run_length == 0:
+                continue
+            lasts = np.arange(first, first + run_length)
+
+            # Reversing the run from first to last replaces the travel onto first and off last
+            previous_exit = tour.exits[first - 1] if first > 0 else start_location
+            has_next = lasts + 1 < num_paths
+            next_entries = tour.entries[np.minimum(lasts + 1, num_paths - 1)]
+            old_travel = (np.linalg.norm(tour.entries[first] - previous_exit) +
+                          np.where(has_next, np.linalg.norm(next_entries - tour.exits[lasts], axis=1), 0))
+            new_travel = (np.linalg.norm(tour.exits[lasts] - previous_exit, axis=1) +
+                          np.where(has_next, np.linalg.norm(next_entries - tour.entries[first], axis=1), 0))
+
+            best = int(np.argmin(new_travel - old_travel))
+            if new_travel[best] - old_travel[best] < -1e-9:
+                _reverse_run(tour, first, lasts[best] + 1)
+                improved = True
+
+        if not improved:
+            break
+
+
+def _reverse_run(tour: _Tour, start: int, stop: int) -> None:
+    """Reverse the order of the paths tour.paths[start:stop], and the direction in which each is drawn."""
+    run = slice(start, stop)
+    backwards = slice(stop - 1, start - 1 if start > 0 else None, -1)
+    tour.paths[run] = tour.paths[backwards]
+    tour.start_indices[run] = tour.start_indices[backwards]
+    tour.is_reversed[run] = ~tour.is_reversed[backwards]
+    tour.entries[run], tour.exits[run] = tour.exits[backwards].copy(), tour.entries[backwards].copy()
+
+
+def _choose_closed_start_points(tour: _Tour, path_vertices, is_closed, start_location) -> None:
+    """Start each closed path in a tour at the vertex which makes the travel on and off it shortest."""
+    for position, path_index in enumerate(tour.paths):
+        if not is_closed[path_index]:
+            continue
+
+        vertices = path_vertices[path_index][:-1]
+        previous_exit = tour.exits[position - 1] if position > 0 else start_location
+        travel = np.linalg.norm(vertices - previous_exit, axis=1)
+        if position + 1 < len(tour.paths):
+            travel += np.linalg.norm(tour.entries[position + 1] - vertices, axis=1)
+
+        start_index = int(np.argmin(travel))
+        tour.start_indices[position] = start_index
+        tour.entries[position] = tour.exits[position] = vertices[start_index]
+
+
+def _oriented_path(path, start_index: int, is_reversed: bool) -> list:
+    path = path[start_index:] + path[:start_index]
+    return [curve.reversed() for curve in reversed(path)] if is_reversed else path
+
+
+def _travel(start_location, entries, exits) -> float:
+    previous_exits = np.vstack((start_location, exits[:-1]))
+    return float(np.sum(np.linalg.norm(entries - previous_exits, axis=1)))
@@ -0,0 +1,185 @@
+"""
+Plot Job Module
+
+This module records the moves made while drawing something into a job, which can be saved to a file and drawn again
+later without parsing, sampling or planning anything.
+
+A job is a sequence of events, each of which either lifts the pen, drops the pen, or runs a step schedule (see the
+step_schedule module). Each step schedule is stored with the location from which it starts and the size of steps for
+which it was compiled, since the schedule itself only holds the direction of each step. Recording is disabled by
+default. Call start_recording() to record the events as they run, and stop_recording() to collect them into a PlotJob.
+
+Job files have the following layout, with all numbers little-endian:
+    - a header, with dtype job_header_dtype,
+    - the events, with dtype job_event_dtype,
+    - the ticks of all the step schedules, one after the other, with dtype job_tick_dtype.
+A loaded job maps the file into memory rather than reading it, so even a very large job can be replayed straight away.
+
+All times in the module are expressed in SECONDS and all distances in MILLIMETRES.
+"""
+
+import threading
+
+import numpy as np
+
+import roboplot.core.step_schedule as step_schedule
+import roboplot.core.timing as timing
+
+job_file_magic = b'RPLOTJOB'
+job_file_version = 1
+
+# The kinds of event
+RUN_STEPS = 0
+LIFT_PEN = 1
+DROP_PEN = 2
+
+job_header_dtype = np.dtype([('magic', 'S8'),
+                             ('version', '<u4'),
+                             ('num_events', '<u4'),
+                             ('num_ticks', '<u8'),
+                             ('expected_seconds', '<f8')])  # The time taken to draw the job when it was recorded
+
+job_event_dtype = np.dtype([('kind', '<u1'),  # One of RUN_STEPS, LIFT_PEN or DROP_PEN
+                            ('microsteps', '<u1', 2),  # The (y,x) step sizes, for RUN_STEPS (see Axis.microsteps)
+                            ('first_tick', '<u8'),  # The index of the first tick of the step schedule, for RUN_STEPS
+                            ('num_ticks', '<u8'),  # The number of ticks in the step schedule, for RUN_STEPS
+                            ('start_location', '<f8', 2)])  # The (y,x) location at which the step schedule starts
+
+job_tick_dtype = step_schedule.step_tick_dtype.newbyteorder('<')
+
+# The recorder currently in use, or None if recording is disabled
+recorder = None
+
+
+def start_recording():
+    """
+    Start recording the moves made, discarding any recorded previously.
+
+    Returns:
+        JobRecorder: The recorder.
+    """
+    global recorder
+    recorder = JobRecorder()
+    return recorder
+
+
+def stop_recording():
+    """
+    Stop recording the moves made.
+
+    Returns:
+        PlotJob: The moves recorded since start_recording() was called.
+    """
+    global recorder
+    job = recorder.to_job()
+    recorder = None
+    return job
+
+
+class JobRecorder:
+    """Collects the events of a job as they are run."""
+
+    def __init__(self):
+        self._events = []
+        self._schedules = []
+        self._num_ticks = 0
+        self._start_time = timing.now()
+        self._lock = threading.Lock()
+
+    def record_pen(self, is_up: bool) -> None:
+        """Record that the pen was lifted (if is_up) or dropped."""
+        with self._lock:
+            self._events.append((LIFT_PEN if is_up else DROP_PEN, (0, 0), 0, 0, (0, 0)))
+
+    def record_steps(self, schedule: np.ndarray, start_location: np.ndarray, microsteps) -> None:
+        """
+        Record that a step schedule was run.
+
+        Args:
+            schedule (np.ndarray): The ticks, as returned by step_schedule.compile_step_schedule().
+            start_location (np.ndarray): The (y,x) location of the axes before the schedule was run.
+            microsteps (tuple): The (y,x) step sizes for which the schedule was compiled.
+        """
+        with self._lock:
+            self._events.append((RUN_STEPS, microsteps, self._num_ticks, len(schedule), np.reshape(start_location, 2)))
+            self._schedules.append(schedule)
+            self._num_ticks += len(schedule)
+
+    def to_job(self):
+        """
+        Returns:
+            PlotJob: The events recorded so far, expected to take as long as they have taken so far.
+        """
+        with self._lock:
+            events = np.array(self._events, dtype=job_event_dtype)
+            ticks = np.concatenate(self._schedules).astype(job_tick_dtype) if len(self._schedules) > 0 \
+                else np.zeros(0, dtype=job_tick_dtype)
+            return PlotJob(events, ticks, expected_seconds=timing.now() - self._start_time)
+
+
+class PlotJob:
+    """The events needed to draw something, in the order in which to run them."""
+
+    def __init__(self, events: np.ndarray, ticks: np.ndarray, expected_seconds: float):
+        """
+        Args:
+            events (np.ndarray): The events, with dtype job_event_dtype.
+            ticks (np.ndarray): The ticks of all the step schedules, with dtype job_tick_dtype.
+            expected_seconds (float): The time expected to be taken to run all the events.
+        """
+        self.events = events
+        self.ticks = ticks
+        self.expected_seconds = expected_seconds
+
+    @staticmethod
+    def load(file_path: str):
+        """
+        Map a job file into memory.
+
+        Args:
+            file_path (str): The path to the file, as written by save().
+
+        Returns:
+            PlotJob: The job, whose events and ticks are read from the file as they are needed.
+
+        Raises:
+            ValueError: If the file is not a job file of the version written by this module.
+        """
+        header = np.fromfile(file_path, dtype=job_header_dtype, count=1)
+        if len(header) == 0 or header['magic'][0] != job_file_magic:
+            raise ValueError('{} is not a plot job file!'.format(file_path))
+        if header['version'][0] != job_file_version:
+            raise ValueError('{} is a version {} plot job file, but only version {} can be read!'.format(
+                file_path, header['version'][0], job_file_version))
+
+        num_events = int(header['num_events'][0])
+        num_ticks = int(header['num_ticks'][0])
+        events_offset = job_header_dtype.itemsize
+        ticks_offset = events_offset + num_events * job_event_dtype.itemsize
+
+        # np.memmap cannot map an empty array
+        events = np.memmap(file_path, dtype=job_event_dtype, mode='r', offset=events_offset, shape=num_events) \
+            if num_events > 0 else np.zeros(0, dtype=job_event_dtype)
+        ticks = np.memmap(file_path, dtype=job_tick_dtype, mode='r', offset=ticks_offset, shape=num_ticks) \
+            if num_ticks > 0 else np.zeros(0, dtype=job_tick_dtype)
+        return PlotJob(events, ticks, float(header['expected_seconds'][0]))
+
+    def save(self, file_path: str) -> None:
+        """Write the job to a file, which can be loaded by load()."""
+        header = np.array([(job_file_magic, job_file_version, len(self.events), len(self.ticks),
+                            self.expected_seconds)], dtype=job_header_dtype)
+        with open(file_path, 'wb') as file:
+            header.tofile(file)
+            np.asarray(self.events, dtype=job_event_dtype).tofile(file)
+            np.asarray(self.ticks, dtype=job_tick_dtype).tofile(file)
+
+    def schedule_of(self, event) -> np.ndarray:
+        """
+        Args:
+            event: An event of kind RUN_STEPS, from self.events.
+
+        Returns:
+            np.ndarray: The ticks of its step schedule.
+        """
+        first_tick = int(event['first_tick'])
+        return self.ticks[first_tick:first_tick + int(event['num_ticks'])]
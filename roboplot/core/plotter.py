@@ -1,6 +1,8 @@
 import cv2
 import os
 import datetime
+import warnings
+from concurrent.futures import Future
 
 import numpy as np
 
@@ -8,15 +10,36 @@ import roboplot.config as config
 import roboplot.core.curves as curves
 import roboplot.core.debug_movement as debug_movement
 import roboplot.core.liftable_pen as liftable_pen
+import roboplot.core.motion_executor as motion_executor
+import roboplot.core.plot_job as plot_job
 import roboplot.core.stepper_control as stepper_control
 from roboplot.core.camera.camera_wrapper import Camera
 import roboplot.core.camera.camera_utils as camera_utils
 
 
 class Plotter:
+    """
+    The plotter as a whole: the axes, the pen and the camera.
+
+    Methods which move the plotter do not wait for the move to finish. Instead, the move is queued to run on a
+    background thread and a Future is returned. Use wait() to block until all the queued moves have finished. (This is
+    done automatically before taking a photo, or reporting the location of the pen or camera.)
+    """
+
     default_pen_speed = np.inf  # I.e. as fast as possible
     default_resolution = 0.5
 
+    # The size of the steps taken by the motors (see stepper_control.Axis.microsteps). Half steps give a finer line
+    # when drawing, while full steps are faster for moving the pen or camera around.
+    drawing_microsteps = 2
+    travel_microsteps = 1
+
+    # How long the pen may still be moving at either end of a move with the pen up. Moving away may start this long
+    # before the pen has finished lifting, and the pen may start dropping this long before arriving at the start of a
+    # curve. These should be well short of the time the pen takes to move, so that it is clear of the paper.
+    pen_lift_overlap_seconds = 0.1
+    pen_drop_overlap_seconds = 0.1
+
     def __init__(self,
                  axes: stepper_control.AxisPair,
                  pen: liftable_pen.LiftablePen,
@@ -35,16 +58,39 @@ class Plotter:
         self._pen = pen
         self._camera = camera
         self._pen_to_camera_offset = np.array(pen_to_camera_offset)
+        self._motion_executor = motion_executor.MotionExecutor()
 
     @property
     def is_homed(self):
         return self._axes.is_homed
 
-    def home(self):
-        self._pen.lift()
-        self._axes.home()
+    def wait(self) -> None:
+        """
+        Block until all the queued moves have finished.
 
-    def draw(self, curve_list, pen_speed: float = default_pen_speed, resolution: float = default_resolution) -> None:
+        Raises:
+            Exception: The first exception raised by a queued move since the last call to wait(). If the servo which
+                       lifts the pen has failed, then its exception is raised instead.
+        """
+        try:
+            self._motion_executor.wait()
+        finally:
+            self._pen.wait_for_servo()
+
+    def home(self) -> Future:
+        """
+        Returns:
+            Future: completes with a stepper_control.HomingReport once the plotter is homed
+        """
+        return self._motion_executor.submit(self._home)
+
+    def _home(self):
+        self._lift_pen()
+        self._pen.wait()
+        return self._axes.home()
+
+    def draw(self, curve_list, pen_speed: float = default_pen_speed, resolution: float = default_resolution,
+             chord_tolerance: float = None) -> Future:
         """
         Algorithm:
          - Lift the pen
@@ -57,28 +103,37 @@ class Plotter:
             curve_list: the curves to be drawn
             pen_speed: the speed of the pen (mm/s)
             resolution: the length of the line segments in which to split the curves before drawing
-        """
+            chord_tolerance: if given, then split the curves into as few line segments as keep within this distance
+                             (mm) of them, rather than using the resolution
 
+        Returns:
+            Future: completes once the curves have been drawn
+        """
         if isinstance(curve_list, curves.Curve):
             curve_list = [curve_list]
 
+        return self._motion_executor.submit(self._draw, list(curve_list), pen_speed, resolution, chord_tolerance)
+
+    def _draw(self, curve_list, pen_speed, resolution, chord_tolerance=None):
         self._lift_pen()
         if len(curve_list) > 0:
-            self._move_to_start_of_curve(curve_list[0], pen_speed, resolution)
-            self._drop_pen()
-            for curve in curve_list:
-                self._axes.follow(curve, pen_speed, resolution)
+            self._move_to_start_of_curve(curve_list[0], pen_speed, resolution, chord_tolerance,
+                                         before_arriving=self._drop_pen)
+            self._pen.wait()  # Never draw before the pen is fully down
+            self._axes.follow_curves(curve_list, pen_speed, resolution, microsteps=self.drawing_microsteps,
+                                     chord_tolerance=chord_tolerance)
             self._lift_pen()
 
     def follow_with_camera(self, curve_list, camera_speed: float = default_pen_speed,
-                           resolution: float = default_resolution):
+                           resolution: float = default_resolution) -> Future:
         if isinstance(curve_list, curves.Curve):
             curve_list = [curve_list]
 
         offset_curves = [c.offset(-self._pen_to_camera_offset) for c in curve_list]
-        self.follow_with_pen(offset_curves, pen_speed=camera_speed, resolution=resolution)
+        return self.follow_with_pen(offset_curves, pen_speed=camera_speed, resolution=resolution)
 
-    def follow_with_pen(self, curve_list, pen_speed: float = default_pen_speed, resolution: float = default_resolution):
+    def follow_with_pen(self, curve_list, pen_speed: float = default_pen_speed,
+                        resolution: float = default_resolution) -> Future:
         """
         Algorithm:
           - Lift the pen
@@ -88,38 +143,107 @@ class Plotter:
             curve_list: the curves to be drawn
             pen_speed: the speed of the pen (mm/s)
             resolution: the length of the line segments in which to split the curves before following
+
+        Returns:
+            Future: completes once the curves have been followed
         """
         # TODO: It is not ideal to not be changing colour each curve when the pen is up...
         if isinstance(curve_list, curves.Curve):
             curve_list = [curve_list]
 
+        return self._motion_executor.submit(self._follow_with_pen, list(curve_list), pen_speed, resolution)
+
+    def _follow_with_pen(self, curve_list, pen_speed, resolution):
         self._lift_pen()
-        for curve in curve_list:
-            self._axes.follow(curve, pen_speed, resolution)
+        self._pen.wait(seconds_early=self.pen_lift_overlap_seconds)
+        self._axes.follow_curves(curve_list, pen_speed, resolution, microsteps=self.travel_microsteps)
 
-    def present_paper(self):
-        self.move_pen_to([148.5, 5])
+    def replay_job(self, job: plot_job.PlotJob) -> Future:
+        """
+        Run the events of a plot job, as recorded while drawing earlier.
+
+        Each event is queued separately, so that a job mapped from a file is read as it is drawn rather than up front.
+        The job is drawn where it was recorded, so the plotter should have been homed as it was when recording.
+
+        Args:
+            job (plot_job.PlotJob): the job
+
+        Returns:
+            Future: completes once the whole job has been run
+        """
+        future = Future()
+        future.set_result(None)
+
+        events = iter(job.events)
+        event = next(events, None)
+        while event is not None:
+            next_event = next(events, None)
+            if event['kind'] == plot_job.LIFT_PEN:
+                future = self._motion_executor.submit(self._lift_pen)
+            elif event['kind'] == plot_job.DROP_PEN:
+                future = self._motion_executor.submit(self._drop_pen)
+            else:
+                # As when drawing, start dropping the pen before the end of a move which is followed by a drop
+                drops_after = next_event is not None and next_event['kind'] == plot_job.DROP_PEN
+                future = self._motion_executor.submit(self._replay_step_schedule, job.schedule_of(event),
+                                                      event['start_location'], event['microsteps'], drops_after)
+                if drops_after:
+                    next_event = next(events, None)
+            event = next_event
+
+        return future
+
+    def _replay_step_schedule(self, schedule, start_location, microsteps, drops_after):
+        if not self._axes.is_at(start_location):
+            # E.g. the job was not recorded from where the plotter was homed, so travel to the start with the pen up
+            warnings.warn('Moving the pen to {} to replay a move which starts there'.format(start_location))
+            pen_was_down = self._pen.is_up is False
+            self._move_pen_to(start_location, self.default_pen_speed)
+            if pen_was_down:
+                self._drop_pen()
+
+        if self._pen.is_up is False:
+            self._pen.wait()  # Never draw before the pen is fully down
+        else:
+            self._pen.wait(seconds_early=self.pen_lift_overlap_seconds)
+
+        self._axes.replay_step_schedule(schedule, start_location, microsteps,
+                                        before_end=self._drop_pen if drops_after else None,
+                                        seconds_before_end=self.pen_drop_overlap_seconds)
+
+    def present_paper(self) -> Future:
+        return self.move_pen_to([148.5, 5])
 
-    def move_camera_to(self, target_location, camera_speed: float = default_pen_speed) -> None:
+    def move_camera_to(self, target_location, camera_speed: float = default_pen_speed) -> Future:
         """
         Move the camera from the current location to the target location.
 
         Args:
             target_location: the target location
             camera_speed: the camera speed (mm/s) (optional)
+
+        Returns:
+            Future: completes once the camera has arrived
         """
-        self.move_pen_to(target_location - self._pen_to_camera_offset, pen_speed=camera_speed)
+        return self.move_pen_to(target_location - self._pen_to_camera_offset, pen_speed=camera_speed)
 
-    def move_pen_to(self, target_location, pen_speed: float = default_pen_speed) -> None:
+    def move_pen_to(self, target_location, pen_speed: float = default_pen_speed) -> Future:
         """
         Move the pen from the current location to the target location.
 
         Args:
             target_location: the target location
             pen_speed: the pen speed (mm/s) (optional)
+
+        Returns:
+            Future: completes once the pen has arrived
         """
+        return self._motion_executor.submit(self._move_pen_to, np.array(target_location), pen_speed)
+
+    def _move_pen_to(self, target_location, pen_speed):
         self._lift_pen()
-        self._axes.move_to(target_location, pen_speed)
+        self._pen.wait(seconds_early=self.pen_lift_overlap_seconds)
+        self._axes.move_to(target_location, pen_speed, microsteps=self.travel_microsteps)
 
     def take_greyscale_photo_at(self,
                                 target_camera_centre,
@@ -130,6 +254,9 @@ class Plotter:
     def take_photo_at(self,
                       target_photo_centre,
                       padding_gray_value=camera_utils.default_padding_grey_value) -> np.ndarray:
+        # The photo must not be taken until the camera has finished moving
+        self.wait()
+
         current_camera_location = self._axes.current_location + config.CAMERA_OFFSET
 
         # TODO if overstep is fixed this fudge can be removed.
@@ -166,23 +293,42 @@ class Plotter:
 
     @property
     def pen_location(self):
+        """The location of the pen, once all the queued moves have finished."""
+        self.wait()
         return self._axes.current_location
 
     @property
     def camera_location(self):
+        """The location of the camera, once all the queued moves have finished."""
+        self.wait()
         return self._axes.current_location + self._pen_to_camera_offset
 
-    def _lift_pen(self):
-        self._pen.lift()
+    def _lift_pen(self) -> Future:
+        if plot_job.recorder is not None:
+            plot_job.recorder.record_pen(is_up=True)
+        return self._pen.lift()
 
-    def _drop_pen(self):
-        self._pen.drop()
+    def _drop_pen(self) -> Future:
+        if plot_job.recorder is not None:
+            plot_job.recorder.record_pen(is_up=False)
+        return self._pen.drop()
+
+    def _move_to_start_of_curve(self, curve, pen_speed, resolution, chord_tolerance=None, before_arriving=None):
+        # The first of the points to be followed, rather than evaluate_at(0), so that they are computed only once
+        if chord_tolerance is None:
+            start_of_curve = curve.to_series_of_points(resolution)[0]
+        else:
+            start_of_curve = curve.to_series_of_points_within_tolerance(chord_tolerance)[0]
 
-    def _move_to_start_of_curve(self, curve, pen_speed, resolution):
+        self._pen.wait(seconds_early=self.pen_lift_overlap_seconds)
         self._axes.follow(
-            curve=curves.LineSegment(self._axes.current_location, curve.evaluate_at(0)),
+            curve=curves.LineSegment(self._axes.current_location, start_of_curve),
             pen_speed=pen_speed,
-            resolution=resolution)
+            resolution=resolution,
+            microsteps=self.travel_microsteps,
+            chord_tolerance=chord_tolerance,
+            before_end=before_arriving,
+            seconds_before_end=self.pen_drop_overlap_seconds)
 
     @property
     def camera_field_of_view_xy_mm(self):
@@ -206,11 +352,21 @@ class PlotterWithDebugImage(Plotter):
         # Initialise
         super().__init__(axes, pen, camera, pen_to_camera_offset)
         self.debug_image = axes.debug_image
+        self._last_pen_move = None
 
     def _lift_pen(self):
         self.debug_image.override_colour = debug_movement.Colour.Yellow
-        super()._lift_pen()
+        self._axes.trajectory_log.pen_is_down = False
+        self._last_pen_move = super()._lift_pen()
+        return self._last_pen_move
 
     def _drop_pen(self):
-        self.debug_image.override_colour = None
-        super()._drop_pen()
+        # The pen only counts as down once it has finished dropping, unless it has since been told to lift again
+        def mark_pen_down(drop):
+            if drop is self._last_pen_move:
+                self.debug_image.override_colour = None
+                self._axes.trajectory_log.pen_is_down = True
+
+        self._last_pen_move = super()._drop_pen()
+        self._last_pen_move.add_done_callback(mark_pen_down)
+        return self._last_pen_move
@@ -0,0 +1,121 @@
+"""
+Polyline Simplification Module
+
+This module removes the vertices of a polyline which make little difference to its shape, so that fewer line segments
+(and hence fewer moves) are needed to draw it. Polylines from svg files, from the path follower and from joining the
+dots often contain long runs of nearly collinear vertices, each of which would otherwise become its own line segment.
+
+Polylines are simplified with the Ramer-Douglas-Peucker algorithm, which keeps the end points and then repeatedly keeps
+whichever remaining vertex lies farthest from the polyline kept so far, until every vertex lies within the tolerance
+of it. Every range of vertices still to be split is searched at once, so the number of passes through NumPy grows
+only with the depth of the splitting rather than with the number of vertices.
+
+All distances in the module are expressed in MILLIMETRES.
+"""
+
+import numpy as np
+
+from roboplot.core.curves import LineSegment, Polyline
+
+
+def simplify(points, tolerance_millimetres: float) -> np.ndarray:
+    """
+    Remove the vertices of a polyline which lie within a tolerance of the polyline through the remaining vertices.
+
+    The first and last vertices are always kept, so a closed polyline (whose last vertex repeats its first) stays
+    closed.
+
+    Args:
+        points (np.ndarray): The (y,x) vertices of the polyline, as an nx2 array (or anything which converts to one).
+        tolerance_millimetres (float): The greatest distance a removed vertex may lie from the simplified polyline.
+
+    Returns:
+        np.ndarray: The vertices which were kept, in order.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if len(points) <= 2:
+        return points.copy()
+
+    is_kept = np.zeros(len(points), dtype=bool)
+    is_kept[[0, -1]] = True
+
+    # The ranges of vertices still to be split, each given by its first and last vertex (which are both kept)
+    firsts = np.array([0])
+    lasts = np.array([len(points) - 1])
+    while len(firsts) > 0:
+        num_interior = lasts - firsts - 1
+        has_interior = num_interior > 0
+        firsts, lasts, num_interior = firsts[has_interior], lasts[has_interior], num_interior[has_interior]
+        if len(firsts) == 0:
+            break
+
+        # Measure every interior vertex of every range against the segment joining the ends of its range
+        range_starts = np.cumsum(num_interior) - num_interior
+        owners = np.repeat(np.arange(len(firsts)), num_interior)
+        indices = firsts[owners] + 1 + np.arange(len(owners)) - range_starts[owners]
+        distances = _distances_from_segments(points[indices], points[firsts[owners]], points[lasts[owners]])
+
+        # Split each range at its farthest vertex, if that lies outside the tolerance
+        farthest = range_starts + _argmax_within_ranges(distances, range_starts)
+        is_split = distances[farthest] > tolerance_millimetres
+        splits = indices[farthest[is_split]]
+        is_kept[splits] = True
+
+        firsts, lasts = np.concatenate((firsts[is_split], splits)), np.concatenate((splits, lasts[is_split]))
+
+    return points[is_kept]
+
+
+def simplify_line_segments(curve_list, tolerance_millimetres: float) -> list:
+    """
+    Replace each run of line segments in a list of curves (where each segment starts at the end of the one before it)
+    with a single simplified polyline.
+
+    Curves which are not line segments are kept as they are.
+
+    Args:
+        curve_list (list[Curve]): The curves, in the order in which they are drawn.
+        tolerance_millimetres (float): See simplify().
+
+    Returns:
+        list[Curve]: The simplified curves, in order.
+    """
+    simplified = []
+    run = []
+
+    def end_run():
+        if len(run) > 0:
+            vertices = simplify(np.vstack([run[0].start] + [segment.end for segment in run]), tolerance_millimetres)
+            simplified.append(Polyline(vertices))
+            run.clear()
+
+    for curve in curve_list:
+        if not isinstance(curve, LineSegment):
+            end_run()
+            simplified.append(curve)
+        else:
+            if len(run) > 0 and not np.array_equal(curve.start, run[-1].end):
+                end_run()
+            run.append(curve)
+    end_run()
+
+    return simplified
+
+
+def _distances_from_segments(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """The distance from each point to the nearest point of the corresponding segment (not the line through it)."""
+    segments = ends - starts
+    segment_lengths_squared = np.einsum('ij,ij->i', segments, segments)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.einsum('ij,ij->i', points - starts, segments) / segment_lengths_squared
+    t = np.clip(np.nan_to_num(t), 0, 1)  # A segment of zero length (e.g. that of a closed polyline) is just its start
+    return np.linalg.norm(points - starts - t[:, np.newaxis] * segments, axis=1)
+
+
+def _argmax_within_ranges(values: np.ndarray, range_starts: np.ndarray) -> np.ndarray:
+    """The index (relative to its start) of the first largest value in each of the consecutive, non-empty ranges."""
+    maxima = np.maximum.reduceat(values, range_starts)
+    owners = np.repeat(np.arange(len(range_starts)), np.diff(np.append(range_starts, len(values))))
+    maximum_indices = np.flatnonzero(values == maxima[owners])
+    _, first_of_each_range = np.unique(owners[maximum_indices], return_index=True)
+    return maximum_indices[first_of_each_range] - range_starts
@@ -1,11 +1,12 @@
 """This module defines the servo motor GPIO connection"""
 
-import time
-import threading
+from concurrent.futures import Future
 
 import numpy as np
 
 import roboplot.core.gpio.wiringpi_wrapper as wiringpi_wrapper
+import roboplot.core.motion_executor as motion_executor
+import roboplot.core.timing as timing
 from roboplot.core.gpio.gpio_wrapper import GPIO
 
 
@@ -39,25 +40,47 @@ class ServoMotor:
         self.max_position = max_position
         self._power_control_pin = power_control_pin
 
-    def move_smoothly_to(self, target_position: float, seconds_to_take: float) -> None:
+        # Smooth moves are run on their own thread, so that the caller (e.g. the thread stepping the axes) need not
+        # wait for them
+        self._move_executor = motion_executor.MotionExecutor(name='Servo')
+
+    def move_smoothly_to(self, target_position: float, seconds_to_take: float, start_time: float = None) -> Future:
         """
         If possible, move smoothly between the current position and the target position.
 
         If the last set servo position is out of range (i.e. if we have not yet set the position) then the servo
         motor will move directly to the target position.
 
+        The move runs in the background, after any moves requested before it, so this method returns straight away.
+
         Args:
             target_position (float): the target position for the servo motor
             seconds_to_take (float): the time in seconds to take for the move
+            start_time (float): the time (as given by timing.now()) at which to start the move, or None to start as
+                                soon as possible
+
+        Returns:
+            Future: completes once the servo has reached the target position
         """
+        return self._move_executor.submit(self._move_smoothly_to, target_position, seconds_to_take, start_time)
+
+    def wait(self) -> None:
+        """Block until all the requested smooth moves have finished."""
+        self._move_executor.wait()
+
+    def _move_smoothly_to(self, target_position, seconds_to_take, start_time):
+        # Keep to the times for which the move was requested, so that it finishes when the caller expects
+        if start_time is None:
+            start_time = timing.now()
+        timing.sleep_until(start_time)
 
         if self.input_is_in_range(self._last_set_position):
             num_positions = self._num_possible_positions_between(self._last_set_position, target_position)
             target_positions = np.linspace(self._last_set_position, target_position, num_positions)
-            target_times = time.time() + np.linspace(0, seconds_to_take, num_positions)
+            target_times = start_time + np.linspace(0, seconds_to_take, num_positions)
             for i in range(num_positions):
                 self.set_position(target_positions[i])
-                _wait_until(target_times[i])
+                timing.sleep_until(target_times[i])
         else:
             self.set_position(target_position)
 
@@ -82,9 +105,6 @@ class ServoMotor:
         GPIO.output(self._power_control_pin, True)
         self._last_set_position = pwm_input
 
-        # Make sure that the program can't end before the servo has finished moving
-        threading.Thread(target=lambda: time.sleep(0.5), name='Servo Wait Thread')
-
     def input_is_in_range(self, pwm_input):
         return self.min_position <= pwm_input <= self.max_position
 
@@ -107,8 +127,3 @@ class ServoMotor:
         """Cut the power to the servo and stop sending pwm."""
         GPIO.output(self._power_control_pin, False)
         wiringpi_wrapper.write_pwm_to_pin_18(0)
-
-
-def _wait_until(wake_up_time):
-    while time.time() < wake_up_time:
-        pass
@@ -0,0 +1,107 @@
+"""
+Step Schedule Module
+
+This module compiles a planned path (see the motion_planning module) into a schedule of motor steps. Doing this up
+front, with NumPy, means that the loop which actually drives the motors need do no more than step the right axes at the
+right time.
+
+The schedule is a sequence of 'ticks'. At each tick, each axis either steps once (forwards or backwards) or not at all.
+Steps on the two axes which are due at exactly the same point along the path share a tick, so that both motors can be
+stepped with a single GPIO write.
+
+All times in the module are expressed in SECONDS. Positions are expressed as whole numbers of STEPS.
+"""
+
+import numpy as np
+
+from roboplot.core.motion_planning import MotionPlan
+
+# The indices used for each axis when compiling a step schedule. These follow the (y,x) ordering used throughout
+# roboplot.core.
+Y_AXIS = 0
+X_AXIS = 1
+
+step_tick_dtype = np.dtype([('y_step', np.int8),  # +1 to step the y-axis forwards, -1 to step it backwards, else 0
+                            ('x_step', np.int8),  # Similarly for the x-axis
+                            ('segment', np.uint32),  # The index of the move (between consecutive points) in the path
+                            ('time', np.float64)])  # The time at which the tick is due, relative to the first point
+
+
+def compile_step_schedule(motion_plan: MotionPlan, target_steps: np.ndarray) -> np.ndarray:
+    """
+    Compile a planned path into the sequence of steps required to follow it.
+
+    The path is treated as a series of linear moves between consecutive points, each of which has been rounded to a
+    whole number of steps on each axis. The steps for each move are interleaved using integer arithmetic, in the
+    manner of Bresenham's line algorithm: during a move of dy steps in y and dx steps in x, the kth y step is taken
+    (2k - 1) / (2 * dy) of the way through the move, and similarly for x. Since every point is rounded independently,
+    rounding errors do not accumulate from one move to the next.
+
+    Args:
+        motion_plan (MotionPlan): The planned path.
+        target_steps (np.ndarray): An nx2 integer matrix whose ith row is the (y,x) position, in steps, closest to the
+                                   ith point in motion_plan.points. The first row should be the current position.
+
+    Returns:
+        np.ndarray: A vector with dtype step_tick_dtype, holding the ticks in the order in which they should be taken.
+    """
+    target_steps = np.reshape(target_steps, (-1, 2)).astype(np.int64)
+    assert len(target_steps) == len(motion_plan.points), "There must be exactly one target for each point!"
+
+    steps_per_segment = np.diff(target_steps, axis=0)
+    num_steps_per_segment = np.abs(steps_per_segment)
+
+    axis_steps = [_compile_axis_steps(axis, steps_per_segment[:, axis], num_steps_per_segment[:, 1 - axis])
+                  for axis in (Y_AXIS, X_AXIS)]
+    axes, segment_indices, ordering_keys, index_in_segment, directions = (np.concatenate(arrays)
+                                                                          for arrays in zip(*axis_steps))
+
+    # Order by position along the path, rather than by time, so that the order is still correct when the path is to be
+    # followed as fast as possible (and all the times are equal). On a tie, the y-axis steps first.
+    order = np.lexsort((index_in_segment, axes, ordering_keys, segment_indices))
+    axes, segment_indices, ordering_keys, directions = (array[order]
+                                                        for array in (axes, segment_indices, ordering_keys, directions))
+
+    # Within a single axis the keys are distinct, so any tie is between a y step and the x step which follows it
+    is_tied_with_previous = np.zeros(len(axes), dtype=bool)
+    is_tied_with_previous[1:] = (segment_indices[1:] == segment_indices[:-1]) & \
+                                (ordering_keys[1:] == ordering_keys[:-1])
+    tick_indices = np.cumsum(~is_tied_with_previous) - 1
+
+    schedule = np.zeros(np.count_nonzero(~is_tied_with_previous), dtype=step_tick_dtype)
+    schedule['y_step'][tick_indices[axes == Y_AXIS]] = directions[axes == Y_AXIS]
+    schedule['x_step'][tick_indices[axes == X_AXIS]] = directions[axes == X_AXIS]
+
+    # Only now do we need floating point numbers - to look up the time of each tick
+    segment_indices = segment_indices[~is_tied_with_previous]
+    ordering_keys = ordering_keys[~is_tied_with_previous]
+    schedule['segment'] = segment_indices
+    fractions = ordering_keys / (2 * np.prod(np.maximum(num_steps_per_segment[segment_indices], 1), axis=1))
+    schedule['time'] = motion_plan.times_at(segment_indices, fractions)
+    return schedule
+
+
+def _compile_axis_steps(axis: int, steps_per_segment: np.ndarray, num_other_axis_steps_per_segment: np.ndarray):
+    """
+    Compute the steps for a single axis.
+
+    Returns:
+        tuple: For each step: the axis; the index of the move in which it occurs; an integer key giving its position
+               through that move (the numerator of the fraction of the way through, over a denominator of 2 * dy * dx);
+               its index within the move; and its direction (+1 or -1).
+    """
+    num_steps_per_segment = np.abs(steps_per_segment)
+    num_steps = np.sum(num_steps_per_segment)
+
+    # Index the steps by the segment in which they occur, and their index within that segment
+    segment_indices = np.repeat(np.arange(len(steps_per_segment)), num_steps_per_segment)
+    first_index_in_segment = np.cumsum(num_steps_per_segment) - num_steps_per_segment
+    index_in_segment = np.arange(num_steps) - np.repeat(first_index_in_segment, num_steps_per_segment)
+
+    # The kth step (counting from 1) occurs (2k - 1) / (2 * n) of the way through a move of n steps
+    ordering_keys = (2 * index_in_segment + 1) * np.maximum(num_other_axis_steps_per_segment[segment_indices], 1)
+
+    axes = np.full(num_steps, axis, dtype=np.uint8)
+    directions = np.sign(steps_per_segment[segment_indices]).astype(np.int8)
+
+    return axes, segment_indices, ordering_keys, index_in_segment, directions
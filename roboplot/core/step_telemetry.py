@@ -0,0 +1,164 @@
+"""
+Step Telemetry Module
+
+This module records the planned and actual time of every tick of the motors (see the step_schedule module), so that
+we can see how far the real step times drift from those planned.
+
+Recording is disabled by default. Call enable() to start recording into a ring buffer of a fixed size, which keeps the
+most recent ticks. While recording is disabled, the only cost to the loop which drives the motors is a check, once per
+move, of whether there is a recorder.
+
+All times in the module are expressed in SECONDS.
+"""
+
+import threading
+
+import numpy as np
+
+step_record_dtype = np.dtype([('curve', np.uint32),  # A count of the curves followed since recording was enabled
+                              ('y_step', np.int8),  # As in step_schedule.step_tick_dtype
+                              ('x_step', np.int8),
+                              ('planned_time', np.float64),  # As given by timing.now()
+                              ('actual_time', np.float64)])
+
+default_capacity = 2 ** 18
+default_stall_seconds = 0.005
+
+# The recorder currently in use, or None if recording is disabled
+recorder = None
+
+
+def enable(capacity: int = default_capacity):
+    """
+    Start recording step timings, discarding any recorded previously.
+
+    Args:
+        capacity (int): The number of ticks to keep. Once this many have been recorded, the oldest are overwritten.
+
+    Returns:
+        StepRecorder: The recorder.
+    """
+    global recorder
+    recorder = StepRecorder(capacity)
+    return recorder
+
+
+def disable() -> None:
+    """Stop recording step timings."""
+    global recorder
+    recorder = None
+
+
+class StepRecorder:
+    """A ring buffer of step timings."""
+
+    def __init__(self, capacity: int = default_capacity):
+        assert capacity > 0, "The capacity must be positive!"
+        self._records = np.zeros(capacity, dtype=step_record_dtype)
+        self._num_recorded = 0
+        self._num_curves = 0
+        self._lock = threading.Lock()
+
+    def record_move(self, schedule: np.ndarray, start_time: float, actual_times: np.ndarray,
+                    tick_curves: np.ndarray, num_curves: int) -> None:
+        """
+        Record the ticks of a move.
+
+        Args:
+            schedule (np.ndarray): The ticks which were run, as returned by step_schedule.compile_step_schedule().
+            start_time (float): The time from which the times in the schedule were measured.
+            actual_times (np.ndarray): The time at which each tick was actually taken.
+            tick_curves (np.ndarray): The index (from 0) of the curve within the move to which each tick belongs.
+            num_curves (int): The number of curves in the move.
+        """
+        records = np.empty(len(schedule), dtype=step_record_dtype)
+        records['y_step'] = schedule['y_step']
+        records['x_step'] = schedule['x_step']
+        records['planned_time'] = start_time + schedule['time']
+        records['actual_time'] = actual_times
+
+        with self._lock:
+            records['curve'] = self._num_curves + tick_curves
+            self._num_curves += num_curves
+
+            capacity = len(self._records)
+            records = records[-capacity:]
+            indices = (self._num_recorded + np.arange(len(records))) % capacity
+            self._records[indices] = records
+            self._num_recorded += len(records)
+
+    def records(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: A copy of the recorded ticks, with dtype step_record_dtype, in the order in which they were taken.
+        """
+        with self._lock:
+            capacity = len(self._records)
+            if self._num_recorded <= capacity:
+                return self._records[:self._num_recorded].copy()
+            else:
+                return np.roll(self._records, -(self._num_recorded % capacity))
+
+    def save(self, file_path: str) -> None:
+        """Save the recorded ticks to a .npy file, e.g. for scripts/step_timing_report.py."""
+        np.save(file_path, self.records())
+
+
+class CurveStepStatistics:
+    """Statistics about the timing of the steps taken while following a single curve."""
+
+    def __init__(self, curve: int, records: np.ndarray, stall_seconds: float = default_stall_seconds):
+        """
+        Args:
+            curve (int): The index of the curve.
+            records (np.ndarray): The recorded ticks for the curve, in order.
+            stall_seconds (float): How much later a tick must be than the tick before it for it to be counted as a
+                                   stall candidate.
+        """
+        lateness = records['actual_time'] - records['planned_time']
+
+        self.curve = curve
+        self.num_steps = int(np.sum(np.abs(records['y_step'])) + np.sum(np.abs(records['x_step'])))
+        self.seconds = records['actual_time'][-1] - records['actual_time'][0]
+        self.steps_per_second = self.num_steps / self.seconds if self.seconds > 0 else np.nan
+        self.lateness_percentiles = dict(zip((50, 90, 99, 100), np.percentile(lateness, (50, 90, 99, 100))))
+        self.num_stall_candidates = int(np.count_nonzero(np.diff(lateness, prepend=0) > stall_seconds))
+
+
+def compute_curve_statistics(records: np.ndarray, stall_seconds: float = default_stall_seconds) -> list:
+    """
+    Summarise the recorded step timings for each curve.
+
+    Args:
+        records (np.ndarray): Recorded ticks, as returned by StepRecorder.records().
+        stall_seconds (float): See CurveStepStatistics.
+
+    Returns:
+        list[CurveStepStatistics]: The statistics for each curve, in order.
+    """
+    curves, first_indices = np.unique(records['curve'], return_index=True)
+    order = np.argsort(first_indices)
+    curves, first_indices = curves[order], first_indices[order]
+    last_indices = np.concatenate((first_indices[1:], [len(records)]))
+
+    return [CurveStepStatistics(int(curve), records[first:last], stall_seconds)
+            for curve, first, last in zip(curves, first_indices, last_indices)]
+
+
+def format_curve_statistics(statistics) -> str:
+    """
+    Format the statistics for each curve as a table.
+
+    Args:
+        statistics (list[CurveStepStatistics]): As returned by compute_curve_statistics().
+
+    Returns:
+        str: The table.
+    """
+    lines = ['{:>6} {:>7} {:>9} {:>9} {:>9} {:>9} {:>9} {:>9} {:>7}'.format(
+        'Curve', 'Steps', 'Seconds', 'Steps/s', 'Late p50', 'Late p90', 'Late p99', 'Late max', 'Stalls')]
+    for s in statistics:
+        lines.append('{:>6} {:>7} {:>9.3f} {:>9.1f} {:>7.2f}ms {:>7.2f}ms {:>7.2f}ms {:>7.2f}ms {:>7}'.format(
+            s.curve, s.num_steps, s.seconds, s.steps_per_second,
+            *(1000 * s.lateness_percentiles[p] for p in (50, 90, 99, 100)), s.num_stall_candidates))
+    return '\n'.join(lines)
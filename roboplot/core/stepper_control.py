@@ -6,8 +6,9 @@ This module controls the 2D drive system for the plotter.
 All distances in the module are expressed in MILLIMETRES.
 
 """
+import atexit
+import math
 import threading
-import time
 import warnings
 
 import numpy as np
@@ -16,6 +17,13 @@ import roboplot.config as config
 import roboplot.core.curves as curves
 import roboplot.core.debug_movement as debug_movement
 import roboplot.core.limit_switches as limit_switches
+import roboplot.core.motion_planning as motion_planning
+import roboplot.core.plot_job as plot_job
+import roboplot.core.step_schedule as step_schedule
+import roboplot.core.step_telemetry as step_telemetry
+import roboplot.core.stepper_motors as stepper_motors
+import roboplot.core.timing as timing
+import roboplot.core.trajectory_log as trajectory_log
 from roboplot.core.curves import Curve
 from roboplot.core.home_position import HomePosition
 from roboplot.core.stepper_motors import StepperMotor
@@ -23,7 +31,6 @@ from roboplot.core.stepper_motors import StepperMotor
 
 class Axis:
     # Class variables, present so that we can use spec_set with unittest.Mock
-    current_location = 0  # type: float
     home_position = None
     secondary_home_position = None
     _is_homed = False
@@ -59,14 +66,111 @@ class Axis:
         self.home_position = home_position
         self.limit_switch_separation = limit_switch_separation
 
+        # The position is tracked as a whole number of phases of the motor sequence (the smallest steps which the motor
+        # can take) from an origin, so that it does not drift as we step
+        self._current_phase = 0
+        self._location_of_origin = 0.0
+        self._phase_increment = self._motor.phases_per_step if self.forwards else -self._motor.phases_per_step
+
+    @property
+    def motor(self) -> StepperMotor:
+        """The stepper motor driving the axis."""
+        return self._motor
+
+    @property
+    def current_location(self) -> float:
+        return self._location_of_origin + self._current_phase * self._millimetres_per_phase
+
+    @current_location.setter
+    def current_location(self, value: float) -> None:
+        self._location_of_origin = value - self._current_phase * self._millimetres_per_phase
+
+    @property
+    def current_step(self) -> int:
+        """The current position of the axis, as a number of steps (of the current size) from the origin."""
+        return self._current_phase // self._motor.phases_per_step
+
+    @property
+    def microsteps(self) -> int:
+        """The number of steps taken by the axis for each full step of its motor: 1 for full steps, 2 for half steps..."""
+        return self._motor.microsteps
+
+    @microsteps.setter
+    def microsteps(self, value: int) -> None:
+        if value == self._motor.microsteps:
+            return
+
+        if value < 1 or self._motor.max_microsteps % value != 0:
+            raise ValueError('The motor for this axis cannot take 1/{} steps!'.format(value))
+
+        # Larger steps can only be taken from positions which are a whole number of them from the origin. Moving to such
+        # a position is left to the caller (see nearest_location_for_microsteps()), so that it is planned and timed like
+        # any other move.
+        if self._current_phase % (self._motor.max_microsteps // value) != 0:
+            raise ValueError('The axis must be a whole number of 1/{} steps from the origin to take steps of that '
+                             'size!'.format(value))
+
+        self._set_microsteps(value)
+
+    def _set_microsteps(self, value: int) -> None:
+        self._motor.microsteps = value
+        self._phase_increment = self._motor.phases_per_step if self.forwards else -self._motor.phases_per_step
+
+    def nearest_location_for_microsteps(self, microsteps: int, towards: float) -> float:
+        """
+        Find the location from which steps of a given size can be taken which is nearest to the current location.
+
+        Args:
+            microsteps (int): The size of the steps (see microsteps).
+            towards (float): Where there is a choice of two locations, the one nearer this location is taken
+                             (in MILLIMETRES).
+
+        Returns:
+            float: the current location if steps of the given size can already be taken, else the nearest location on
+                   either side of it from which they can
+        """
+        phases_per_step = self._motor.max_microsteps // microsteps
+        phases_past = self._current_phase % phases_per_step
+        if phases_past == 0:
+            return self.current_location
+
+        phase_before = self._current_phase - phases_past
+        towards_phase = (towards - self._location_of_origin) / self._millimetres_per_phase
+        phase = phase_before + phases_per_step if towards_phase > phase_before + phases_per_step / 2 else phase_before
+        return self._location_of_origin + phase * self._millimetres_per_phase
+
+    def nearest_steps(self, locations) -> np.ndarray:
+        """
+        Find the positions (in steps from the origin) closest to the given locations.
+
+        Args:
+            locations: a location, or array of locations, on the axis (in MILLIMETRES)
+
+        Returns:
+            np.ndarray: the nearest position(s) in steps from the origin
+        """
+        return np.floor((np.asarray(locations) - self._location_of_origin) / self.millimetres_per_step + 0.5).astype(int)
+
     @property
     def back_off_millimetres(self):
         return self.__back_off_millimetres
 
     @property
     def millimetres_per_step(self) -> float:
+        """The distance moved by a single step, of the size currently set by microsteps."""
         return self._lead / self._motor.steps_per_revolution
 
+    @property
+    def _millimetres_per_phase(self) -> float:
+        return self.millimetres_per_step / self._motor.phases_per_step
+
+    @property
+    def max_speed(self) -> float:
+        """The fastest speed at which the motor can drive the axis (in MILLIMETRES / SECOND)."""
+        if self._motor.minimum_seconds_between_steps == 0:
+            return np.inf
+        return self.millimetres_per_step / self._motor.minimum_seconds_between_steps
+
     @property
     def forwards(self) -> bool:
         return self._motor.clockwise != self._invert_axis
@@ -74,6 +178,7 @@ class Axis:
     @forwards.setter
     def forwards(self, value: bool) -> None:
         self._motor.clockwise = value != self._invert_axis
+        self._phase_increment = self._motor.phases_per_step if value else -self._motor.phases_per_step
 
     @property
     def is_homed(self):
@@ -92,8 +197,15 @@ class Axis:
         if any([switch.is_pressed for switch in self.limit_switches]):
             raise limit_switches.UnexpectedLimitSwitchError("Cannot home if switch is already pressed!")
 
-        # Step until a switch is hit
-        hit_location = self.explore_limit_switch(self.home_position.forwards)
+        # Step until a switch is hit...
+        hit_location = self.explore_limit_switch(self.home_position.forwards,
+                                                 speed=self.home_position.approach_speed,
+                                                 acceleration=self.home_position.approach_acceleration)
+
+        # ... and then, having backed off, touch it again more slowly for a precise location
+        if self.home_position.retouch_speed is not None:
+            hit_location = self.explore_limit_switch(self.home_position.forwards,
+                                                     speed=self.home_position.retouch_speed)
 
         # Set the current location to the home position at the point where the limit switch is hit
         # Note that we back-calculate to account for any back off.
@@ -114,7 +226,7 @@ class Axis:
 
         self._is_homed = True
 
-    def explore_limit_switch(self, forwards: bool) -> float:
+    def explore_limit_switch(self, forwards: bool, speed: float = np.inf, acceleration: float = np.inf) -> float:
         """
         Step in the requested direction until a limit switch is hit. Then report the location of that hit.
 
@@ -123,15 +235,22 @@ class Axis:
 
         Args:
             forwards (bool): true if the plotter should explore in a 'forwards' direction
+            speed (float): the speed at which to move (in MILLIMETRES / SECOND), limited by the speed of the motor
+            acceleration (float): the acceleration up to this speed from rest (in MILLIMETRES / SECOND^2)
 
         Returns:
             float: the current_location at the time of the limit switch hit
         """
         self.forwards = forwards
 
-        hit_location = self._step_expecting_limit_switch()
+        start_time = timing.now()
+        steps_taken = 0
+        hit_location = None
         while hit_location is None:
+            distance = steps_taken * self.millimetres_per_step
+            timing.sleep_until(start_time + _seconds_to_travel_from_rest(distance, speed, acceleration))
             hit_location = self._step_expecting_limit_switch()
+            steps_taken += 1
 
         return hit_location
 
@@ -154,12 +273,12 @@ class Axis:
             return hit_location  # Allow the caller the make use of the hit location, e.g. for homing
 
     def step(self) -> None:
-        a_switch_is_pressed = any(switch.is_pressed for switch in self.limit_switches)
-        if not a_switch_is_pressed:
+        if not any(switch.is_pressed for switch in self.limit_switches):
             self._step_unsafe()
-            a_switch_is_pressed = any(switch.is_pressed for switch in self.limit_switches)
+        self._back_off_and_raise_if_a_limit_switch_is_pressed()
 
-        if a_switch_is_pressed:
+    def _back_off_and_raise_if_a_limit_switch_is_pressed(self):
+        if any(switch.is_pressed for switch in self.limit_switches):
             self._back_off()
             raise limit_switches.UnexpectedLimitSwitchError(
                 message='Cannot step motor when limit switch is pressed!')
@@ -174,8 +293,9 @@ class Axis:
             # TODO: When you introduce the encoders, be sure to use the stepper motor internal value here,
             # at least if possible - since else if the encoder breaks for some reason you will not stop backing off
             # and risk crashing.
-            initial_location = self.current_location
-            while abs(initial_location - self.current_location) < abs(self.back_off_millimetres):
+            # (The small tolerance stops floating point error from adding an extra step.)
+            steps_to_back_off = int(np.ceil(abs(self.back_off_millimetres) / self.millimetres_per_step - 1e-9))
+            for _ in range(steps_to_back_off):
                 self._step_unsafe()
         finally:
             self.forwards = originally_forwards
@@ -189,21 +309,65 @@ class Axis:
         self._advance_current_location()
 
     def _advance_current_location(self):
-        if self.forwards:
-            self.current_location += self.millimetres_per_step
-        else:
-            self.current_location -= self.millimetres_per_step
+        self._current_phase += self._phase_increment
 
     def nearest_reachable_location(self, target_location):
-        target_displacement = target_location - self.current_location
-        best_possible_displacement = self.millimetres_per_step * round(target_displacement / self.millimetres_per_step)
-        return best_possible_displacement + self.current_location
+        return self._location_of_origin + self.nearest_steps(target_location) * self.millimetres_per_step
+
+
+def _seconds_to_travel_from_rest(distance: float, speed: float, acceleration: float) -> float:
+    """The time taken to travel a distance from rest, accelerating uniformly up to a cruising speed."""
+    if np.isinf(speed):
+        return 0
+    elif np.isinf(acceleration):
+        return distance / speed
+
+    accelerating_distance = speed ** 2 / (2 * acceleration)
+    if distance <= accelerating_distance:
+        return math.sqrt(2 * distance / acceleration)
+    else:
+        return speed / acceleration + (distance - accelerating_distance) / speed
+
+
+def step_axes_together(axes) -> None:
+    """
+    Step several axes at once, setting the pins of all of their motors with a single GPIO write.
+
+    As in Axis.step(), no axis is stepped if a limit switch is already pressed, and an axis whose limit switch is
+    pressed will back off before an UnexpectedLimitSwitchError is raised.
+
+    Args:
+        axes (sequence of Axis): The axes to step, each in its current direction.
+    """
+    if not any(switch.is_pressed for axis in axes for switch in axis.limit_switches):
+        stepper_motors.step_together([axis.motor for axis in axes])
+        for axis in axes:
+            axis._advance_current_location()
+
+    for axis in axes:
+        axis._back_off_and_raise_if_a_limit_switch_is_pressed()
 
 
 class AxisPair:
-    def __init__(self, y_axis: Axis, x_axis: Axis):
+    # Motion planning defaults. In simulation we do not limit the acceleration, so that moves remain instantaneous.
+    default_acceleration = 250 if config.real_hardware else np.inf  # MILLIMETRES / SECOND^2
+    default_junction_deviation = 0.05  # MILLIMETRES
+
+    def __init__(self, y_axis: Axis, x_axis: Axis, acceleration: float = default_acceleration,
+                 junction_deviation: float = default_junction_deviation):
+        """
+        Creates an AxisPair.
+
+        Args:
+            y_axis (Axis): The y axis.
+            x_axis (Axis): The x axis.
+            acceleration (float): The maximum acceleration of the pen (in MILLIMETRES / SECOND^2).
+            junction_deviation (float): Controls how fast the pen may turn corners. See the motion_planning module.
+        """
         self.x_axis = x_axis
         self.y_axis = y_axis
+        self.acceleration = acceleration
+        self.junction_deviation = junction_deviation
 
         self.x_soft_lower_limit = -np.infty
         self.x_soft_upper_limit = np.infty
@@ -220,14 +384,31 @@ class AxisPair:
         self.x_axis.current_location = value[1]
 
     def home(self):
+        """
+        Home both axes at once.
+
+        Returns:
+            HomingReport: the time taken to home each axis
+        """
+        seconds_taken = {}
+
+        def home_and_time(axis):
+            axis_start_time = timing.now()
+            axis.home()
+            seconds_taken[axis] = timing.now() - axis_start_time
+
         # Home the switches
-        home_x = threading.Thread(target=self.x_axis.home)
-        home_y = threading.Thread(target=self.y_axis.home)
+        start_time = timing.now()
+        home_x = threading.Thread(target=home_and_time, args=(self.x_axis,))
+        home_y = threading.Thread(target=home_and_time, args=(self.y_axis,))
 
         home_x.start()
         home_y.start()
         home_x.join()
         home_y.join()
+        report = HomingReport(y_axis_seconds=seconds_taken.get(self.y_axis),
+                              x_axis_seconds=seconds_taken.get(self.x_axis),
+                              total_seconds=timing.now() - start_time)
 
         # Set soft limits
         margin = 0.5
@@ -240,16 +421,25 @@ class AxisPair:
             sorted([self.y_axis.home_position.location, self.y_axis.secondary_home_position.location]) + \
             margin * np.array([1, -1])
 
+        return report
+
     @property
     def is_homed(self):
         return self.x_axis.is_homed and self.y_axis.is_homed
 
-    def move_to(self, target_location, pen_speed: float) -> None:
+    def is_at(self, location) -> bool:
+        """True if the (y,x) location is within half a step (of the current size) of the current location on each
+        axis."""
+        return all(axis.nearest_steps(location[i]) == axis.nearest_steps(axis.current_location)
+                   for i, axis in enumerate((self.y_axis, self.x_axis)))
+
+    def move_to(self, target_location, pen_speed: float, microsteps: int = None) -> None:
         line_to_target = curves.LineSegment(start=self.current_location, end=target_location)
-        self.follow(line_to_target, pen_speed)
+        self.follow(line_to_target, pen_speed, microsteps=microsteps)
 
     def follow(self, curve: Curve, pen_speed: float, resolution: float = 0.1, use_soft_limits: bool = True,
-               suppress_limit_warnings: bool = False) -> None:
+               suppress_limit_warnings: bool = False, microsteps: int = None, chord_tolerance: float = None,
+               before_end=None, seconds_before_end: float = 0) -> None:
         """
         Step the motors so as to follow a curve.
 
@@ -261,110 +451,263 @@ class AxisPair:
             a soft limits and if they lie outside of these a Warning message is printed and the curve will be adjusted to draw as close
             as possible to the target points.
             suppress_limit_warnings (bool): If true suppress the warnings given in when using the soft limits.
-            
+            microsteps (int): The size of step to use for both axes (see Axis.microsteps), trading off resolution
+                              against speed. If None, then the current step size is kept.
+            chord_tolerance (float): If given, then the curve is split into as few line segments as will keep within
+                                     this distance of it (in MILLIMETRES), rather than into segments of the given
+                                     resolution. See Curve.to_series_of_points_within_tolerance().
+            before_end (callable): If given, a function of no arguments to call once the move has no more than
+                                   seconds_before_end seconds left to run (e.g. to start dropping the pen), or once
+                                   it has finished if the whole move takes no longer than that.
+            seconds_before_end (float): See before_end.
+
         Returns:
             None
 
+        """
+        self.follow_curves([curve], pen_speed, resolution, use_soft_limits, suppress_limit_warnings, microsteps,
+                           chord_tolerance, before_end, seconds_before_end)
+
+    def follow_curves(self, curve_list, pen_speed: float, resolution: float = 0.1, use_soft_limits: bool = True,
+                      suppress_limit_warnings: bool = False, microsteps: int = None,
+                      chord_tolerance: float = None, before_end=None, seconds_before_end: float = 0) -> None:
+        """
+        Step the motors so as to follow a sequence of curves, one after the other.
+
+        The motion is planned across the whole sequence at once, so that the pen need only slow down where the path
+        turns a corner, rather than at the end of every curve. See follow() for a description of the arguments.
         """
         if not self.is_homed:
             warnings.warn("Attempting to follow curve without having been homed!!")
 
-        # Compute target points and target times
-        points = curve.to_series_of_points(resolution)
-        distances_between_points = np.linalg.norm(points[1:] - points[0:-1], axis=1)
-        cumulative_distances = np.cumsum(distances_between_points)
-        target_times = time.time() + cumulative_distances / pen_speed
+        # Compute target points, noting the curve to which each belongs
+        points = [self.current_location]
+        point_curves = [[0]]
+        for curve_index, curve in enumerate(curve_list):
+            if chord_tolerance is None:
+                curve_points = curve.to_series_of_points(resolution)[1:]
+            else:
+                curve_points = curve.to_series_of_points_within_tolerance(chord_tolerance)[1:]
+            if use_soft_limits:
+                curve_points = self._apply_soft_limits(curve, curve_points, suppress_limit_warnings)
+            points.append(curve_points)
+            point_curves.append(np.full(len(curve_points), curve_index))
+
+        if microsteps is not None:
+            first_target = points[1][0] if len(points) > 1 and len(points[1]) > 0 else self.current_location
+            self._change_microsteps((microsteps, microsteps), first_target, pen_speed)
+            points[0] = self.current_location
+
+        # Plan the motion and compile the steps up front, so that the loop which steps the motors has as little to do
+        # as possible
+        motion_plan = motion_planning.plan_motion(np.vstack(points),
+                                                  max_speed=pen_speed,
+                                                  acceleration=self.acceleration,
+                                                  junction_deviation=self.junction_deviation,
+                                                  max_axis_speeds=(self.y_axis.max_speed, self.x_axis.max_speed))
+        segment_curves = np.concatenate(point_curves)[motion_plan.point_indices[1:]]
+        self._run_step_schedule(self._compile_step_schedule(motion_plan), segment_curves, len(curve_list),
+                                before_end, seconds_before_end)
+
+    def _apply_soft_limits(self, curve: Curve, points: np.ndarray, suppress_limit_warnings: bool) -> np.ndarray:
+        """Clip points on a curve to the soft limits, unless the curve lies entirely within them."""
+        lower_limits = (self.y_soft_lower_limit, self.x_soft_lower_limit)
+        upper_limits = (self.y_soft_upper_limit, self.x_soft_upper_limit)
+
+        bounding_box = curve.bounding_box
+        if np.all(bounding_box[0] >= lower_limits) and np.all(bounding_box[1] <= upper_limits):
+            return points
+
+        clipped_points = np.clip(points, lower_limits, upper_limits)
+        if not suppress_limit_warnings and np.any(clipped_points != points):
+            # Note that by default, warnings are only raised once
+            warnings.warn('Part of the curve lay outside of the soft limits')
+        return clipped_points
 
-        # Move, keeping a record of whether the
-        for pt, target_time in zip(points[1:], target_times):
-            pt = self._apply_soft_limits(pt, suppress_limit_warnings, use_soft_limits)
-            self.move_linearly(pt, target_time)
+    def move_linearly(self, target_location: np.ndarray, target_completion_time: float) -> None:
+        """
+        Steps the motors as close to linearly as possible to achieve the specified axis positions.
 
-    def _apply_soft_limits(self, pt, suppress_limit_warnings, use_soft_limits):
-        if use_soft_limits:
-            old_pt = pt
-            pt = self._clip_point_to_soft_limits(pt)
-            if any(pt != old_pt) and not suppress_limit_warnings:
-                # Note that by default, warnings are only raised once
-                warnings.warn('Part of the curve lay outside of the soft limits')
-        return pt
+        Args:
+            target_location (float): An 2-element array whose first (resp. second) elements determine the position to
+                                     which to move the first (resp. second) axis. (in MILLIMETRES)
+            target_completion_time (float): The target time at which the move should be completed. This should be
+                                            given in the same format as returned by timing.now().
+                                            If this is in the past then the move will be conducted as fast as possible.
+        """
+        points = np.vstack((self.current_location, target_location))
+        distance = np.linalg.norm(points[1] - points[0])
+        if distance == 0:
+            timing.sleep_until(target_completion_time)
+            return
 
-    def _clip_point_to_soft_limits(self, pt):
-        pt = pt.copy()
+        seconds_to_take = target_completion_time - timing.now()
+        speed = distance / seconds_to_take if seconds_to_take > 0 else np.inf
 
-        if pt[0] > self.y_soft_upper_limit:
-            pt[0] = self.y_soft_upper_limit
+        motion_plan = motion_planning.plan_motion(points, max_speed=speed)
+        self._run_step_schedule(self._compile_step_schedule(motion_plan))
 
-        if pt[1] > self.x_soft_upper_limit:
-            pt[1] = self.x_soft_upper_limit
+    def replay_step_schedule(self, schedule: np.ndarray, start_location: np.ndarray, microsteps,
+                             before_end=None, seconds_before_end: float = 0) -> None:
+        """
+        Step the axes as specified by a step schedule compiled earlier, e.g. one read from a plot job file.
 
-        if pt[0] < self.y_soft_lower_limit:
-            pt[0] = self.y_soft_lower_limit
+        Args:
+            schedule (np.ndarray): A vector of ticks, as returned by step_schedule.compile_step_schedule().
+            start_location (np.ndarray): The (y,x) location from which the schedule was compiled to start. The axes must
+                                         already be there (see is_at()).
+            microsteps (iterable): The (y,x) step sizes for which the schedule was compiled (see Axis.microsteps).
+            before_end (callable): As for follow().
+            seconds_before_end (float): As for follow().
+
+        Raises:
+            ValueError: If the axes are not at the start of the schedule.
+        """
+        start_location = np.reshape(start_location, 2)
+        if not self.is_at(start_location):
+            raise ValueError('The step schedule starts at {}, but the axes are at {}!'.format(
+                start_location, self.current_location))
 
-        if pt[1] < self.x_soft_lower_limit:
-            pt[1] = self.x_soft_lower_limit
-        return pt
+        self._change_microsteps([int(m) for m in microsteps], start_location, pen_speed=np.inf)
+        self._run_step_schedule(schedule, before_end=before_end, seconds_before_end=seconds_before_end)
 
-    def move_linearly(self, target_location: np.ndarray, target_completion_time: float) -> None:
+    def _change_microsteps(self, microsteps, towards, pen_speed: float) -> None:
         """
-        Steps the motors as close to linearly as possible to achieve the specified axis positions.
+        Change the size of the steps taken by each axis (see Axis.microsteps).
+
+        If an axis is not a whole number of the new steps from its origin, then both axes first move, in the smallest
+        possible steps, to the nearest location from which they can take the new steps, choosing the one nearer to
+        `towards`. This is an ordinary move, so it is timed and recorded like any other.
 
         Args:
-            target_location (float): An 2-element array whose first (resp. second) elements determine the position to
-                                     which to move the first (resp. second) axis. (in MILLIMETRES)
-            target_completion_time (float): The target time at which the move should be completed. This should be
-                                            given as a number of seconds since the Epoch (the same format as returned by
-                                            time.time()).
-                                            If this is in the past then the move will be conducted as fast as possible.
+            microsteps (iterable): The new (y,x) step sizes.
+            towards (np.ndarray): The (y,x) location to which the axes will next move.
+            pen_speed (float): The target speed of the pen for any move needed (in MILLIMETRES / SECOND).
         """
-        start_time = time.time()
-        total_seconds = target_completion_time - start_time
-
-        target_location = self._nearest_reachable_location(target_location)
-        self._set_axis_directions_for(target_location)
-
-        # TODO: This would be cleaner if I could think of a way to pull a class out with member variables
-        # start_location, target_location, current_distances, ... Some sort of LinearMoveProgressTracker
-        start_location = self.current_location
-        target_distances = abs(target_location - start_location)
-        current_distances = np.array([0, 0])
-
-        # TODO: There is a bug here - somehow I manage to overstep slightly (I notice this in y by moving to [10,
-        # 10] after homing, when it actually moved to [9.96, 10])
-        # Maybe the nearest_reachable_location idea isn't good enough?
-        while any(current_distances < target_distances):
-            self._step_the_axis_which_is_behind(current_distances, target_distances)
-
-            current_distances = abs(self.current_location - start_location)
-            time_of_next_step = start_time + total_seconds * sum(current_distances) / sum(target_distances)
-            _sleep_until(time_of_next_step)
-
-    def _nearest_reachable_location(self, target_location):
-        return (self.y_axis.nearest_reachable_location(target_location[0]),
-                self.x_axis.nearest_reachable_location(target_location[1]))
-
-    def _set_axis_directions_for(self, target_location):
-        self.y_axis.forwards = target_location[0] >= self.current_location[0]
-        self.x_axis.forwards = target_location[1] >= self.current_location[1]
-
-    def _step_the_axis_which_is_behind(self, current_distances, target_distances):
-        if current_distances[0] >= target_distances[0]:
-            self.x_axis.step()
-        elif current_distances[0] * target_distances[1] <= current_distances[1] * target_distances[0]:
+        axes = (self.y_axis, self.x_axis)
+        if all(axis.microsteps == m for axis, m in zip(axes, microsteps)):
+            return
+
+        target_location = np.array([axis.nearest_location_for_microsteps(m, towards[i])
+                                    for i, (axis, m) in enumerate(zip(axes, microsteps))])
+        if np.any(target_location != self.current_location):
+            for axis in axes:
+                axis.microsteps = axis.motor.max_microsteps
+            motion_plan = motion_planning.plan_motion(np.vstack((self.current_location, target_location)),
+                                                      max_speed=pen_speed,
+                                                      acceleration=self.acceleration,
+                                                      max_axis_speeds=(self.y_axis.max_speed, self.x_axis.max_speed))
+
+            # The steps count towards the curve which follows, for the step telemetry
+            self._run_step_schedule(self._compile_step_schedule(motion_plan), num_curves=0)
+
+        for axis, m in zip(axes, microsteps):
+            axis.microsteps = m
+
+    def _compile_step_schedule(self, motion_plan: motion_planning.MotionPlan) -> np.ndarray:
+        """Compile a motion plan, whose first point is the current location, into a step schedule."""
+        target_steps = np.column_stack((self.y_axis.nearest_steps(motion_plan.points[:, 0]),
+                                        self.x_axis.nearest_steps(motion_plan.points[:, 1])))
+        target_steps[0] = self.y_axis.current_step, self.x_axis.current_step
+        return step_schedule.compile_step_schedule(motion_plan, target_steps)
+
+    def _run_step_schedule(self, schedule: np.ndarray, segment_curves: np.ndarray = None, num_curves: int = 1,
+                           before_end=None, seconds_before_end: float = 0) -> None:
+        """
+        Step the axes as specified by a step schedule.
+
+        Args:
+            schedule (np.ndarray): A vector of ticks, as returned by step_schedule.compile_step_schedule().
+            segment_curves (np.ndarray): The index of the curve to which each segment of the path belongs, for the step
+                                         telemetry. By default, the path is a single curve.
+            num_curves (int): The number of curves in the path.
+            before_end (callable): As for follow().
+            seconds_before_end (float): As for follow().
+        """
+        y_forwards = None
+        x_forwards = None
+
+        # The tick at which to call before_end. This is after the last tick if the whole move takes no longer than
+        # seconds_before_end (e.g. when it is instantaneous, as in simulation), since there is then nothing to be gained
+        # by starting early.
+        before_end_tick = None
+        if before_end is not None:
+            if len(schedule) == 0 or schedule['time'][-1] <= seconds_before_end:
+                before_end_tick = len(schedule)
+            else:
+                before_end_tick = int(np.searchsorted(schedule['time'], schedule['time'][-1] - seconds_before_end,
+                                                      side='right'))
+
+        if plot_job.recorder is not None:
+            plot_job.recorder.record_steps(schedule, self.current_location,
+                                           (self.y_axis.microsteps, self.x_axis.microsteps))
+
+        # Only record the time of each tick if the step telemetry is enabled
+        recorder = step_telemetry.recorder
+        actual_times = np.full(len(schedule), np.nan) if recorder is not None else None
+
+        start_time = timing.now()
+        try:
+            for tick_index, (y_step, x_step, due_time) in enumerate(zip(schedule['y_step'].tolist(),
+                                                                        schedule['x_step'].tolist(),
+                                                                        schedule['time'].tolist())):
+                if y_step and (y_step > 0) is not y_forwards:
+                    y_forwards = self.y_axis.forwards = y_step > 0
+                if x_step and (x_step > 0) is not x_forwards:
+                    x_forwards = self.x_axis.forwards = x_step > 0
+
+                timing.sleep_until(start_time + due_time)
+                if tick_index == before_end_tick:
+                    before_end()
+                self._step_axes(y_step != 0, x_step != 0)
+
+                if actual_times is not None:
+                    actual_times[tick_index] = timing.now()
+
+            if before_end_tick == len(schedule):
+                before_end()
+        finally:
+            if recorder is not None:
+                is_taken = ~np.isnan(actual_times)
+                tick_curves = segment_curves[schedule['segment']] if segment_curves is not None else 0
+                recorder.record_move(schedule[is_taken], start_time, actual_times[is_taken],
+                                     np.broadcast_to(tick_curves, len(schedule))[is_taken], num_curves)
+
+    def _step_axes(self, step_y: bool, step_x: bool) -> None:
+        if step_y and step_x:
+            step_axes_together((self.y_axis, self.x_axis))
+        elif step_y:
             self.y_axis.step()
-        else:
+        elif step_x:
             self.x_axis.step()
 
 
+class HomingReport:
+    """The time taken to home an AxisPair. The time for an axis is None if it failed to home."""
+
+    def __init__(self, y_axis_seconds, x_axis_seconds, total_seconds):
+        self.y_axis_seconds = y_axis_seconds
+        self.x_axis_seconds = x_axis_seconds
+        self.total_seconds = total_seconds
+
+    def __str__(self):
+        return 'Homed in {:.2f} seconds (y-axis: {} seconds, x-axis: {} seconds)'.format(
+            self.total_seconds,
+            *('{:.2f}'.format(seconds) if seconds is not None else 'failed'
+              for seconds in (self.y_axis_seconds, self.x_axis_seconds)))
+
+
 class AxisPairWithDebugImage(AxisPair):
     @staticmethod
     def create_from(axes: AxisPair):
-        return AxisPairWithDebugImage(y_axis=axes.y_axis, x_axis=axes.x_axis)
+        return AxisPairWithDebugImage(y_axis=axes.y_axis, x_axis=axes.x_axis, acceleration=axes.acceleration,
+                                      junction_deviation=axes.junction_deviation)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.debug_image = debug_movement.DebugImage(millimetres_per_step=self.x_axis.millimetres_per_step,
-                                                     bgimage_path=config.debug_image_file_path)
+        self.debug_image = debug_movement.DebugImage(bgimage_path=config.debug_image_file_path)
+        self.trajectory_log = trajectory_log.TrajectoryLog(config.trajectory_file_path)
+        atexit.register(self.trajectory_log.close)
 
     @property
     def current_location(self):
@@ -373,20 +716,17 @@ class AxisPairWithDebugImage(AxisPair):
     @current_location.setter
     def current_location(self, value):
         AxisPair.current_location.__set__(self, value)
+        self.debug_image.end_line()
         self.debug_image.add_point(value)
         self.debug_image.change_colour()
 
-    def follow(self, *args, **kwargs):
+    def follow_curves(self, *args, **kwargs):
         self.debug_image.change_colour()
-        super().follow(*args, **kwargs)
-        self.debug_image.save_image()
-
-    def _step_the_axis_which_is_behind(self, current_distances, target_distances):
-        super()._step_the_axis_which_is_behind(current_distances, target_distances)
-        self.debug_image.add_point(self.current_location)
-
-
-def _sleep_until(wake_time):
-    sleep_duration = wake_time - time.time()
-    if sleep_duration > 0:
-        time.sleep(sleep_duration)
+        super().follow_curves(*args, **kwargs)
+        self.trajectory_log.flush()
+
+    def _step_axes(self, step_y: bool, step_x: bool) -> None:
+        super()._step_axes(step_y, step_x)
+        location_y, location_x = self.y_axis.current_location, self.x_axis.current_location
+        self.debug_image.add_point((location_y, location_x))
+        self.trajectory_log.record(timing.now(), location_y, location_x)
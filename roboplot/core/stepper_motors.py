@@ -5,44 +5,81 @@ Authors:
     Hannah Howell, Jack Buckingham
 """
 
-import time
-
 import roboplot.config as config
+import roboplot.core.timing as timing
 from roboplot.core.gpio.gpio_wrapper import GPIO
 
 
 class StepperMotor:
     """This class is the collection of functions to set up and use a stepper motor."""
 
-    steps_per_revolution = 0
     clockwise = True
     _next_step = 0
     _minimum_seconds_between_steps = 0.0015 if config.real_hardware else 0.0
-    _earliest_next_step = time.time()
+    _earliest_next_step = timing.now()
 
-    def __init__(self, pins, sequence, steps_per_revolution, minimum_seconds_between_steps=_minimum_seconds_between_steps):
+    def __init__(self, pins, sequence, steps_per_revolution, minimum_seconds_between_steps=_minimum_seconds_between_steps,
+                 phases_per_full_step=1):
         """
         Initialises the Motor class.
 
         Args:
             pins: The gpio pins to which the real motor is connected.
 
-            sequence: The step _sequence associated with the stepper motor. This should be a (python) _sequence of four
-                      sequences of length four. The ith element gives the states of the four pins at the ith step.
+            sequence: The step _sequence associated with the stepper motor. This should be a (python) _sequence of
+                      sequences, one for each phase of the motor, each giving the states of the pins in that phase.
+
+            steps_per_revolution: The number of full steps required to turn the motor one revolution.
 
-            steps_per_revolution: The number of steps required to turn the motor one revolution.
+            phases_per_full_step: The number of phases of the sequence in each full step. For example, this is 2 for a
+                                  half step sequence. The motor may then be set to take smaller steps than full steps.
         """
+        assert len(sequence) % phases_per_full_step == 0, "The sequence must consist of whole full steps!"
 
-        self.steps_per_revolution = steps_per_revolution
-        self._gpio_pins = pins
+        self._full_steps_per_revolution = steps_per_revolution
+        self._gpio_pins = tuple(pins)
         self._sequence = sequence
         self._minimum_seconds_between_steps = minimum_seconds_between_steps
+        self._phases_per_full_step = phases_per_full_step
+        self._phases_per_step = phases_per_full_step
+
+        # Precompute the levels of the pins at each step, so that each step needs only a single GPIO write
+        self._pin_levels = [tuple(GPIO.HIGH if state == 1 else GPIO.LOW for state in states) for states in sequence]
 
         # Setup pins
         for pin in pins:
             GPIO.setup(pin, GPIO.OUT)
             GPIO.output(pin, False)
 
+    @property
+    def minimum_seconds_between_steps(self) -> float:
+        return self._minimum_seconds_between_steps
+
+    @property
+    def microsteps(self) -> int:
+        """The number of steps taken for each full step: 1 for full steps, 2 for half steps, etc."""
+        return self._phases_per_full_step // self._phases_per_step
+
+    @microsteps.setter
+    def microsteps(self, value: int) -> None:
+        if value < 1 or self._phases_per_full_step % value != 0:
+            raise ValueError('This motor cannot take 1/{} steps!'.format(value))
+        self._phases_per_step = self._phases_per_full_step // value
+
+    @property
+    def max_microsteps(self) -> int:
+        """The largest value of microsteps supported, for which each step moves a single phase through the sequence."""
+        return self._phases_per_full_step
+
+    @property
+    def phases_per_step(self) -> int:
+        return self._phases_per_step
+
+    @property
+    def steps_per_revolution(self) -> int:
+        """The number of steps (of the current size) required to turn the motor one revolution."""
+        return self._full_steps_per_revolution * self.microsteps
+
     def step(self):
         """
         This function steps the motor once and increments the _sequence.
@@ -54,30 +91,21 @@ class StepperMotor:
         self._set_earliest_next_step()
 
     def _wait_until_safe_to_step(self):
-        while time.time() < self._earliest_next_step:
-            pass
+        timing.sleep_until(self._earliest_next_step)
 
     def _step_without_time_check(self):
-        for pin in range(0, 4):  # Creates an Index from 0-3
-
-            # Check what status the current pin should be set to based on the current step count.
-            current_pin = self._gpio_pins[pin]
-
-            if self._sequence[self._next_step][pin] == 1:
-                # Keep/Turn on the pin
-                GPIO.output(current_pin, True)
-            else:
-                # Keep/Turn off the pin off
-                GPIO.output(current_pin, False)
+        GPIO.output(self._gpio_pins, self._pin_levels[self._next_step])
+        self._advance_sequence()
 
+    def _advance_sequence(self):
         # Increment / decrement the step count based on the direction of the motor.
         if self.clockwise:
-            self._next_step = (self._next_step + 1) % 4
+            self._next_step = (self._next_step + self._phases_per_step) % len(self._sequence)
         else:
-            self._next_step = (self._next_step - 1) % 4
+            self._next_step = (self._next_step - self._phases_per_step) % len(self._sequence)
 
     def _set_earliest_next_step(self):
-        self._earliest_next_step = time.time() + self._minimum_seconds_between_steps
+        self._earliest_next_step = timing.now() + self._minimum_seconds_between_steps
 
     def start(self, duration, rps):
         """
@@ -96,9 +124,10 @@ class StepperMotor:
         number_of_steps = round(rps * self.steps_per_revolution * duration)
         wait_time = 1 / (rps * self.steps_per_revolution)
 
+        start_time = timing.now()
         for step in range(number_of_steps):
             self.step()
-            time.sleep(wait_time)
+            timing.sleep_until(start_time + (step + 1) * wait_time)
 
     def change_direction(self, clockwise):
         """This function changes the direction the motor will move in the next time it steps.
@@ -109,11 +138,55 @@ class StepperMotor:
         return "stepper_motors.py: Pins:" + ''.join(str(pin) for pin in self._gpio_pins)
 
 
+def step_together(motors) -> None:
+    """
+    Step several motors at once, setting the pins of all of them with a single GPIO write.
+
+    The minimum time between steps is upheld for each motor, as in StepperMotor.step().
+
+    Args:
+        motors (sequence of StepperMotor): The motors to step.
+    """
+    pins = ()
+    levels = ()
+    for motor in motors:
+        motor._wait_until_safe_to_step()
+        pins += motor._gpio_pins
+        levels += motor._pin_levels[motor._next_step]
+
+    GPIO.output(pins, levels)
+
+    for motor in motors:
+        motor._advance_sequence()
+        motor._set_earliest_next_step()
+
+
+def half_step_sequence(full_step_sequence):
+    """
+    Creates a half step sequence from a full step sequence, by inserting a phase between each pair of consecutive full
+    steps in which only those pins which are on in both of them are on.
+
+    Args:
+        full_step_sequence: The full step sequence, as described in StepperMotor.__init__.
+
+    Returns:
+        list: The half step sequence, which is twice as long.
+    """
+    sequence = []
+    for state, next_state in zip(full_step_sequence, full_step_sequence[1:] + full_step_sequence[:1]):
+        sequence.append(list(state))
+        sequence.append([1 if pin_state == 1 and next_pin_state == 1 else 0
+                         for pin_state, next_pin_state in zip(state, next_state)])
+    return sequence
+
+
 def large_stepper_motor(gpio_pins):
     """
     Creates a StepperMotor with the step _sequence and number of steps per revolution of the large stepper motor
     (42BYGHW208).
 
+    The motor takes full steps by default, but supports half steps (see StepperMotor.microsteps).
+
     Args:
         gpio_pins: The gpio pins to which the motor is connected.
 
@@ -122,8 +195,9 @@ def large_stepper_motor(gpio_pins):
 
     """
     return StepperMotor(gpio_pins,
-                        sequence=[[1, 0, 1, 0], [0, 1, 1, 0], [0, 1, 0, 1], [1, 0, 0, 1]],
-                        steps_per_revolution=200)
+                        sequence=half_step_sequence([[1, 0, 1, 0], [0, 1, 1, 0], [0, 1, 0, 1], [1, 0, 0, 1]]),
+                        steps_per_revolution=200,
+                        phases_per_full_step=2)
 
 
 def small_stepper_motor(gpio_pins):
@@ -0,0 +1,153 @@
+"""
+Timing Module
+
+This module provides the clock and waiting functions used to time motor movements.
+
+The time is taken from the clock in use, which is one of two kinds:
+    - A WallClock waits in real time. On its own, time.sleep() can overshoot by a whole scheduler tick, while spinning
+      on the clock until the wake time keeps a CPU core busy (starving any other threads, e.g. those analysing images).
+      Instead, the wall clock sleeps until shortly before the wake time and then spins for the remainder. The margin
+      left for spinning is calibrated when this module is first imported, by measuring how far time.sleep() overshoots
+      on this machine.
+    - A VirtualClock never waits. Instead, waiting until a time moves the clock forwards to that time. Since the clock
+      still reads the times at which things would have happened, a simulated job runs as fast as it can be computed
+      while still reporting how long it would have taken on the real plotter.
+
+When running on real hardware the wall clock is used, and otherwise the virtual clock. Use use_clock() to change this.
+
+All times in the module are expressed in SECONDS.
+"""
+
+import threading
+import time
+
+import roboplot.config as config
+
+
+class WallClock:
+    """A clock which reads and waits in real time."""
+
+    @staticmethod
+    def now() -> float:
+        """
+        Returns:
+            float: the current time. Its reference point is undefined, so only differences between times matter.
+        """
+        return time.perf_counter()
+
+    def sleep_until(self, wake_time: float) -> None:
+        """
+        Wait until the given time, as precisely as possible.
+
+        Args:
+            wake_time (float): the time at which to return, as given by now()
+        """
+        seconds_to_sleep = wake_time - self.now() - sleep_margin
+        if seconds_to_sleep > 0:
+            time.sleep(seconds_to_sleep)
+
+        while self.now() < wake_time:
+            pass
+
+
+class VirtualClock:
+    """
+    A clock which jumps forwards to a wake time instead of waiting for it.
+
+    The clock is shared by all threads and never goes backwards, so waits on different threads overlap if they are timed
+    from a common start time (as in AxisPair.home()) but otherwise add up.
+    """
+
+    def __init__(self, start_time: float = 0):
+        """
+        Args:
+            start_time (float): the time at which the clock starts
+        """
+        self._time = start_time
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        """
+        Returns:
+            float: the current time
+        """
+        return self._time
+
+    def sleep_until(self, wake_time: float) -> None:
+        """
+        Move the clock forwards to the given time, if it is not already later.
+
+        Args:
+            wake_time (float): the time to which to move the clock
+        """
+        with self._lock:
+            if wake_time > self._time:
+                self._time = wake_time
+
+
+def now() -> float:
+    """
+    Returns:
+        float: the current time according to the clock in use. Only differences between times matter.
+    """
+    return clock.now()
+
+
+def sleep_until(wake_time: float) -> None:
+    """
+    Wait until the given time according to the clock in use.
+
+    Args:
+        wake_time (float): the time at which to return, as given by now()
+    """
+    clock.sleep_until(wake_time)
+
+
+def sleep(seconds: float) -> None:
+    """
+    Wait for the given number of seconds according to the clock in use.
+
+    Args:
+        seconds (float): the time for which to wait
+    """
+    sleep_until(now() + seconds)
+
+
+def use_clock(new_clock) -> None:
+    """
+    Change the clock used to time motor movements. This should be done before any movement starts, since times read
+    from one clock mean nothing to another.
+
+    Args:
+        new_clock (WallClock | VirtualClock): the clock to use
+    """
+    global clock
+    clock = new_clock
+
+
+def _calibrate_sleep_margin(num_samples: int = 20, sample_seconds: float = 0.001,
+                            max_margin: float = 0.01) -> float:
+    """
+    Measure the worst overshoot of time.sleep() over a number of short sleeps.
+
+    Args:
+        num_samples (int): the number of sleeps to measure
+        sample_seconds (float): the duration of each sleep
+        max_margin (float): an upper bound on the margin, in case the machine happens to be very busy
+
+    Returns:
+        float: the margin for the wall clock to leave for spinning at the end of a wait
+    """
+    worst_overshoot = 0
+    for _ in range(num_samples):
+        start_time = time.perf_counter()
+        time.sleep(sample_seconds)
+        worst_overshoot = max(worst_overshoot, time.perf_counter() - start_time - sample_seconds)
+
+    return min(worst_overshoot, max_margin)
+
+
+sleep_margin = _calibrate_sleep_margin()
+
+# The clock used for all motor timing
+clock = WallClock() if config.real_hardware else VirtualClock()
@@ -0,0 +1,105 @@
+"""
+Trajectory Log Module
+
+This module records where the pen was at each step, and whether it was down, into a compact binary file. The file is
+written as the plotter moves and read afterwards, e.g. by scripts/render_trajectory.py, to draw stills or videos of
+the movement without slowing the movement down.
+
+Trajectory files have the following layout, with all numbers little-endian:
+    - a header, with dtype trajectory_header_dtype,
+    - the samples, in the order in which they were taken, with dtype trajectory_sample_dtype.
+The number of samples is not stored, so samples can simply be appended to the file. A file cut short (e.g. because the
+program which was writing it crashed) can still be read, up to its last whole sample.
+
+All times in the module are expressed in SECONDS and all distances in MILLIMETRES.
+"""
+
+import os
+
+import numpy as np
+
+trajectory_file_magic = b'RPLOTTRJ'
+trajectory_file_version = 1
+
+trajectory_header_dtype = np.dtype([('magic', 'S8'),
+                                    ('version', '<u4')])
+
+trajectory_sample_dtype = np.dtype([('time', '<f8'),  # As given by timing.now()
+                                    ('location', '<f4', 2),  # The (y,x) location of the pen
+                                    ('pen_is_down', '?')])
+
+default_samples_per_batch = 2 ** 12
+
+
+class TrajectoryLog:
+    """
+    Appends samples to a trajectory file.
+
+    Samples are buffered, and written in batches, so record() is cheap enough to call for every step.
+    """
+
+    def __init__(self, file_path: str, samples_per_batch: int = default_samples_per_batch):
+        """
+        Create (or overwrite) a trajectory file.
+
+        Args:
+            file_path (str): The path to the file.
+            samples_per_batch (int): The number of samples buffered before they are written to the file.
+        """
+        self.file_path = file_path
+        self.pen_is_down = False  # Recorded with each sample
+
+        self._samples = np.zeros(samples_per_batch, dtype=trajectory_sample_dtype)
+        self._num_samples = 0
+
+        self._file = open(file_path, 'wb')
+        np.array([(trajectory_file_magic, trajectory_file_version)], dtype=trajectory_header_dtype).tofile(self._file)
+
+    def record(self, time: float, location_y: float, location_x: float) -> None:
+        """Record that the pen was at the given location at the given time."""
+        self._samples[self._num_samples] = (time, (location_y, location_x), self.pen_is_down)
+        self._num_samples += 1
+        if self._num_samples == len(self._samples):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write any buffered samples to the file."""
+        if self._num_samples > 0:
+            self._samples[:self._num_samples].tofile(self._file)
+            self._num_samples = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        """Write any buffered samples, and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+def load(file_path: str) -> np.ndarray:
+    """
+    Map a trajectory file into memory.
+
+    Args:
+        file_path (str): The path to the file, as written by TrajectoryLog.
+
+    Returns:
+        np.ndarray: The samples, with dtype trajectory_sample_dtype, which are read from the file as they are needed.
+
+    Raises:
+        ValueError: If the file is not a trajectory file of the version written by this module.
+    """
+    header = np.fromfile(file_path, dtype=trajectory_header_dtype, count=1)
+    if len(header) == 0 or header['magic'][0] != trajectory_file_magic:
+        raise ValueError('{} is not a trajectory file!'.format(file_path))
+    if header['version'][0] != trajectory_file_version:
+        raise ValueError('{} is a version {} trajectory file, but only version {} can be read!'.format(
+            file_path, header['version'][0], trajectory_file_version))
+
+    # Ignore any partly written sample at the end
+    samples_offset = trajectory_header_dtype.itemsize
+    num_samples = (os.path.getsize(file_path) - samples_offset) // trajectory_sample_dtype.itemsize
+
+    # np.memmap cannot map an empty array
+    return np.memmap(file_path, dtype=trajectory_sample_dtype, mode='r', offset=samples_offset, shape=num_samples) \
+        if num_samples > 0 else np.zeros(0, dtype=trajectory_sample_dtype)
@@ -1,24 +1,51 @@
+import numpy as np
 import svgpathtools as svg
 
 import roboplot.core.curves as curves
+import roboplot.core.polyline_simplification as polyline_simplification
 import roboplot.svg.svg_parsing as svg_parsing
 
 
-def points_to_line_segments(points_yx, is_closed: bool):
+def points_to_line_segments(points_yx, is_closed: bool, tolerance_millimetres: float = 0):
     """
     Convert a set of points to a sequence of line segments between the points.
 
     Args:
         points_yx: the list/tuple/numpy array of points
         is_closed: if true then a line segment between the last and first point will be included
+        tolerance_millimetres: if positive then points which lie within this distance of the line segments through the
+                               remaining points are removed first (see polyline_simplification.simplify())
 
     Returns:
         list[curves.LineSegment]: the sequence of line segments joining the points
     """
-    path_curve = [curves.LineSegment(points_yx[i - 1], points_yx[i]) for i in range(1, len(points_yx))]
     if is_closed and len(points_yx) > 0:
-        path_curve.append(curves.LineSegment(points_yx[-1], points_yx[0]))
-    return path_curve
+        points_yx = np.vstack((points_yx, points_yx[0]))
+    if tolerance_millimetres > 0:
+        points_yx = polyline_simplification.simplify(points_yx, tolerance_millimetres)
+
+    return [curves.LineSegment(points_yx[i - 1], points_yx[i]) for i in range(1, len(points_yx))]
+
+
+def points_to_polyline(points_yx, is_closed: bool, tolerance_millimetres: float = 0):
+    """
+    Convert a set of points to a single curve joining the points.
+
+    Args:
+        points_yx: the list/tuple/numpy array of points, of which there must be at least one
+        is_closed: if true then the curve returns from the last point to the first
+        tolerance_millimetres: as for points_to_line_segments()
+
+    Returns:
+        curves.Polyline: the curve joining the points
+    """
+    points_yx = np.reshape(points_yx, (-1, 2))
+    if is_closed:
+        points_yx = np.vstack((points_yx, points_yx[0]))
+    if tolerance_millimetres > 0:
+        points_yx = polyline_simplification.simplify(points_yx, tolerance_millimetres)
+
+    return curves.Polyline(points_yx)
 
 
 def points_to_svg_line_segments(points_yx, is_closed: bool):
@@ -225,8 +225,8 @@ class DotToDotPlotter:
         Args:
             dot_to_dot_numbers (list[number_recognition.GlobalNumber]):
         """
-        path_curve = curve_creation.points_to_svg_line_segments([n.dot_location_yx_mm for n in dot_to_dot_numbers],
-                                                                is_closed=True)
+        path_curve = curve_creation.points_to_polyline([n.dot_location_yx_mm for n in dot_to_dot_numbers],
+                                                       is_closed=True)
         self._plotter.draw(path_curve)
 
 
@@ -9,6 +9,7 @@ import numpy as np
 import roboplot.config as config
 import roboplot.core.curves as curves
 import roboplot.core.hardware as hardware
+import roboplot.core.polyline_simplification as polyline_simplification
 import roboplot.imgproc.image_analysis as image_analysis
 import roboplot.imgproc.image_analysis_enums as image_analysis_enums
 import roboplot.imgproc.image_analysis_debug as iadebug
@@ -22,16 +23,18 @@ class PathFinder:
     removal_count = 0
     path_end_position_at_last_removal = [10000000000, 1000000000]
 
-    def follow_computed_path(self):
+    def follow_computed_path(self, tolerance_millimetres=0.1):
         """
         This function follows the internal computed path with the pen.
         Args:
+            tolerance_millimetres: Points of the path within this distance of the line drawn are skipped, since the
+                                   path found from the images has many nearly collinear points.
         Returns:
+            Future: completes once the path has been drawn
         """
         # Calculate and draw lines.
-        line_segments = [curves.LineSegment(self.computed_path[i - 1], self.computed_path[i])
-                         for i in range(1, len(self.computed_path))]
-        hardware.plotter.draw(line_segments)
+        path = polyline_simplification.simplify(self.computed_path, tolerance_millimetres)
+        return hardware.plotter.draw(curves.Polyline(path))
 
     def calculate_path_from_image(self, image_to_analyse, rotation_deg=0):
         """
@@ -93,9 +96,9 @@ class PathFinder:
                 length, is_valid_path = image_analysis.analyse_candidate_path(self.computed_path,
                                                                               candidate_path_segments[i])
                 if __debug__:
-                    iadebug.save_line_approximation(hardware.plotter.debug_image.debug_image.copy(), self.computed_path,
+                    iadebug.save_line_approximation(hardware.plotter.debug_image.image.copy(), self.computed_path,
                                                     False)
-                    iadebug.save_candidate_line_approximation(hardware.plotter.debug_image.debug_image.copy(),
+                    iadebug.save_candidate_line_approximation(hardware.plotter.debug_image.image.copy(),
                                                               self.computed_path, candidate_path_segments[i], i)
             else:
                 is_valid_path = False
@@ -252,7 +255,7 @@ class PathFinder:
                 self.computed_path.extend(new_path)
 
                 if __debug__:
-                    iadebug.save_line_approximation(hardware.plotter.debug_image.debug_image.copy(), self.computed_path,
+                    iadebug.save_line_approximation(hardware.plotter.debug_image.image.copy(), self.computed_path,
                                                     False)
 
             except Exception as e:
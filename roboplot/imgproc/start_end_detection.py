@@ -72,7 +72,7 @@ def find_red_at_position(camera_centre, min_size):
     """
 
     # Move to camera position
-    if not np.array_equal(hardware.plotter._axes.current_location + config.CAMERA_OFFSET, camera_centre):
+    if not np.array_equal(hardware.plotter.camera_location, camera_centre):
         hardware.plotter.move_camera_to(camera_centre)
 
     photo = hardware.plotter.take_photo_at(camera_centre)
@@ -114,7 +114,7 @@ def find_green_at_position(camera_centre, min_size):
     """
 
     # Move to camera position
-    if not np.array_equal(hardware.plotter._axes.current_location + config.CAMERA_OFFSET, camera_centre):
+    if not np.array_equal(hardware.plotter.camera_location, camera_centre):
         hardware.plotter.move_camera_to(camera_centre)
 
     photo = hardware.plotter.take_photo_at(camera_centre)
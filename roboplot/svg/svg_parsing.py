@@ -1,11 +1,13 @@
 import itertools
 import re
 import warnings
+import xml.etree.ElementTree as ElementTree
 
 import numpy as np
 import svgpathtools as svg
+from svgpathtools.svg_to_paths import ellipse2pathd, polygon2pathd, polyline2pathd, rect2pathd
 
-from roboplot.core.curves import Curve
+from roboplot.core.curves import Curve, CubicBezier, EllipticalArc, LineSegment, QuadraticBezier
 
 
 def parse(filepath: str):
@@ -30,6 +32,59 @@ def parse(filepath: str):
         return [SVGPathRotatedBy90Degrees(path, svg_attributes.scale_factor, svg_attributes.height) for path in paths]
 
 
+def iterparse(filepath: str):
+    """
+    Parses an svg file incrementally, yielding each SVGPath as soon as the element containing it has been read.
+
+    Unlike parse(), this does not hold the whole document in memory, and so the first path can be drawn while the
+    rest of the file is still being read. The paths are yielded in the order in which they appear in the document,
+    rather than grouped by the kind of element from which they came.
+
+    Args:
+        filepath (str): path to the svg file.
+
+    Yields:
+        SVGPath: each continuous subpath in the document, in order.
+    """
+    svg_attributes = None
+    open_elements = []
+
+    for event, element in ElementTree.iterparse(filepath, events=('start', 'end')):
+        tag = element.tag.rsplit('}', 1)[-1]  # Remove any namespace
+
+        if event == 'start':
+            if svg_attributes is None and tag == 'svg':
+                svg_attributes = SvgAttributes(element.attrib)
+            open_elements.append(element)
+            continue
+
+        open_elements.pop()
+        to_path_d = _path_d_converters.get(tag)
+        if to_path_d is not None:
+            for path in svg.parse_path(to_path_d(element.attrib)).continuous_subpaths():
+                if svg_attributes.is_portrait:
+                    yield SVGPath(path, svg_attributes.scale_factor)
+                else:
+                    yield SVGPathRotatedBy90Degrees(path, svg_attributes.scale_factor, svg_attributes.height)
+
+        # Discard each element once it has been read, so that memory does not grow with the size of the document
+        if len(open_elements) > 0:
+            open_elements[-1].remove(element)
+
+
+# Functions which convert the attributes of each kind of svg element (as in svgpathtools.svg2paths()) to a path
+_path_d_converters = {
+    'path': lambda attributes: attributes.get('d', ''),
+    'polyline': polyline2pathd,
+    'polygon': polygon2pathd,
+    'line': lambda attributes: 'M{} {}L{} {}'.format(attributes['x1'], attributes['y1'],
+                                                     attributes['x2'], attributes['y2']),
+    'ellipse': ellipse2pathd,
+    'circle': ellipse2pathd,
+    'rect': rect2pathd,
+}
+
+
 class SvgAttributes:
     """Extracts information from a dictionary of attributes on the svg element of an svg document."""
 
@@ -111,31 +166,100 @@ class SVGPath(Curve):
         """
         self._path = path
         self._mm_per_unit = mm_per_unit
+        self._bounding_box = None
+        self._path_key = None
+        self._arc_length_tables = {}
 
     @property
     def total_millimetres(self):
         return self._path.length() * self._mm_per_unit
 
+    @property
+    def bounding_box(self) -> np.ndarray:
+        # svgpathtools finds the box analytically, but it is still slow enough to be worth keeping
+        if self._bounding_box is None:
+            x_min, x_max, y_min, y_max = self._path.bbox()
+            corners = np.array([complex(x_min, y_min), complex(x_max, y_max)]) * self._mm_per_unit
+            corners = np.column_stack(self._complex_to_yx(corners))
+            self._bounding_box = np.vstack((np.min(corners, axis=0), np.max(corners, axis=0)))
+        return self._bounding_box
+
     def evaluate_at(self, arc_lengths, evaluation_tolerance_mm=_default_evaluation_tolerance_mm) -> np.ndarray:
-        # First use ilength(...) to map curve lengths to the built-in parameterisation
-        tol = evaluation_tolerance_mm / self._mm_per_unit
-        t_values = [self._path.ilength(s, s_tol=tol)
-                    for s in np.array(arc_lengths, copy=False, ndmin=1) / self._mm_per_unit]
+        # First use a table of arc lengths to map curve lengths to the built-in parameterisation of each segment
+        table = self._arc_length_table(evaluation_tolerance_mm / self._mm_per_unit)
+        segment_indices, t_values = table.parameters_at(np.array(arc_lengths, dtype=float, ndmin=1) / self._mm_per_unit)
 
-        # Then evaluate the curve at these points
-        points_as_complex = np.array([self._path.point(t) for t in t_values]) * self._mm_per_unit
+        # Then evaluate each segment at all its points at once
+        points_as_complex = np.empty(len(t_values), dtype=complex)
+        for segment_index in np.unique(segment_indices):
+            is_on_segment = segment_indices == segment_index
+            points_as_complex[is_on_segment] = self._path[segment_index].point(t_values[is_on_segment])
+
+        points_as_complex *= self._mm_per_unit
         return np.column_stack(self._complex_to_yx(points_as_complex))
 
+    def _arc_length_table(self, tolerance: float):
+        """The arc length table for the path with the given tolerance (in user units), built on first use."""
+        table = self._arc_length_tables.get(tolerance)
+        if table is None:
+            table = ArcLengthTable(self._path, tolerance)
+            self._arc_length_tables[tolerance] = table
+        return table
+
     @staticmethod
     def _complex_to_yx(points_as_complex):
         return np.imag(points_as_complex), np.real(points_as_complex)
 
-    def to_series_of_points(self, interval_millimetres: float, include_last_point: bool = True) -> np.ndarray:
+    def to_native_curves(self) -> list:
+        """
+        Convert the path into curves from roboplot.core.curves, one for each segment, which follow on from one another.
+
+        The curves are evaluated entirely with NumPy, so following them is much faster than following the path itself.
+
+        Returns:
+            list[Curve]: The curves, in order.
+        """
+        return [self._to_native_curve(segment) for segment in self._path]
+
+    def _to_native_curve(self, segment) -> Curve:
+        if isinstance(segment, svg.Line):
+            return LineSegment(self._point_to_yx(segment.start), self._point_to_yx(segment.end))
+        elif isinstance(segment, svg.QuadraticBezier):
+            return QuadraticBezier(*map(self._point_to_yx, segment.bpoints()))
+        elif isinstance(segment, svg.CubicBezier):
+            return CubicBezier(*map(self._point_to_yx, segment.bpoints()))
+        elif isinstance(segment, svg.Arc):
+            # The map into millimetres scales and rotates the ellipse (and perhaps reflects it, which reverses the
+            # parametric angle), so follow where it takes the axes of the ellipse
+            centre = self._point_to_yx(segment.center)
+            first_axis = self._point_to_yx(segment.center + segment.rot_matrix) - centre
+            second_axis = self._point_to_yx(segment.center + 1j * segment.rot_matrix) - centre
+            angle_sign = 1 if first_axis[1] * second_axis[0] - first_axis[0] * second_axis[1] >= 0 else -1
+
+            return EllipticalArc(centre,
+                                 x_radius=segment.radius.real * self._mm_per_unit,
+                                 y_radius=segment.radius.imag * self._mm_per_unit,
+                                 rotation_degrees=np.rad2deg(np.arctan2(first_axis[0], first_axis[1])),
+                                 start_degrees=angle_sign * segment.theta,
+                                 end_degrees=angle_sign * (segment.theta + segment.delta))
+        else:
+            raise TypeError("Unrecognised svg segment: {}".format(segment))
+
+    def _point_to_yx(self, point: complex) -> np.ndarray:
+        return np.array(self._complex_to_yx(point * self._mm_per_unit), dtype=float)
+
+    @property
+    def _geometry_key(self):
+        if self._path_key is None:
+            self._path_key = self._path.d()
+        return type(self).__name__, self._path_key, self._mm_per_unit
+
+    def _compute_series_of_points(self, interval_millimetres: float, include_last_point: bool) -> np.ndarray:
         evaluation_tolerance = self._default_evaluation_tolerance_mm
         if interval_millimetres < 10 * evaluation_tolerance:
             evaluation_tolerance = interval_millimetres / 10
             warnings.warn("\nA greater accuracy than {} was requested!\n"
-                          "Reducing the evaluation tolerance passed to ilength to {} to compensate..."
+                          "Reducing the evaluation tolerance to {} to compensate..."
                           .format(10 * self._default_evaluation_tolerance_mm, evaluation_tolerance))
 
         arc_lengths = np.arange(0, self.total_millimetres, interval_millimetres, dtype=float)
@@ -145,6 +269,43 @@ class SVGPath(Curve):
 
         return self.evaluate_at(arc_lengths, evaluation_tolerance)
 
+    def _compute_series_of_points_within_tolerance(self, tolerance_millimetres: float,
+                                                   include_last_point: bool) -> np.ndarray:
+        # Work segment by segment in the parameterisation built into svgpathtools, which avoids the expensive search
+        # for the parameter at each arc length
+        tolerance = tolerance_millimetres / self._mm_per_unit
+        points_as_complex = [np.array([self._path.start])]
+        for segment in self._path:
+            num_intervals = self._num_intervals_within_tolerance(segment, tolerance)
+            points_as_complex.append(segment.point(np.arange(1, num_intervals + 1) / num_intervals))
+
+        points_as_complex = np.concatenate(points_as_complex) * self._mm_per_unit
+        if not include_last_point:
+            points_as_complex = points_as_complex[:-1]
+        return np.column_stack(self._complex_to_yx(points_as_complex))
+
+    @staticmethod
+    def _num_intervals_within_tolerance(segment, tolerance: float) -> int:
+        """The number of equal parameter intervals into which to split a segment, so that each chord is within the
+        tolerance (in user units) of the segment."""
+        if isinstance(segment, svg.Line):
+            return 1
+        elif isinstance(segment, svg.Arc):
+            # As for a circular arc (see curves.CircularArc), using the larger radius since the parameter is
+            # proportional to the angle swept
+            radius = max(segment.radius.real, segment.radius.imag)
+            if radius == 0:
+                return 1
+            max_degrees = 2 * np.rad2deg(np.arccos(max(1 - tolerance / radius, -1)))
+            return max(int(np.ceil(abs(segment.delta) / max_degrees)), 1)
+        else:
+            # Splitting a Bezier curve of degree d into n equal parameter intervals gives chords within d(d-1)M/(8n^2)
+            # of the curve, where M is the largest second difference of its control points
+            control_points = np.array(segment.bpoints())
+            degree = len(control_points) - 1
+            max_second_difference = np.max(np.abs(np.diff(control_points, n=2)))
+            return max(int(np.ceil(np.sqrt(degree * (degree - 1) * max_second_difference / (8 * tolerance)))), 1)
+
 
 class SVGPathRotatedBy90Degrees(SVGPath):
     """A curve which wraps an svgpathtools.Path object, which has been rotated by 90 degrees."""
@@ -153,6 +314,87 @@ class SVGPathRotatedBy90Degrees(SVGPath):
         super().__init__(path, mm_per_unit)
         self._original_height = document_original_height
 
+    @property
+    def _geometry_key(self):
+        return super()._geometry_key + (self._original_height,)
+
     def _complex_to_yx(self, points_as_complex):
         unrotated = SVGPath._complex_to_yx(points_as_complex)
         return unrotated[1], self._original_height - unrotated[0]
+
+
+class ArcLengthTable:
+    """
+    A table of the arc length along an svgpathtools.Path at closely spaced parameter values on each segment.
+
+    svgpathtools can find the parameter at a given arc length (Path.ilength), but only by an iterative search for each
+    arc length in turn. Looking the arc lengths up in a table instead takes a few vectorised calls, however many there
+    are.
+    """
+
+    def __init__(self, path: svg.Path, tolerance: float):
+        """
+        Build the table.
+
+        Args:
+            path (svg.Path): The path.
+            tolerance (float): The accuracy (in user units) with which to find the point at a given arc length. The
+                               table is sampled roughly this far apart along the path.
+        """
+        segment_lengths = np.array([segment.length() for segment in path])
+        segment_start_lengths = np.concatenate(([0], np.cumsum(segment_lengths)[:-1]))
+
+        lengths = []
+        t_values = []
+        segment_indices = []
+        for segment_index, segment in enumerate(path):
+            num_intervals = max(int(np.ceil(segment_lengths[segment_index] / tolerance)), 1)
+            t = np.linspace(0, 1, num_intervals + 1)
+
+            # Scale the lengths of the chords between samples, so that the segment has the length svgpathtools gives
+            chord_lengths = np.abs(np.diff(segment.point(t)))
+            cumulative_lengths = np.concatenate(([0], np.cumsum(chord_lengths)))
+            if cumulative_lengths[-1] > 0:
+                cumulative_lengths *= segment_lengths[segment_index] / cumulative_lengths[-1]
+
+            lengths.append(segment_start_lengths[segment_index] + cumulative_lengths)
+            t_values.append(t)
+            segment_indices.append(np.full(len(t), segment_index))
+
+        self._lengths = np.concatenate(lengths)
+        self._t_values = np.concatenate(t_values)
+        self._segment_indices = np.concatenate(segment_indices)
+
+        # The first and last entries in the table for each segment
+        self._segment_first_entries = np.concatenate(([0], np.cumsum([len(t) for t in t_values])[:-1]))
+        self._segment_last_entries = self._segment_first_entries + [len(t) - 1 for t in t_values]
+        self._segment_end_lengths = segment_start_lengths + segment_lengths
+
+    def parameters_at(self, arc_lengths: np.ndarray):
+        """
+        Find the segments and parameter values at given arc lengths along the path.
+
+        Args:
+            arc_lengths (np.ndarray): The arc lengths (in user units). These are clipped to the length of the path.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The index of the segment on which each arc length lies, and the value of
+                                           that segment's parameter there.
+        """
+        arc_lengths = np.clip(arc_lengths, 0, self._lengths[-1])
+
+        # Find the segment first, so that an arc length is never interpolated between the end of one segment and the
+        # start of the next
+        segment_indices = np.minimum(np.searchsorted(self._segment_end_lengths, arc_lengths),
+                                     len(self._segment_end_lengths) - 1)
+        entries = np.searchsorted(self._lengths, arc_lengths, side='right') - 1
+        entries = np.clip(entries, self._segment_first_entries[segment_indices],
+                          self._segment_last_entries[segment_indices] - 1)
+
+        # Then interpolate between the entries either side
+        interval_lengths = self._lengths[entries + 1] - self._lengths[entries]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fractions = np.where(interval_lengths > 0, (arc_lengths - self._lengths[entries]) / interval_lengths, 0)
+        t_values = self._t_values[entries] + fractions * (self._t_values[entries + 1] - self._t_values[entries])
+
+        return segment_indices, t_values
@@ -52,7 +52,10 @@ try:
         print("Point Not Found")
 
 finally:
-    GPIO.cleanup()
+    try:
+        hardware.plotter.wait()  # Any moves still queued must finish before the GPIO pins are released
+    finally:
+        GPIO.cleanup()
 
 
 
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 
 import argparse
-import time
 import glob
 import os
 import shutil
@@ -9,6 +8,7 @@ import shutil
 import context
 import roboplot.config as config
 import roboplot.core.hardware as hardware
+import roboplot.core.timing as timing
 from roboplot.dottodot.dot_to_dot_plotter import DotToDotPlotter
 from roboplot.core.camera.dummy_camera_from_image_paths import DummyCameraFromImagePaths
 from roboplot.core.gpio.gpio_wrapper import GPIO
@@ -41,13 +41,14 @@ try:
     plotter = DotToDotPlotter(hardware.plotter)
 
     # Do the dot-to-dot
-    start_time = time.time()
+    start_time = timing.now()
     plotter.do_dot_to_dot()
-    end_time = time.time()
+    hardware.plotter.wait()
+    end_time = timing.now()
     print('Elapsed: {:.0f} seconds'.format(end_time - start_time))
 
     # Present the paper
-    hardware.plotter.present_paper()
+    hardware.plotter.present_paper().result()
 
     # Copy the debug output so that it doesn't get deleted by accident!
     debug_images_copy_target = find_free_debug_images_subfolder()
@@ -56,4 +57,7 @@ try:
         shutil.copy2(f, debug_images_copy_target)
 
 finally:
-    GPIO.cleanup()
+    try:
+        hardware.plotter.wait()  # Any moves still queued must finish before the GPIO pins are released
+    finally:
+        GPIO.cleanup()
@@ -8,6 +8,7 @@ import numpy as np
 import context
 import roboplot.core.curves as curves
 import roboplot.core.hardware as hardware
+import roboplot.core.timing as timing
 from roboplot.core.gpio.gpio_wrapper import GPIO
 
 try:
@@ -31,9 +32,11 @@ try:
     time.sleep(args.wait)
 
     hardware.plotter.home()
-    start_time = time.time()
+    hardware.plotter.wait()
+    start_time = timing.now()
     hardware.plotter.draw(curve_list=circle, pen_speed=args.pen_millimetres_per_second)
-    end_time = time.time()
+    hardware.plotter.wait()
+    end_time = timing.now()
 
     # Report statistics
     print('Elapsed: ', end='')
@@ -42,4 +45,7 @@ try:
     print(2 * np.pi * args.radius / args.pen_millimetres_per_second)
 
 finally:
-    GPIO.cleanup()
+    try:
+        hardware.plotter.wait()  # Any moves still queued must finish before the GPIO pins are released
+    finally:
+        GPIO.cleanup()
@@ -8,6 +8,7 @@ import numpy as np
 import context
 import roboplot.core.curves as curves
 import roboplot.core.hardware as hardware
+import roboplot.core.timing as timing
 from roboplot.core.gpio.gpio_wrapper import GPIO
 
 try:
@@ -30,7 +31,7 @@ try:
 
     args = parser.parse_args()
     time.sleep(args.wait)
-    start_time = time.time()
+    start_time = timing.now()
 
     # Create circle path.
     arc = curves.CircularArc(centre=args.centre,
@@ -40,8 +41,9 @@ try:
 
     hardware.plotter.home()
     hardware.plotter.draw(curve_list=arc, pen_speed=args.pen_millimetres_per_second)
+    hardware.plotter.wait()
 
-    end_time = time.time()
+    end_time = timing.now()
 
     # Report statistics
     print('Elapsed: ', end='')
@@ -51,4 +53,7 @@ try:
     print(distance_travelled / args.pen_millimetres_per_second)
 
 finally:
-    GPIO.cleanup()
+    try:
+        hardware.plotter.wait()  # Any moves still queued must finish before the GPIO pins are released
+    finally:
+        GPIO.cleanup()
@@ -8,6 +8,7 @@ import numpy as np
 import context
 import roboplot.core.curves as curves
 import roboplot.core.hardware as hardware
+import roboplot.core.timing as timing
 from roboplot.core.gpio.gpio_wrapper import GPIO
 
 try:
@@ -31,9 +32,11 @@ try:
     time.sleep(args.wait)
 
     hardware.plotter.home()
-    start_time = time.time()
+    hardware.plotter.wait()
+    start_time = timing.now()
     hardware.plotter.draw(curve_list=line_segment, pen_speed=args.pen_millimetres_per_second)
-    end_time = time.time()
+    hardware.plotter.wait()
+    end_time = timing.now()
 
     # Report statistics
     print('Elapsed: ', end='')
@@ -44,4 +47,7 @@ try:
     print(distance_travelled / args.pen_millimetres_per_second)
 
 finally:
-    GPIO.cleanup()
+    try:
+        hardware.plotter.wait()  # Any moves still queued must finish before the GPIO pins are released
+    finally:
+        GPIO.cleanup()
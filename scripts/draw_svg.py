@@ -6,7 +6,13 @@ import time
 import numpy as np
 
 import context
+import roboplot.core.curve_cache as curve_cache
 import roboplot.core.hardware as hardware
+import roboplot.core.path_ordering as path_ordering
+import roboplot.core.plot_job as plot_job
+import roboplot.core.polyline_simplification as polyline_simplification
+import roboplot.core.step_telemetry as step_telemetry
+import roboplot.core.timing as timing
 import roboplot.svg.svg_parsing as svg
 from roboplot.core.gpio.gpio_wrapper import GPIO
 
@@ -16,40 +22,92 @@ try:
     parser.add_argument('-r', '--resolution', type=float, default=1,
                         help='the resolution in millimetres to use when splitting the image into linear moves ('
                              'default: %(default)smm)')
+    parser.add_argument('-c', '--chord-tolerance', metavar='MILLIMETRES', type=float, default=None,
+                        help='instead of using a fixed resolution, split the image into as few linear moves as will '
+                             'stay within this distance of it')
+    parser.add_argument('-p', '--simplify', metavar='MILLIMETRES', type=float, default=None,
+                        help='remove the vertices of runs of straight lines in the image which lie within this '
+                             'distance of the lines through the remaining vertices')
     parser.add_argument('-s', '--speed', metavar='SPEED', dest='pen_millimetres_per_second', type=float,
                         default=hardware.plotter.default_pen_speed,
                         help='the target speed for the pen in millimetres per second (default: %(default)smm/s)')
     parser.add_argument('-w', '--wait', type=float, default=0,
                         help='an initial sleep time in seconds (default: %(default)s)')
+    parser.add_argument('-k', '--keep-order', action='store_true',
+                        help='draw the paths in the order they appear in the file, rather than reordering them to '
+                             'reduce the travel between them, and start drawing before the whole file has been read')
     parser.add_argument('filepath', type=str,
                         help='a (relative or absolute) path to the svg file')
+    parser.add_argument('-j', '--job', metavar='FILE', dest='job_filepath', type=str, default=None,
+                        help='record the planned moves to this job file, so that replay_job.py can draw the image '
+                             'again without parsing or planning it')
+    parser.add_argument('-t', '--telemetry', metavar='FILE', dest='telemetry_filepath', type=str, default=None,
+                        help='record the timing of every step and save it to this .npy file, for use with '
+                             'step_timing_report.py')
 
     args = parser.parse_args()
 
-    # Draw the svg
-    svg_curves = svg.parse(args.filepath)
+    # Convert each path into native curves, since these are much faster to evaluate. The conversion is done lazily, so
+    # that if the paths are drawn in the order in which they appear in the file then drawing starts while the rest of
+    # the file is still being read.
+    svg_paths = svg.iterparse(args.filepath) if args.keep_order else svg.parse(args.filepath)
+    svg_curve_lists = (path.to_native_curves() for path in svg_paths)
+    if args.simplify is not None:
+        svg_curve_lists = (polyline_simplification.simplify_line_segments(curve_list, args.simplify)
+                           for curve_list in svg_curve_lists)
 
     time.sleep(args.wait)
 
     hardware.plotter.home()
+    hardware.plotter.wait()
 
-    start_time = time.time()
+    if not args.keep_order:
+        svg_curve_lists, travel_report = path_ordering.order_paths(list(svg_curve_lists),
+                                                                   hardware.plotter.pen_location)
+        print(travel_report)
+
+    # Draw paths which meet without lifting the pen in between
+    svg_curve_lists = path_ordering.iterate_chained_paths(svg_curve_lists)
+
+    if args.telemetry_filepath is not None:
+        step_recorder = step_telemetry.enable()
+    if args.job_filepath is not None:
+        plot_job.start_recording()
+
+    start_time = timing.now()
 
     distance_travelled = 0
-    for curve in svg_curves:
-        hardware.plotter.draw(curve, pen_speed=args.pen_millimetres_per_second, resolution=args.resolution)
-        distance_travelled += curve.total_millimetres
+    num_curves = 0
+    num_pen_down_paths = 0
+    for curve_list in svg_curve_lists:
+        hardware.plotter.draw(curve_list, pen_speed=args.pen_millimetres_per_second, resolution=args.resolution,
+                              chord_tolerance=args.chord_tolerance)
+        distance_travelled += sum(curve.total_millimetres for curve in curve_list)
+        num_curves += len(curve_list)
+        num_pen_down_paths += 1
+
+    hardware.plotter.wait()
+    end_time = timing.now()
 
-    end_time = time.time()
+    if args.telemetry_filepath is not None:
+        step_recorder.save(args.telemetry_filepath)
+    if args.job_filepath is not None:
+        plot_job.stop_recording().save(args.job_filepath)
 
     # Report statistics
+    print('Drew {} curves in {} pen-down paths'.format(num_curves, num_pen_down_paths))
     print('Elapsed: ', end='')
     print(end_time - start_time)
     print('Predicted: ', end='')  # Admittedly, this relies on calculations performed by the objects we're testing...
     print(distance_travelled / args.pen_millimetres_per_second)
+    print('Curve cache: ', end='')
+    print(curve_cache.cache.statistics)
 
     # Present the paper
     hardware.plotter.present_paper()
 
 finally:
-    GPIO.cleanup()
+    try:
+        hardware.plotter.wait()  # Any moves still queued must finish before the GPIO pins are released
+    finally:
+        GPIO.cleanup()
@@ -23,6 +23,9 @@ try:
     centre, photo = start_end_detection.find_green_centre(centre, args.minsize)
 
 finally:
-    GPIO.cleanup()
+    try:
+        hardware.plotter.wait()  # Any moves still queued must finish before the GPIO pins are released
+    finally:
+        GPIO.cleanup()
 
 print("Done")
@@ -26,15 +26,11 @@ try:
     reporter = Reporter(axes)
     reporter.start()
 
-    start_time = time.time()
-
-    axes.home()
-
-    end_time = time.time()
+    homing_report = axes.home()
     time.sleep(0.2)
 
     reporter.end_thread = True
-    print('\nElapsed: {:.2f} seconds'.format(end_time-start_time))
+    print('\n' + str(homing_report))
 
 finally:
     reporter.end_thread = True
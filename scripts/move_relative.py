@@ -7,6 +7,8 @@ import numpy as np
 
 import context
 import roboplot.core.hardware as hardware
+import roboplot.core.step_telemetry as step_telemetry
+import roboplot.core.timing as timing
 from roboplot.core.gpio.gpio_wrapper import GPIO
 
 try:
@@ -22,6 +24,9 @@ try:
                         help='the target speed for the pen in millimetres per second (default: %(default)smm/s)')
     parser.add_argument('-w', '--wait', type=float, default=0,
                         help='an initial sleep time in seconds (default: %(default)s)')
+    parser.add_argument('-t', '--telemetry', metavar='FILE', dest='telemetry_filepath', type=str, default=None,
+                        help='record the timing of every step and save it to this .npy file, for use with '
+                             'step_timing_report.py')
 
     args = parser.parse_args()
 
@@ -30,11 +35,17 @@ try:
 
     time.sleep(args.wait)
 
-    start_time = time.time()
+    if args.telemetry_filepath is not None:
+        step_recorder = step_telemetry.enable()
+
+    start_time = timing.now()
     hardware.both_axes.current_location = [0, 0]  # So that the move is relative
     hardware.both_axes.move_linearly(target_location=[args.y_millimetres, args.x_millimetres],
                                      target_completion_time=start_time + target_duration)
-    end_time = time.time()
+    end_time = timing.now()
+
+    if args.telemetry_filepath is not None:
+        step_recorder.save(args.telemetry_filepath)
 
     # Report statistics
     print("Elapsed: ", end='')
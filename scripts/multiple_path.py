@@ -39,6 +39,9 @@ try:
     end_time = time.time()
 
 finally:
-    GPIO.cleanup()
+    try:
+        hardware.plotter.wait()  # Any moves still queued must finish before the GPIO pins are released
+    finally:
+        GPIO.cleanup()
 
 print("Done")
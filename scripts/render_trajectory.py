@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import argparse
+
+import cv2
+import numpy as np
+
+import context
+import roboplot.config as config
+import roboplot.core.debug_movement as debug_movement
+import roboplot.core.trajectory_log as trajectory_log
+
+# Commandline arguments
+parser = argparse.ArgumentParser(description='Draw the movement recorded in a trajectory file, which is written '
+                                             'whenever the plotter runs with debugging enabled.')
+parser.add_argument('filepath', type=str, nargs='?', default=config.trajectory_file_path,
+                    help='a (relative or absolute) path to the trajectory file (default: %(default)s)')
+parser.add_argument('-o', '--output', metavar='IMAGE', type=str, default=None,
+                    help='save a still of the whole movement to this image file')
+parser.add_argument('-v', '--video', metavar='VIDEO', type=str, default=None,
+                    help='save a video of the movement to this .avi file')
+parser.add_argument('--fps', type=float, default=25,
+                    help='the number of frames per second of the video (default: %(default)s)')
+parser.add_argument('--speedup', type=float, default=1,
+                    help='how many times faster than the plotter moved to play the video (default: %(default)s)')
+parser.add_argument('-b', '--background', metavar='IMAGE', type=str, default=config.debug_image_file_path,
+                    help='the image over which to draw the movement (default: %(default)s)')
+parser.add_argument('--no-background', dest='background', action='store_const', const=None,
+                    help='draw the movement over a black background')
+parser.add_argument('--pixels-per-mm', type=float, default=3,
+                    help='the scale of the output (default: %(default)s)')
+
+args = parser.parse_args()
+if args.output is None and args.video is None:
+    parser.error('Nothing to do! Give an --output image and/or a --video.')
+
+samples = trajectory_log.load(args.filepath)
+renderer = debug_movement.TrajectoryRenderer(samples, args.pixels_per_mm)
+print('{} samples over {:.2f} seconds'.format(len(samples), samples['time'][-1] - samples['time'][0]
+                                              if len(samples) > 0 else 0))
+
+if args.video is not None:
+    image = debug_movement.create_background(args.background, args.pixels_per_mm)
+    height, width = image.shape[:2]
+    video = cv2.VideoWriter(args.video, cv2.VideoWriter_fourcc(*'MJPG'), args.fps, (width, height))
+
+    # The index after the last sample to show in each frame
+    if len(samples) > 0:
+        frame_times = np.arange(samples['time'][0], samples['time'][-1], args.speedup / args.fps)
+        frame_stops = np.append(np.searchsorted(samples['time'], frame_times, side='right'), len(samples))
+    else:
+        frame_stops = np.zeros(1, dtype=int)
+
+    start = 0
+    for stop in frame_stops.tolist():
+        renderer.draw(image, start, stop)
+        video.write(image)
+        start = stop
+    video.release()
+    print('Saved {} frames to {}'.format(len(frame_stops), args.video))
+
+if args.output is not None:
+    image = debug_movement.create_background(args.background, args.pixels_per_mm)
+    renderer.draw(image)
+    cv2.imwrite(args.output, image)
+    print('Saved {}'.format(args.output))
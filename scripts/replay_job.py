@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+
+import context
+import roboplot.core.hardware as hardware
+import roboplot.core.plot_job as plot_job
+import roboplot.core.timing as timing
+from roboplot.core.gpio.gpio_wrapper import GPIO
+
+try:
+    # Commandline arguments
+    parser = argparse.ArgumentParser(description='Draw a job recorded by the --job option of draw_svg.py, without '
+                                                 'parsing or planning it again.')
+    parser.add_argument('filepath', type=str,
+                        help='a (relative or absolute) path to the job file')
+    parser.add_argument('-w', '--wait', type=float, default=0,
+                        help='an initial sleep time in seconds (default: %(default)s)')
+
+    args = parser.parse_args()
+
+    job = plot_job.PlotJob.load(args.filepath)
+    time.sleep(args.wait)
+
+    hardware.plotter.home()
+    hardware.plotter.wait()
+
+    # Draw the job
+    start_time = timing.now()
+    hardware.plotter.replay_job(job)
+    hardware.plotter.wait()
+    end_time = timing.now()
+
+    # Report statistics
+    print('Elapsed: ', end='')
+    print(end_time - start_time)
+    print('Expected: ', end='')
+    print(job.expected_seconds)
+
+    # Present the paper
+    hardware.plotter.present_paper()
+
+finally:
+    try:
+        hardware.plotter.wait()  # Any moves still queued must finish before the GPIO pins are released
+    finally:
+        GPIO.cleanup()
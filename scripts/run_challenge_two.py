@@ -34,7 +34,10 @@ try:
     hardware.plotter.present_paper()
 
 finally:
-    GPIO.cleanup()
+    try:
+        hardware.plotter.wait()  # Any moves still queued must finish before the GPIO pins are released
+    finally:
+        GPIO.cleanup()
 
 print("Done")
 
@@ -22,6 +22,8 @@ try:
     else:
         raise ValueError('Bad input!')  # Shouldn't get here since argument parser will catch invalid arguments
 
+    hardware.pen.wait()
+
 finally:
     # GPIO.cleanup()
     pass
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+
+import argparse
+
+import numpy as np
+
+import context
+import roboplot.core.step_telemetry as step_telemetry
+
+# Commandline arguments
+parser = argparse.ArgumentParser(description='Report how far the step times recorded by the step telemetry drifted '
+                                             'from those planned, for each curve followed.')
+parser.add_argument('filepath', type=str,
+                    help='a .npy file of step timings, as saved using the --telemetry option of the drawing scripts')
+parser.add_argument('--stall', metavar='MILLISECONDS', dest='stall_milliseconds', type=float,
+                    default=1000 * step_telemetry.default_stall_seconds,
+                    help='how much later a step must be than the one before it to be reported as a stall candidate '
+                         '(default: %(default)sms)')
+
+args = parser.parse_args()
+
+# Report statistics
+records = np.load(args.filepath)
+if len(records) == 0:
+    print('No ticks recorded')
+else:
+    statistics = step_telemetry.compute_curve_statistics(records, stall_seconds=args.stall_milliseconds / 1000)
+    print(step_telemetry.format_curve_statistics(statistics))
+
+    lateness = records['actual_time'] - records['planned_time']
+    print('\nOverall: {} ticks, lateness p50 {:.2f}ms, p99 {:.2f}ms, max {:.2f}ms, {} stall candidates'.format(
+        len(records), *(1000 * np.percentile(lateness, (50, 99, 100))),
+        sum(s.num_stall_candidates for s in statistics)))
@@ -35,4 +35,7 @@ try:
         cv2.imwrite(args.file_path, image)
 
 finally:
-    GPIO.cleanup()
+    try:
+        hardware.plotter.wait()  # Any moves still queued must finish before the GPIO pins are released
+    finally:
+        GPIO.cleanup()
@@ -0,0 +1,30 @@
+"""
+Creates axes for tests which move the axes without any hardware.
+
+Test modules should ``import context`` before importing this module.
+"""
+
+from unittest.mock import MagicMock
+
+import context
+import roboplot.core.stepper_control as stepper_control
+from roboplot.core.limit_switches import LimitSwitch
+from roboplot.core.stepper_motors import StepperMotor
+
+
+def create_axis(motor: StepperMotor = None) -> stepper_control.Axis:
+    """
+    Create an axis whose limit switches are never pressed.
+
+    Args:
+        motor (StepperMotor): The motor which drives the axis, or None for a mock motor which only takes full steps and
+                              needs no time between them.
+
+    Returns:
+        stepper_control.Axis: The axis, with a lead of 8mm and 1000mm between its limit switches.
+    """
+    if motor is None:
+        motor = MagicMock(spec_set=StepperMotor, steps_per_revolution=200, clockwise=True, microsteps=1,
+                          max_microsteps=1, phases_per_step=1, minimum_seconds_between_steps=0)
+    limit_switches = [MagicMock(spec_set=LimitSwitch, is_pressed=False) for _ in range(2)]
+    return stepper_control.Axis(motor, lead=8, limit_switch_pair=limit_switches, limit_switch_separation=1000)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+import unittest
+
+import numpy as np
+
+import context
+import roboplot.core.curve_cache as curve_cache
+import roboplot.core.curves as curves
+
+
+class CurveCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = curve_cache.CurveCache(max_bytes=3 * 80)  # Room for three arrays of 10 floats
+
+    def test_computes_each_array_once(self):
+        computations = []
+
+        def compute():
+            computations.append(1)
+            return np.zeros(10)
+
+        first = self.cache.get_or_compute('a', compute)
+        second = self.cache.get_or_compute('a', compute)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(computations), 1)
+        statistics = self.cache.statistics
+        self.assertEqual((statistics.hits, statistics.misses), (1, 1))
+        self.assertEqual(statistics.num_bytes, 80)
+
+    def test_arrays_are_read_only(self):
+        array = self.cache.get_or_compute('a', lambda: np.zeros(10))
+        with self.assertRaises(ValueError):
+            array[0] = 1
+
+    def test_evicts_least_recently_used_when_full(self):
+        for key in 'abc':
+            self.cache.get_or_compute(key, lambda: np.zeros(10))
+        self.cache.get_or_compute('a', lambda: np.zeros(10))  # Now 'b' is the least recently used
+        self.cache.get_or_compute('d', lambda: np.zeros(10))
+
+        self.cache.get_or_compute('a', lambda: np.zeros(10))
+        self.assertEqual(self.cache.statistics.misses, 4)
+        self.cache.get_or_compute('b', lambda: np.zeros(10))
+        self.assertEqual(self.cache.statistics.misses, 5)
+        self.assertEqual(self.cache.statistics.evictions, 2)
+
+    def test_does_not_hold_arrays_larger_than_the_cache(self):
+        self.cache.get_or_compute('a', lambda: np.zeros(100))
+        self.assertEqual(self.cache.statistics.num_entries, 0)
+
+    def test_shrinking_the_cache_evicts_entries(self):
+        for key in 'abc':
+            self.cache.get_or_compute(key, lambda: np.zeros(10))
+        self.cache.max_bytes = 80
+        self.assertEqual(self.cache.statistics.num_entries, 1)
+
+
+class CurvePointCachingTest(unittest.TestCase):
+    def setUp(self):
+        curve_cache.cache.clear()
+
+    def test_curves_with_the_same_geometry_share_points(self):
+        first = curves.CircularArc(centre=[1, 2], radius=3, start_degrees=0, end_degrees=90).to_series_of_points(0.1)
+        second = curves.CircularArc(centre=[1, 2], radius=3, start_degrees=0, end_degrees=90).to_series_of_points(0.1)
+        self.assertIs(first, second)
+
+    def test_resolution_and_offset_are_part_of_the_key(self):
+        segment = curves.LineSegment([0, 0], [1, 1])
+        points = segment.to_series_of_points(0.1)
+        self.assertIsNot(segment.to_series_of_points(0.2), points)
+        self.assertIsNot(segment.to_series_of_points(0.1, include_last_point=False), points)
+        np.testing.assert_allclose(segment.offset(np.array([1, 2])).to_series_of_points(0.1), points + [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+import unittest
+
+import numpy as np
+
+import context
+import roboplot.core.curves as curves
+
+
+def max_distance_from_polyline(points, polyline):
+    """The greatest distance from any of the points to the nearest part of the polyline."""
+    distances = np.full(len(points), np.inf)
+    for start, end in zip(polyline[:-1], polyline[1:]):
+        chord = end - start
+        t = np.clip((points - start) @ chord / max(chord @ chord, 1e-12), 0, 1)
+        distances = np.minimum(distances, np.linalg.norm(points - (start + np.outer(t, chord)), axis=1))
+    return np.max(distances)
+
+
+class Parabola(curves.Curve):
+    """A curve which only provides the methods which every curve must, parameterised by x rather than arc length."""
+
+    @property
+    def total_millimetres(self):
+        return 4
+
+    def evaluate_at(self, arc_lengths):
+        x = np.reshape(arc_lengths, -1) - 2
+        return np.column_stack((x ** 2, x))
+
+
+class BoundingBoxTest(unittest.TestCase):
+    def assert_box_fits_curve(self, curve):
+        points = curve.to_series_of_points(interval_millimetres=0.001)
+        np.testing.assert_allclose(curve.bounding_box, [np.min(points, axis=0), np.max(points, axis=0)], atol=1e-6)
+
+    def test_line_segment(self):
+        self.assert_box_fits_curve(curves.LineSegment([3, -1], [1, 2]))
+
+    def test_circular_arc_within_a_quadrant(self):
+        self.assert_box_fits_curve(curves.CircularArc(centre=[1, 2], radius=2, start_degrees=10, end_degrees=80))
+
+    def test_circular_arc_crossing_axes(self):
+        self.assert_box_fits_curve(curves.CircularArc(centre=[1, 2], radius=2, start_degrees=-100, end_degrees=135))
+
+    def test_circle(self):
+        np.testing.assert_allclose(curves.Circle(centre=[1, 2], radius=3).bounding_box, [[-2, -1], [4, 5]])
+
+    def test_circle_with_no_radius(self):
+        np.testing.assert_allclose(curves.Circle(centre=[1, 2], radius=0).bounding_box, [[1, 2], [1, 2]])
+
+    def test_cubic_bezier(self):
+        self.assert_box_fits_curve(curves.CubicBezier([0, 0], [1, 2], [3, -1], [0, 4]))
+
+    def test_quadratic_bezier(self):
+        self.assert_box_fits_curve(curves.QuadraticBezier([0, 0], [5, 2], [1, 4]))
+
+    def test_elliptical_arc(self):
+        self.assert_box_fits_curve(curves.EllipticalArc(centre=[1, 2], x_radius=3, y_radius=1, rotation_degrees=30,
+                                                        start_degrees=200, end_degrees=-60))
+
+    def test_offset_curve(self):
+        self.assert_box_fits_curve(curves.CircularArc(centre=[1, 2], radius=2, start_degrees=30, end_degrees=200)
+                                   .offset(np.array([5, -3])))
+
+
+class SeriesOfPointsWithinToleranceTest(unittest.TestCase):
+    tolerance = 0.05
+
+    def assert_within_tolerance(self, curve, points):
+        np.testing.assert_allclose(points[[0, -1]], curve.evaluate_at([0, curve.total_millimetres]), atol=1e-9)
+        dense_points = curve.to_series_of_points(interval_millimetres=0.001)
+        self.assertLessEqual(max_distance_from_polyline(dense_points, points), self.tolerance + 1e-9)
+
+    def test_line_segment_is_a_single_chord(self):
+        points = curves.LineSegment([0, 0], [200, 100]).to_series_of_points_within_tolerance(self.tolerance)
+        np.testing.assert_array_equal(points, [[0, 0], [200, 100]])
+
+    def test_circular_arc(self):
+        arc = curves.CircularArc(centre=[1, 2], radius=10, start_degrees=20, end_degrees=200)
+        points = arc.to_series_of_points_within_tolerance(self.tolerance)
+        self.assert_within_tolerance(arc, points)
+        self.assertLess(len(points), len(arc.to_series_of_points(0.1)) / 10)
+
+    def test_tighter_arcs_need_fewer_points(self):
+        num_points = [len(curves.Circle(centre=[0, 0], radius=r).to_series_of_points_within_tolerance(self.tolerance))
+                      for r in (1, 10, 100)]
+        self.assertEqual(sorted(num_points), num_points)
+        self.assertLess(num_points[0], num_points[2])
+
+    def test_general_curve(self):
+        parabola = Parabola()
+        points = parabola.to_series_of_points_within_tolerance(self.tolerance)
+        self.assert_within_tolerance(parabola, points)
+
+        # Points are spent where the curve bends
+        chord_lengths = np.linalg.norm(np.diff(points, axis=0), axis=1)
+        self.assertLess(np.min(chord_lengths), np.max(chord_lengths) / 4)
+
+    def test_bezier_curve(self):
+        bezier = curves.CubicBezier([0, 0], [1, 2], [3, -1], [0, 4])
+        self.assert_within_tolerance(bezier, bezier.to_series_of_points_within_tolerance(self.tolerance))
+
+    def test_elliptical_arc(self):
+        arc = curves.EllipticalArc(centre=[1, 2], x_radius=3, y_radius=1, rotation_degrees=30, start_degrees=200,
+                                   end_degrees=-60)
+        self.assert_within_tolerance(arc, arc.to_series_of_points_within_tolerance(self.tolerance))
+
+    def test_without_last_point(self):
+        arc = curves.CircularArc(centre=[1, 2], radius=10, start_degrees=20, end_degrees=200)
+        points = arc.to_series_of_points_within_tolerance(self.tolerance)
+        np.testing.assert_array_equal(arc.to_series_of_points_within_tolerance(self.tolerance, False), points[:-1])
+
+
+class BezierCurveTest(unittest.TestCase):
+    def setUp(self):
+        self.control_points = np.array([[0, 0], [1, 2], [3, -1], [0, 4]])
+        self.bezier = curves.CubicBezier(*self.control_points)
+
+    def test_agrees_with_de_casteljau(self):
+        for t in (0, 0.3, 0.5, 1):
+            points = self.control_points.astype(float)
+            while len(points) > 1:
+                points = (1 - t) * points[:-1] + t * points[1:]
+            np.testing.assert_allclose(self.bezier._points_at(np.array([t])), points)
+
+    def test_is_parameterised_by_arc_length(self):
+        points = self.bezier.to_series_of_points(interval_millimetres=0.1, include_last_point=False)
+        np.testing.assert_allclose(np.linalg.norm(np.diff(points, axis=0), axis=1), 0.1, rtol=0.05)
+        np.testing.assert_allclose(self.bezier.evaluate_at(self.bezier.total_millimetres), [[0, 4]])
+
+    def test_straight_quadratic_has_length_of_line(self):
+        self.assertAlmostEqual(curves.QuadraticBezier([0, 0], [1, 1], [3, 3]).total_millimetres, np.sqrt(18), places=6)
+
+
+class PolylineTest(unittest.TestCase):
+    def setUp(self):
+        self.vertices = np.array([[0, 0], [0, 3], [0, 3], [4, 3]])
+        self.polyline = curves.Polyline(self.vertices)
+
+    def test_agrees_with_line_segments(self):
+        segments = [curves.LineSegment([0, 0], [0, 3]), curves.LineSegment([4, 3], [0, 3]).reversed()]
+        self.assertEqual(self.polyline.total_millimetres, 7)
+        for arc_length in (0, 1.5, 3, 5, 7):
+            if arc_length <= 3:
+                expected = segments[0].evaluate_at(arc_length)
+            else:
+                expected = segments[1].evaluate_at(arc_length - 3)
+            np.testing.assert_allclose(self.polyline.evaluate_at(arc_length), expected)
+
+    def test_keeps_its_vertices(self):
+        points = self.polyline.to_series_of_points(interval_millimetres=2)
+        np.testing.assert_allclose(points, [[0, 0], [0, 2], [0, 3], [1, 3], [3, 3], [4, 3]])
+        np.testing.assert_array_equal(self.polyline.to_series_of_points_within_tolerance(0.1), self.vertices)
+        np.testing.assert_array_equal(self.polyline.bounding_box, [[0, 0], [4, 3]])
+
+    def test_reversed(self):
+        np.testing.assert_allclose(self.polyline.reversed().evaluate_at([0, 2]), [[4, 3], [2, 3]])
+
+    def test_single_vertex(self):
+        polyline = curves.Polyline([[1, 2]])
+        self.assertEqual(polyline.total_millimetres, 0)
+        np.testing.assert_array_equal(polyline.evaluate_at([0, 1]), [[1, 2], [1, 2]])
+
+
+class EllipticalArcTest(unittest.TestCase):
+    def test_with_equal_radii_is_a_circular_arc(self):
+        elliptical_arc = curves.EllipticalArc(centre=[1, 2], x_radius=3, y_radius=3, rotation_degrees=40,
+                                              start_degrees=-10, end_degrees=80)
+        circular_arc = curves.CircularArc(centre=[1, 2], radius=3, start_degrees=30, end_degrees=120)
+
+        self.assertAlmostEqual(elliptical_arc.total_millimetres, circular_arc.total_millimetres, places=6)
+        arc_lengths = np.linspace(0, circular_arc.total_millimetres, 20)
+        np.testing.assert_allclose(elliptical_arc.evaluate_at(arc_lengths), circular_arc.evaluate_at(arc_lengths),
+                                   atol=1e-4)
+
+    def test_can_run_backwards(self):
+        arc = curves.EllipticalArc(centre=[0, 0], x_radius=2, y_radius=1, rotation_degrees=0, start_degrees=90,
+                                   end_degrees=0)
+        np.testing.assert_allclose(arc.evaluate_at([0, arc.total_millimetres]), [[1, 0], [0, 2]], atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
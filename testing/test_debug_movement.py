@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+import context
+import mock_axes
+import roboplot.config as config
+import roboplot.core.debug_movement as debug_movement
+import roboplot.core.stepper_control as stepper_control
+import roboplot.core.trajectory_log as trajectory_log
+from roboplot.core.liftable_pen import LiftablePen
+from roboplot.core.plotter import PlotterWithDebugImage
+from roboplot.core.servo_motor import ServoMotor
+
+
+class DebugImageTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.patched_folder = patch.object(config, 'debug_output_folder', os.path.join(self.directory.name, 'debug'))
+        self.patched_folder.start()
+        self.debug_image = debug_movement.DebugImage(pixels_per_mm=1)
+
+    def tearDown(self):
+        self.debug_image._image_saver._image_queue.join()
+        self.patched_folder.stop()
+        self.directory.cleanup()
+
+    def _pixels_of_colour(self, colour):
+        return np.argwhere(np.all(self.debug_image.debug_image == colour, axis=2))
+
+    def test_joins_the_points_once_drawn(self):
+        self.debug_image.add_point((10, 10))
+        self.debug_image.add_point((10, 20))
+        self.assertEqual(len(self._pixels_of_colour(self.debug_image.colour)), 0)
+
+        self.debug_image.save_image()
+        np.testing.assert_array_equal(self._pixels_of_colour(self.debug_image.colour),
+                                      [(10, x) for x in range(10, 21)])
+
+    def test_image_includes_the_points_not_yet_drawn(self):
+        self.debug_image.add_point((10, 10))
+        self.debug_image.add_point((10, 20))
+
+        image = self.debug_image.image
+        np.testing.assert_array_equal(np.argwhere(np.all(image == self.debug_image.colour, axis=2)),
+                                      [(10, x) for x in range(10, 21)])
+
+    def test_draws_batches_which_carry_on_from_each_other(self):
+        for x in range(2 * self.debug_image.points_per_batch):
+            self.debug_image.add_point((5, x / 10))
+        self.debug_image.save_image()
+
+        last_x = int(round((2 * self.debug_image.points_per_batch - 1) / 10))
+        np.testing.assert_array_equal(self._pixels_of_colour(self.debug_image.colour),
+                                      [(5, x) for x in range(last_x + 1)])
+
+    def test_changes_colour_part_way_along_a_line(self):
+        self.debug_image.add_point((10, 5))
+        self.debug_image.add_point((10, 10))
+        self.debug_image.override_colour = debug_movement.Colour.Yellow
+        self.debug_image.add_point((10, 15))
+        self.debug_image.override_colour = None
+        self.debug_image.save_image()
+
+        # The line in the new colour starts from the last point in the old colour
+        np.testing.assert_array_equal(self._pixels_of_colour(debug_movement.Colour.Pink),
+                                      [(10, x) for x in range(5, 10)])
+        np.testing.assert_array_equal(self._pixels_of_colour(debug_movement.Colour.Yellow),
+                                      [(10, x) for x in range(10, 16)])
+
+    def test_does_not_join_points_across_the_end_of_a_line(self):
+        self.debug_image.add_point((10, 10))
+        self.debug_image.end_line()
+        self.debug_image.add_point((10, 15))
+        self.debug_image.save_image()
+
+        np.testing.assert_array_equal(self._pixels_of_colour(self.debug_image.colour), [(10, 10), (10, 15)])
+
+    def test_saves_only_when_asked(self):
+        for x in range(10 * self.debug_image.points_per_batch):
+            self.debug_image.add_point((5, x / 100))
+        self.debug_image.save_image()
+        self.debug_image.save_image()
+        self.debug_image._image_saver._image_queue.join()
+
+        self.assertEqual(sorted(os.listdir(config.debug_output_folder)),
+                         ['DebugImage_0000.jpg', 'DebugImage_0001.jpg'])
+
+
+class TrajectoryRendererTest(unittest.TestCase):
+    def setUp(self):
+        self.samples = np.zeros(6, dtype=trajectory_log.trajectory_sample_dtype)
+        self.samples['location'] = [(10, x) for x in (0, 2, 4, 6, 8, 10)]
+        self.samples['pen_is_down'] = [False, False, True, True, False, True]
+        self.renderer = debug_movement.TrajectoryRenderer(self.samples, pixels_per_mm=1)
+
+    def test_colours_each_stretch_of_pen_down_movement_in_turn(self):
+        image = debug_movement.create_background(pixels_per_mm=1)
+        self.renderer.draw(image)
+
+        np.testing.assert_array_equal(image[10, :11], [debug_movement.Colour.Yellow] * 2 +
+                                                      [debug_movement.Colour.Pink] * 4 +
+                                                      [debug_movement.Colour.Yellow] * 2 +
+                                                      [debug_movement.Colour.Light_Blue] * 3)
+
+    def test_draws_the_same_in_parts(self):
+        whole_image = debug_movement.create_background(pixels_per_mm=1)
+        self.renderer.draw(whole_image)
+
+        for stops in ([1, 2, 3, 4, 5, 6], [3, 6], [0, 5, 5, 6]):
+            with self.subTest(stops=stops):
+                image = debug_movement.create_background(pixels_per_mm=1)
+                start = 0
+                for stop in stops:
+                    self.renderer.draw(image, start, stop)
+                    start = stop
+                np.testing.assert_array_equal(image, whole_image)
+
+    def test_draws_nothing_without_samples(self):
+        image = debug_movement.create_background(pixels_per_mm=1)
+        debug_movement.TrajectoryRenderer(self.samples[:0], pixels_per_mm=1).draw(image)
+        self.assertFalse(np.any(image))
+
+
+class PlotterWithDebugImageTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        debug_output_folder = os.path.join(self.directory.name, 'debug')
+        self.patched_config = [patch.object(config, 'debug_output_folder', debug_output_folder),
+                               patch.object(config, 'trajectory_file_path', os.path.join(debug_output_folder, 't.trj')),
+                               patch.object(config, 'debug_image_file_path', None)]
+        for patched in self.patched_config:
+            patched.start()
+
+        # Each move of the servo finishes only when we say so
+        self.servo_moves = []
+        servo = MagicMock(spec_set=ServoMotor)
+        servo.move_smoothly_to.side_effect = lambda *args: self.servo_moves.append(Future()) or self.servo_moves[-1]
+        pen = LiftablePen(servo, position_when_down=0.03, position_when_up=0.055)
+
+        axes = stepper_control.AxisPair(mock_axes.create_axis(), mock_axes.create_axis(), acceleration=np.inf)
+        self.plotter = PlotterWithDebugImage(axes, pen, camera=None, pen_to_camera_offset=(0, 0))
+        self.trajectory_log = self.plotter._axes.trajectory_log
+
+    def tearDown(self):
+        self.trajectory_log.close()
+        for patched in self.patched_config:
+            patched.stop()
+        self.directory.cleanup()
+
+    def test_keeps_the_trajectory_file_when_another_debug_image_is_created(self):
+        debug_movement.DebugImage(pixels_per_mm=1)
+        self.plotter._axes.move_to([0, 1], pen_speed=np.inf)
+        self.trajectory_log.flush()
+
+        self.assertEqual(len(trajectory_log.load(config.trajectory_file_path)), 25)
+
+    def test_marks_the_pen_down_once_it_has_dropped(self):
+        self.plotter._lift_pen().set_result(None)
+        self.plotter._drop_pen()
+        self.assertFalse(self.trajectory_log.pen_is_down)
+        self.assertIsNotNone(self.plotter.debug_image.override_colour)
+
+        self.servo_moves[-1].set_result(None)
+        self.assertTrue(self.trajectory_log.pen_is_down)
+        self.assertIsNone(self.plotter.debug_image.override_colour)
+
+    def test_does_not_mark_the_pen_down_if_it_is_lifted_before_it_has_dropped(self):
+        self.plotter._drop_pen()
+        self.plotter._lift_pen()
+
+        self.servo_moves[0].set_result(None)
+        self.assertFalse(self.trajectory_log.pen_is_down)
+
+    def test_wait_reports_a_failure_of_the_servo(self):
+        self.plotter._pen._servo.wait.side_effect = RuntimeError('Servo failed')
+        with self.assertRaisesRegex(RuntimeError, 'Servo failed'):
+            self.plotter.wait()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import unittest
+from concurrent.futures import Future
+from unittest.mock import ANY, MagicMock
+
+import context
+import roboplot.core.timing as timing
+from roboplot.core.liftable_pen import LiftablePen
+from roboplot.core.servo_motor import ServoMotor
+
+
+class LiftablePenTest(unittest.TestCase):
+    def setUp(self):
+        self.original_clock = timing.clock
+        timing.use_clock(timing.VirtualClock())
+
+        self.servo = MagicMock(spec_set=ServoMotor)
+        self.servo.input_is_in_range.return_value = True
+        self.pen = LiftablePen(self.servo, position_when_down=0.03, position_when_up=0.055)
+
+    def tearDown(self):
+        timing.use_clock(self.original_clock)
+
+    def test_first_move_always_moves_the_servo(self):
+        self.assertIsNone(self.pen.is_up)
+        self.pen.lift()
+        self.servo.move_smoothly_to.assert_called_once_with(0.055, 0.25, ANY)
+        self.assertTrue(self.pen.is_up)
+
+    def test_skips_moves_to_the_current_state(self):
+        self.pen.lift()
+        self.pen.lift()
+        self.pen.drop()
+        self.pen.drop()
+        self.pen.lift()
+
+        positions = [call[0][0] for call in self.servo.move_smoothly_to.call_args_list]
+        self.assertListEqual(positions, [0.055, 0.03, 0.055])
+
+    def test_returns_the_servo_move(self):
+        self.assertIs(self.pen.lift(), self.servo.move_smoothly_to.return_value)
+        self.assertIs(self.pen.lift(), self.servo.move_smoothly_to.return_value)
+
+    def test_moves_start_after_earlier_moves(self):
+        self.pen.lift()
+        self.pen.drop()
+        start_times = [call[0][2] for call in self.servo.move_smoothly_to.call_args_list]
+        self.assertListEqual(start_times, [0, 0.25])
+
+    def test_can_stop_waiting_early(self):
+        self.servo.move_smoothly_to.return_value = Future()
+        self.pen.lift(start_time=1)
+        self.pen.wait(seconds_early=0.1)
+        self.assertAlmostEqual(timing.now(), 1.15)
+
+        self.servo.move_smoothly_to.return_value.set_result(None)
+        self.pen.wait()
+
+    def test_stopping_early_raises_if_the_move_has_failed(self):
+        self.servo.move_smoothly_to.return_value = Future()
+        self.pen.lift(start_time=1)
+        self.servo.move_smoothly_to.return_value.set_exception(RuntimeError('Servo failed'))
+
+        with self.assertRaisesRegex(RuntimeError, 'Servo failed'):
+            self.pen.wait(seconds_early=0.1)
+
+    def test_moves_the_servo_again_after_a_move_fails(self):
+        for failure in (Future.cancel, lambda move: move.set_exception(RuntimeError('Servo failed'))):
+            with self.subTest(failure=failure):
+                self.servo.move_smoothly_to.return_value = Future()
+                self.pen.lift()
+                failure(self.servo.move_smoothly_to.return_value)
+                self.assertIsNone(self.pen.is_up)
+
+                self.servo.move_smoothly_to.reset_mock()
+                self.pen.lift()
+                self.servo.move_smoothly_to.assert_called_once_with(0.055, 0.25, ANY)
+
+    def test_waits_for_the_servo(self):
+        self.servo.wait.side_effect = RuntimeError('Servo failed')
+        with self.assertRaisesRegex(RuntimeError, 'Servo failed'):
+            self.pen.wait_for_servo()
+
+
+if __name__ == '__main__':
+    unittest.main()
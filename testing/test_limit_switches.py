@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+
+import unittest
+
+import context
+import roboplot.core.gpio.EmulatorGUI as EmulatorGUI
+import roboplot.core.limit_switches as limit_switches
+
+
+class LimitSwitchTest(unittest.TestCase):
+    gpio_pin = 16  # Not used by the hardware module
+
+    @classmethod
+    def setUpClass(cls):
+        cls.switch = limit_switches.LimitSwitch(gpio_pin=cls.gpio_pin)
+
+    def test_state_follows_the_pin_without_polling(self):
+        # The emulator pulls an input down by default, which reads as pressed
+        self.assertTrue(self.switch.is_pressed)
+
+        EmulatorGUI.toggleButton(self.gpio_pin)
+        self.assertFalse(self.switch.is_pressed)
+
+        EmulatorGUI.toggleButton(self.gpio_pin)
+        self.assertTrue(self.switch.is_pressed)
+
+    def test_cannot_detect_edges_on_the_same_pin_twice(self):
+        with self.assertRaises(RuntimeError):
+            EmulatorGUI.GPIO.add_event_detect(self.gpio_pin, EmulatorGUI.GPIO.BOTH)
+
+
+if __name__ == '__main__':
+    unittest.main()
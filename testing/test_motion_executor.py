@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import threading
+import unittest
+
+import context
+import roboplot.core.motion_executor as motion_executor
+
+
+class MotionExecutorTest(unittest.TestCase):
+    def setUp(self):
+        self.executor = motion_executor.MotionExecutor(max_queued_moves=2)
+
+    def test_moves_run_in_order(self):
+        moves_run = []
+        for i in range(10):
+            self.executor.submit(moves_run.append, i)
+        self.executor.wait()
+        self.assertListEqual(moves_run, list(range(10)))
+
+    def test_future_gives_result_of_move(self):
+        future = self.executor.submit(lambda a, b: a + b, 1, b=2)
+        self.assertEqual(future.result(timeout=1), 3)
+
+    def test_submit_returns_before_the_move_finishes(self):
+        finish_move = threading.Event()
+        future = self.executor.submit(finish_move.wait)
+        self.assertFalse(future.done())
+
+        finish_move.set()
+        self.executor.wait()
+        self.assertTrue(future.done())
+
+    def test_failed_move_cancels_later_moves_and_raises_on_wait(self):
+        def fail():
+            raise ValueError('Failed move')
+
+        failed_move = self.executor.submit(fail)
+        later_move = self.executor.submit(lambda: None)
+
+        with self.assertRaises(ValueError):
+            self.executor.wait()
+        self.assertIsInstance(failed_move.exception(), ValueError)
+        self.assertTrue(later_move.cancelled())
+
+        # Once the failure has been reported, moves run as normal again
+        self.assertEqual(self.executor.submit(lambda: 1).result(timeout=1), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+import unittest
+
+import numpy as np
+
+import context
+import roboplot.core.motion_planning as motion_planning
+
+
+class PlanMotionTest(unittest.TestCase):
+    def setUp(self):
+        self.acceleration = 100
+        self.max_speed = 20
+
+    def _plan(self, points, **kwargs):
+        kwargs.setdefault('max_speed', self.max_speed)
+        kwargs.setdefault('acceleration', self.acceleration)
+        return motion_planning.plan_motion(np.array(points, dtype=float), **kwargs)
+
+    def test_constant_speed_without_acceleration_limit(self):
+        plan = self._plan([[0, 0], [0, 10], [10, 10]], acceleration=np.inf)
+        self.assertAlmostEqual(plan.total_seconds, 1)
+        np.testing.assert_allclose(plan.times_at([0, 0, 1], [0, 0.5, 1]), [0, 0.25, 1])
+
+    def test_infinite_speed_takes_no_time(self):
+        plan = self._plan([[0, 0], [0, 10]], max_speed=np.inf, acceleration=np.inf)
+        self.assertEqual(plan.total_seconds, 0)
+
+    def test_long_move_accelerates_cruises_and_decelerates(self):
+        plan = self._plan([[0, 0], [0, 100]])
+        # 0.2s to accelerate over 2mm, 4.8s cruising over 96mm, then 0.2s to decelerate
+        self.assertAlmostEqual(plan.total_seconds, 5.2)
+        np.testing.assert_allclose(plan.times_at([0, 0, 0], [0.02, 0.5, 0.98]), [0.2, 2.6, 5.0])
+
+    def test_short_move_has_triangular_profile(self):
+        plan = self._plan([[0, 0], [0, 1]])
+        # Accelerate for 0.5mm and then decelerate for 0.5mm
+        self.assertAlmostEqual(plan.total_seconds, 2 * np.sqrt(2 * 0.5 / self.acceleration))
+
+    def test_does_not_stop_between_collinear_moves(self):
+        split_plan = self._plan(np.column_stack((np.zeros(101), np.linspace(0, 100, 101))))
+        single_plan = self._plan([[0, 0], [0, 100]])
+        self.assertAlmostEqual(split_plan.total_seconds, single_plan.total_seconds)
+
+    def test_slows_down_for_corners(self):
+        straight_plan = self._plan([[0, 0], [0, 50], [0, 100]])
+        right_angle_plan = self._plan([[0, 0], [0, 50], [50, 50]])
+        reversing_plan = self._plan([[0, 0], [0, 50], [0, 0]])
+        self.assertLess(straight_plan.total_seconds, right_angle_plan.total_seconds)
+        self.assertLess(right_angle_plan.total_seconds, reversing_plan.total_seconds)
+        self.assertAlmostEqual(reversing_plan.total_seconds, 2 * self._plan([[0, 0], [0, 50]]).total_seconds)
+
+    def test_respects_axis_speed_limits(self):
+        plan = self._plan([[0, 0], [10, 10]], acceleration=np.inf, max_axis_speeds=(5, np.inf))
+        self.assertAlmostEqual(plan.total_seconds, 2)
+
+    def test_repeated_points_are_ignored(self):
+        plan = self._plan([[0, 0], [0, 0], [0, 10], [0, 10]])
+        self.assertEqual(len(plan.points), 2)
+
+    def test_times_increase_along_path(self):
+        angles = np.linspace(0, 2 * np.pi, 200)
+        plan = self._plan(np.column_stack((10 * np.sin(angles), 10 * np.cos(angles))))
+        times = plan.times_at(np.repeat(np.arange(len(plan.lengths)), 10), np.tile(np.linspace(0, 0.9, 10),
+                                                                                   len(plan.lengths)))
+        self.assertTrue(np.all(np.diff(times) >= 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -40,6 +40,28 @@ class MotorTest(unittest.TestCase):
 
             axis_motor.step()
 
+    def test_stepping_together_matches_stepping_separately(self):
+        motors = (hardware.y_axis_motor, hardware.x_axis_motor)
+        for motor in motors:
+            motor.clockwise = False
+
+        stepper_motors.step_together(motors)
+        for _ in range(5):
+            pin_statuses_before = [[GPIO.input(pin) for pin in motor._gpio_pins] for motor in motors]
+            stepper_motors.step_together(motors)
+
+            for motor, statuses_before in zip(motors, pin_statuses_before):
+                statuses_after = [GPIO.input(pin) for pin in motor._gpio_pins]
+                # Stepping backwards moves one step back through the sequence
+                offset = motor._sequence.index(statuses_before)
+                self.assertSequenceEqual(motor._sequence[(offset - motor.phases_per_step) % len(motor._sequence)],
+                                         statuses_after)
+
+    def test_half_step_sequence_inserts_common_pins_between_full_steps(self):
+        sequence = stepper_motors.half_step_sequence([[1, 0, 1, 0], [0, 1, 1, 0], [0, 1, 0, 1], [1, 0, 0, 1]])
+        self.assertListEqual(sequence, [[1, 0, 1, 0], [0, 0, 1, 0], [0, 1, 1, 0], [0, 1, 0, 0],
+                                        [0, 1, 0, 1], [0, 0, 0, 1], [1, 0, 0, 1], [1, 0, 0, 0]])
+
 
 # Running this runs all the tests and outputs their results.
 def main():
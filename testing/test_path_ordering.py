@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+import unittest
+
+import numpy as np
+
+import context
+import roboplot.core.curves as curves
+import roboplot.core.path_ordering as path_ordering
+
+
+def _ends_of(path):
+    return path[0].evaluate_at(0).reshape(2), path[-1].evaluate_at(path[-1].total_millimetres).reshape(2)
+
+
+class OrderPathsTest(unittest.TestCase):
+    def test_draws_nearest_path_next(self):
+        far = curves.LineSegment([100, 0], [101, 0])
+        near = curves.LineSegment([1, 0], [2, 0])
+        ordered_paths, report = path_ordering.order_paths([far, near], start_location=[0, 0])
+
+        self.assertIs(ordered_paths[0][0], near)
+        self.assertIs(ordered_paths[1][0], far)
+        self.assertAlmostEqual(report.original_millimetres, 100 + 100)
+        self.assertAlmostEqual(report.ordered_millimetres, 1 + 98)
+
+    def test_reverses_paths_when_allowed(self):
+        backwards = curves.LineSegment([10, 0], [1, 0])
+
+        ordered_paths, report = path_ordering.order_paths([backwards], start_location=[0, 0])
+        np.testing.assert_allclose(_ends_of(ordered_paths[0]), [[1, 0], [10, 0]])
+        self.assertAlmostEqual(report.ordered_millimetres, 1)
+
+        ordered_paths, report = path_ordering.order_paths([backwards], start_location=[0, 0], allow_reversal=False)
+        self.assertIs(ordered_paths[0][0], backwards)
+
+    def test_starts_closed_path_at_nearest_join(self):
+        square = [curves.LineSegment([0, 0], [0, 10]), curves.LineSegment([0, 10], [10, 10]),
+                  curves.LineSegment([10, 10], [10, 0]), curves.LineSegment([10, 0], [0, 0])]
+        ordered_paths, _ = path_ordering.order_paths([square], start_location=[11, 11])
+
+        self.assertEqual(len(ordered_paths[0]), 4)
+        np.testing.assert_allclose(_ends_of(ordered_paths[0]), [[10, 10], [10, 10]])
+
+    def test_two_opt_untangles_crossed_travel(self):
+        # Nearest neighbour goes right along the bottom row, then has to come back along the top
+        paths = [curves.Circle(centre=centre, radius=0.1)
+                 for centre in [[0, 1], [0, 2], [0, 3], [0, 4], [1.2, 4], [1.2, 3], [1.2, 2], [1.2, 1], [1.2, 0]]]
+        ordered_paths, report = path_ordering.order_paths(paths, start_location=[0, 0], max_two_opt_passes=0)
+        _, improved_report = path_ordering.order_paths(paths, start_location=[0, 0])
+
+        self.assertLessEqual(improved_report.ordered_millimetres, report.ordered_millimetres)
+        self.assertEqual(len(ordered_paths), len(paths))
+
+    def test_does_not_reverse_closed_paths_unless_allowed(self):
+        # Two-opt reverses the run of the first three circles
+        paths = [curves.Circle(centre=centre, radius=0.1) for centre in [[11, 14], [12, 11], [8, 13], [9, 18]]]
+        ordered_paths, _ = path_ordering.order_paths(paths, start_location=[0, 0], allow_reversal=False,
+                                                     choose_start_points=False)
+
+        for path in ordered_paths:
+            self.assertTrue(any(path[0] is original for original in paths))
+
+    def test_every_path_is_drawn_once_and_travel_is_reported_correctly(self):
+        random = np.random.RandomState(0)
+        paths = [curves.LineSegment(random.uniform(0, 100, 2), random.uniform(0, 100, 2)) for _ in range(50)]
+        paths += [curves.Circle(centre=random.uniform(0, 100, 2), radius=2) for _ in range(10)]
+        ordered_paths, report = path_ordering.order_paths(paths, start_location=[0, 0])
+
+        self.assertEqual(len(ordered_paths), len(paths))
+        self.assertLess(report.ordered_millimetres, report.original_millimetres / 2)
+
+        travel = 0
+        location = np.zeros(2)
+        for path in ordered_paths:
+            start, end = _ends_of(path)
+            travel += np.linalg.norm(start - location)
+            location = end
+        self.assertAlmostEqual(travel, report.ordered_millimetres)
+        self.assertIn('saved', str(report))
+
+    def test_no_paths(self):
+        ordered_paths, report = path_ordering.order_paths([], start_location=[0, 0])
+        self.assertEqual(ordered_paths, [])
+        self.assertEqual(report.ordered_millimetres, 0)
+
+
+class ChainPathsTest(unittest.TestCase):
+    def test_joins_paths_which_meet(self):
+        first = curves.LineSegment([0, 0], [0, 10])
+        second = [curves.LineSegment([0, 10.001], [10, 10]), curves.LineSegment([10, 10], [10, 0])]
+        separate = curves.LineSegment([20, 0], [30, 0])
+        last = curves.LineSegment([30, 0], [40, 0])
+
+        chains = path_ordering.chain_paths([first, second, separate, last], tolerance=0.01)
+        self.assertEqual(len(chains), 2)
+        self.assertListEqual(chains[0], [first] + second)
+        self.assertListEqual(chains[1], [separate, last])
+
+    def test_reads_paths_lazily(self):
+        def paths():
+            yield curves.LineSegment([0, 0], [0, 10])
+            yield curves.LineSegment([5, 5], [5, 10])
+            raise AssertionError('Read too far')
+
+        chains = path_ordering.iterate_chained_paths(paths())
+        self.assertEqual(len(next(chains)), 1)
+
+    def test_does_not_join_paths_further_apart_than_the_tolerance(self):
+        chains = path_ordering.chain_paths([curves.LineSegment([0, 0], [0, 10]), curves.LineSegment([0, 10.1], [0, 20])],
+                                           tolerance=0.01)
+        self.assertEqual(len(chains), 2)
+
+
+class ReversedCurveTest(unittest.TestCase):
+    def test_reversed_curve_runs_backwards(self):
+        arc = curves.CircularArc(centre=[1, 2], radius=3, start_degrees=0, end_degrees=90)
+        arc_lengths = np.linspace(0, arc.total_millimetres, 7)
+        np.testing.assert_allclose(arc.reversed().evaluate_at(arc_lengths), arc.evaluate_at(arc_lengths[::-1]))
+        self.assertIs(arc.reversed().reversed(), arc)
+
+
+if __name__ == '__main__':
+    unittest.main()
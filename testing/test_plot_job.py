@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, call
+
+import numpy as np
+
+import context
+import mock_axes
+import roboplot.core.curves as curves
+import roboplot.core.plot_job as plot_job
+import roboplot.core.stepper_control as stepper_control
+from roboplot.core.liftable_pen import LiftablePen
+from roboplot.core.plotter import Plotter
+
+
+class PlotJobTest(unittest.TestCase):
+    def setUp(self):
+        self.axes = stepper_control.AxisPair(mock_axes.create_axis(), mock_axes.create_axis(), acceleration=np.inf)
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, 'test.job')
+
+    def tearDown(self):
+        plot_job.recorder = None
+        self.directory.cleanup()
+
+    def _record_job(self):
+        recorder = plot_job.start_recording()
+        recorder.record_pen(is_up=False)
+        self.axes.follow_curves([curves.LineSegment([0, 0], [1, 0]), curves.LineSegment([1, 0], [1, 2])],
+                                pen_speed=100)
+        recorder.record_pen(is_up=True)
+        self.axes.move_to([0, 2], pen_speed=100)
+        return plot_job.stop_recording()
+
+    def test_records_pen_moves_and_step_schedules(self):
+        job = self._record_job()
+        np.testing.assert_array_equal(job.events['kind'],
+                                      [plot_job.DROP_PEN, plot_job.RUN_STEPS, plot_job.LIFT_PEN, plot_job.RUN_STEPS])
+        np.testing.assert_array_equal(job.events['start_location'][[1, 3]], [[0, 0], [1, 2]])
+        self.assertEqual(len(job.ticks), np.sum(job.events['num_ticks']))
+        self.assertGreater(job.expected_seconds, 0)
+        self.assertIsNone(plot_job.recorder)
+
+    def test_loads_what_was_saved(self):
+        job = self._record_job()
+        job.save(self.file_path)
+
+        loaded_job = plot_job.PlotJob.load(self.file_path)
+        self.assertIsInstance(loaded_job.ticks, np.memmap)
+        np.testing.assert_array_equal(loaded_job.events, job.events)
+        np.testing.assert_array_equal(loaded_job.ticks, job.ticks)
+        self.assertEqual(loaded_job.expected_seconds, job.expected_seconds)
+
+    def test_rejects_other_files(self):
+        with open(self.file_path, 'wb') as file:
+            file.write(b'Not a job file at all')
+        with self.assertRaises(ValueError):
+            plot_job.PlotJob.load(self.file_path)
+
+    def _replay(self, job, replay_step_schedule):
+        for event in job.events:
+            if event['kind'] == plot_job.RUN_STEPS:
+                replay_step_schedule(job.schedule_of(event), event['start_location'], event['microsteps'])
+
+    def test_replay_takes_the_same_steps(self):
+        job = self._record_job()
+        job.save(self.file_path)
+        job = plot_job.PlotJob.load(self.file_path)
+        recorded_steps = [axis._motor.step.call_count for axis in (self.axes.y_axis, self.axes.x_axis)]
+
+        # Return to the start of the job (moving the axes one at a time, since the mock motors cannot be stepped
+        # together)
+        self.axes.move_to([0, 0], pen_speed=np.inf)
+        for axis in (self.axes.y_axis, self.axes.x_axis):
+            axis._motor.step.reset_mock()
+
+        self._replay(job, self.axes.replay_step_schedule)
+
+        np.testing.assert_allclose(self.axes.current_location, [0, 2])
+        replayed_steps = [axis._motor.step.call_count for axis in (self.axes.y_axis, self.axes.x_axis)]
+        np.testing.assert_array_equal(replayed_steps, recorded_steps)
+
+    def test_replay_from_elsewhere_raises(self):
+        job = self._record_job()
+        with self.assertRaises(ValueError):
+            self._replay(job, self.axes.replay_step_schedule)
+
+    def test_plotter_lifts_the_pen_to_move_to_the_start_of_a_replayed_move(self):
+        job = self._record_job()
+        self.axes.move_to([0, 0], pen_speed=np.inf)
+        self.axes.move_to([5, 0], pen_speed=np.inf)
+
+        pen = MagicMock(spec_set=LiftablePen, is_up=False)
+        plotter = Plotter(self.axes, pen, camera=None, pen_to_camera_offset=(0, 0))
+        with self.assertWarnsRegex(UserWarning, 'Moving the pen'):
+            plotter._replay_step_schedule(job.schedule_of(job.events[1]), job.events[1]['start_location'],
+                                          job.events[1]['microsteps'], drops_after=False)
+
+        self.assertEqual(pen.mock_calls[:2], [call.lift(), call.wait(seconds_early=Plotter.pen_lift_overlap_seconds)])
+        pen.drop.assert_called_once_with()
+        np.testing.assert_allclose(self.axes.current_location, [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+import unittest
+
+import numpy as np
+
+import context
+import test_curves
+import roboplot.core.curves as curves
+import roboplot.core.polyline_simplification as polyline_simplification
+
+
+class SimplifyTest(unittest.TestCase):
+    def test_collinear_points_reduce_to_the_ends(self):
+        points = np.column_stack((np.linspace(0, 10, 101), np.linspace(0, 20, 101)))
+        np.testing.assert_array_equal(polyline_simplification.simplify(points, 0.01), [[0, 0], [10, 20]])
+
+    def test_keeps_corners(self):
+        square = np.vstack([np.column_stack((np.linspace(y0, y1, 11), np.linspace(x0, x1, 11)))[:-1]
+                            for (y0, x0), (y1, x1) in [((0, 0), (0, 10)), ((0, 10), (10, 10)),
+                                                       ((10, 10), (10, 0)), ((10, 0), (0, 0))]] + [[[0, 0]]])
+        np.testing.assert_array_equal(polyline_simplification.simplify(square, 0.01),
+                                      [[0, 0], [0, 10], [10, 10], [10, 0], [0, 0]])
+
+    def test_keeps_points_where_the_polyline_turns_back(self):
+        points = np.array([[0, 0], [0, 10], [0, 5]])
+        np.testing.assert_array_equal(polyline_simplification.simplify(points, 0.01), points)
+
+    def test_stays_within_tolerance(self):
+        angles = np.linspace(0, 2 * np.pi, 1000)
+        circle = 50 * np.column_stack((np.sin(angles), np.cos(angles)))
+        for tolerance in [0.01, 0.1, 1]:
+            with self.subTest(tolerance=tolerance):
+                simplified = polyline_simplification.simplify(circle, tolerance)
+                self.assertLess(len(simplified), len(circle) / 2)
+                self.assertLessEqual(test_curves.max_distance_from_polyline(circle, simplified), tolerance)
+                np.testing.assert_array_equal(simplified[[0, -1]], circle[[0, -1]])
+
+    def test_short_polylines_are_unchanged(self):
+        for points in [np.zeros((0, 2)), [[1, 2]], [[1, 2], [3, 4]]]:
+            np.testing.assert_array_equal(polyline_simplification.simplify(points, 1), np.reshape(points, (-1, 2)))
+
+
+class SimplifyLineSegmentsTest(unittest.TestCase):
+    def test_simplifies_runs_of_joined_segments(self):
+        arc = curves.CircularArc([0, 10], 1, 0, 90)
+        curve_list = [curves.LineSegment([0, 0], [0, 1]), curves.LineSegment([0, 1], [0, 2]), arc,
+                      curves.LineSegment([5, 5], [5, 6]), curves.LineSegment([5, 6], [5, 7]),
+                      curves.LineSegment([6, 7], [6, 8])]
+
+        simplified = polyline_simplification.simplify_line_segments(curve_list, 0.01)
+        self.assertEqual(len(simplified), 4)
+        np.testing.assert_array_equal(simplified[0].vertices, [[0, 0], [0, 2]])
+        self.assertIs(simplified[1], arc)
+        np.testing.assert_array_equal(simplified[2].vertices, [[5, 5], [5, 7]])
+        np.testing.assert_array_equal(simplified[3].vertices, [[6, 7], [6, 8]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+import unittest
+
+import context
+import roboplot.core.hardware as hardware
+import roboplot.core.timing as timing
+
+
+class ServoMotorTest(unittest.TestCase):
+    def setUp(self):
+        self.servo = hardware.servo
+        self.original_clock = timing.clock
+        timing.use_clock(timing.VirtualClock())
+
+    def tearDown(self):
+        self.servo.wait()
+        timing.use_clock(self.original_clock)
+
+    def test_moves_in_the_background(self):
+        self.servo.set_position(0.03)
+        move = self.servo.move_smoothly_to(0.06, seconds_to_take=0.25)
+        self.assertIsNone(move.result())
+        self.assertEqual(self.servo._last_set_position, 0.06)
+        self.assertAlmostEqual(timing.now(), 0.25)
+
+    def test_starts_at_the_given_time(self):
+        self.servo.set_position(0.03)
+        self.servo.move_smoothly_to(0.06, seconds_to_take=0.25, start_time=2).result()
+        self.assertAlmostEqual(timing.now(), 2.25)
+
+    def test_moves_run_in_order(self):
+        self.servo.set_position(0.03)
+        self.servo.move_smoothly_to(0.06, seconds_to_take=0.25)
+        self.servo.move_smoothly_to(0.04, seconds_to_take=0.25)
+        self.servo.wait()
+        self.assertEqual(self.servo._last_set_position, 0.04)
+        self.assertAlmostEqual(timing.now(), 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+import unittest
+
+import numpy as np
+
+import context
+import roboplot.core.motion_planning as motion_planning
+import roboplot.core.step_schedule as step_schedule
+
+
+class CompileStepScheduleTest(unittest.TestCase):
+    def setUp(self):
+        self.millimetres_per_step = 0.04
+
+    def _compile(self, points, pen_speed=np.inf):
+        motion_plan = motion_planning.plan_motion(np.array(points, dtype=float), max_speed=pen_speed)
+        target_steps = np.floor(motion_plan.points / self.millimetres_per_step + 0.5).astype(int)
+        return step_schedule.compile_step_schedule(motion_plan, target_steps)
+
+    def _final_displacement_in_steps(self, schedule, axis_field):
+        return np.sum(schedule[axis_field])
+
+    def test_schedule_is_empty_for_a_single_point(self):
+        schedule = self._compile([[1, 1]])
+        self.assertEqual(len(schedule), 0)
+
+    def test_straight_line_in_y_only_steps_y_axis(self):
+        schedule = self._compile([[0, 0], [4, 0]])
+        self.assertEqual(len(schedule), 100)
+        self.assertTrue(np.all(schedule['y_step'] == 1))
+        self.assertTrue(np.all(schedule['x_step'] == 0))
+
+    def test_backwards_move_steps_backwards(self):
+        schedule = self._compile([[0, 0], [0, -2]])
+        self.assertEqual(len(schedule), 50)
+        self.assertTrue(np.all(schedule['y_step'] == 0))
+        self.assertTrue(np.all(schedule['x_step'] == -1))
+
+    def test_diagonal_line_steps_both_axes_together(self):
+        schedule = self._compile([[0, 0], [1, -1]])
+        self.assertEqual(len(schedule), 25)
+        self.assertTrue(np.all(schedule['y_step'] == 1))
+        self.assertTrue(np.all(schedule['x_step'] == -1))
+
+    def test_steps_are_spread_evenly_in_time(self):
+        schedule = self._compile([[0, 0], [0, 4]], pen_speed=4)
+        np.testing.assert_allclose(np.diff(schedule['time']), 0.01)
+        self.assertTrue(0 <= schedule['time'][0] <= schedule['time'][-1] <= 1)
+
+    def test_rounding_errors_do_not_accumulate_over_many_small_moves(self):
+        points = np.column_stack((np.linspace(0, 10, 1001), np.linspace(0, 3, 1001)))
+        schedule = self._compile(points)
+        self.assertEqual(self._final_displacement_in_steps(schedule, 'y_step'), 250)
+        self.assertEqual(self._final_displacement_in_steps(schedule, 'x_step'), 75)
+
+    def test_there_and_back_returns_to_start(self):
+        schedule = self._compile([[0, 0], [3.33, -1.17], [0.01, 0.01], [0, 0]])
+        self.assertEqual(self._final_displacement_in_steps(schedule, 'y_step'), 0)
+        self.assertEqual(self._final_displacement_in_steps(schedule, 'x_step'), 0)
+
+    def test_uneven_diagonal_line_interleaves_steps_evenly(self):
+        schedule = self._compile([[0, 0], [0.12, 0.04]])
+        # The x step and the second y step are both due half way along the line, so share a tick
+        np.testing.assert_array_equal(schedule['y_step'], [1, 1, 1])
+        np.testing.assert_array_equal(schedule['x_step'], [0, 1, 0])
+
+    def test_times_are_in_order(self):
+        points = np.column_stack((np.sin(np.linspace(0, 6, 100)), np.cos(np.linspace(0, 6, 100))))
+        schedule = self._compile(points, pen_speed=3)
+        self.assertTrue(np.all(np.diff(schedule['time']) >= 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import unittest
+
+import numpy as np
+
+import context
+import mock_axes
+import roboplot.core.curves as curves
+import roboplot.core.step_schedule as step_schedule
+import roboplot.core.step_telemetry as step_telemetry
+import roboplot.core.stepper_control as stepper_control
+
+
+def _schedule(num_ticks, seconds_between_ticks=0.01):
+    schedule = np.zeros(num_ticks, dtype=step_schedule.step_tick_dtype)
+    schedule['y_step'] = 1
+    schedule['time'] = np.arange(num_ticks) * seconds_between_ticks
+    return schedule
+
+
+class StepRecorderTest(unittest.TestCase):
+    def test_records_planned_and_actual_times(self):
+        recorder = step_telemetry.StepRecorder(capacity=10)
+        recorder.record_move(_schedule(3), start_time=100, actual_times=np.array([100, 100.02, 100.03]),
+                             tick_curves=np.zeros(3, dtype=int), num_curves=1)
+
+        records = recorder.records()
+        np.testing.assert_allclose(records['planned_time'], [100, 100.01, 100.02])
+        np.testing.assert_allclose(records['actual_time'], [100, 100.02, 100.03])
+        np.testing.assert_array_equal(records['y_step'], 1)
+
+    def test_keeps_only_the_most_recent_ticks(self):
+        recorder = step_telemetry.StepRecorder(capacity=5)
+        for move in range(4):
+            recorder.record_move(_schedule(2), start_time=move, actual_times=np.array([move, move + 0.01]),
+                                 tick_curves=np.zeros(2, dtype=int), num_curves=1)
+
+        records = recorder.records()
+        np.testing.assert_array_equal(records['curve'], [1, 2, 2, 3, 3])
+        self.assertTrue(np.all(np.diff(records['actual_time']) > 0))
+
+    def test_statistics_find_lateness_and_stalls(self):
+        recorder = step_telemetry.StepRecorder()
+        actual_times = np.arange(100) * 0.01
+        actual_times[50:] += 0.02  # A stall before the 50th step
+        recorder.record_move(_schedule(100), start_time=0, actual_times=actual_times,
+                             tick_curves=np.repeat([0, 1], 50), num_curves=2)
+
+        statistics = step_telemetry.compute_curve_statistics(recorder.records())
+        self.assertEqual(len(statistics), 2)
+        self.assertEqual(statistics[0].num_stall_candidates, 0)
+        self.assertEqual(statistics[1].num_stall_candidates, 1)
+        self.assertAlmostEqual(statistics[1].lateness_percentiles[50], 0.02)
+        self.assertAlmostEqual(statistics[0].steps_per_second, 50 / 0.49)
+        self.assertIn('Stalls', step_telemetry.format_curve_statistics(statistics))
+
+
+class AxisPairTelemetryTest(unittest.TestCase):
+    def setUp(self):
+        self.axes = stepper_control.AxisPair(mock_axes.create_axis(), mock_axes.create_axis(), acceleration=np.inf)
+
+    def tearDown(self):
+        step_telemetry.disable()
+
+    def test_records_nothing_when_disabled(self):
+        step_telemetry.disable()
+        self.axes.follow(curves.LineSegment([0, 0], [1, 0]), pen_speed=np.inf)
+        self.assertIsNone(step_telemetry.recorder)
+
+    def test_records_every_tick_against_its_curve(self):
+        recorder = step_telemetry.enable()
+        self.axes.follow_curves([curves.LineSegment([0, 0], [1, 0]), curves.LineSegment([1, 0], [1, 2])],
+                                pen_speed=np.inf)
+
+        records = recorder.records()
+        np.testing.assert_array_equal(np.bincount(records['curve']), [25, 50])
+        self.assertTrue(np.all(records['actual_time'] >= records['planned_time']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+
+import numpy as np
 
 import context
+import mock_axes
+import roboplot.core.curves as curves
 import roboplot.core.home_position
 import roboplot.core.stepper_control as stepper_control
+import roboplot.core.timing as timing
 from roboplot.core.limit_switches import LimitSwitch, UnexpectedLimitSwitchError
 from roboplot.core.stepper_motors import StepperMotor
 
@@ -22,7 +27,8 @@ class BaseTestCases:
         def setUp(self):
             self._mock_limit_switches = (MagicMock(name='switch_1', spec_set=LimitSwitch, is_pressed=False),
                                          MagicMock(name='switch_2', spec_set=LimitSwitch, is_pressed=False))
-            self._mock_motor = MagicMock(name='motor', spec_set=StepperMotor, steps_per_revolution=200, clockwise=True)
+            self._mock_motor = MagicMock(name='motor', spec_set=StepperMotor, steps_per_revolution=200, clockwise=True,
+                                         microsteps=1, max_microsteps=1, phases_per_step=1)
             self._axis = stepper_control.Axis(
                 self._mock_motor,
                 lead=8,
@@ -66,8 +72,12 @@ class AxisStepTests(BaseTestCases.Axis):
         for i in range(10):
             self._axis.step()
 
-        # Then trigger a limit switch press
-        collision_location = self._axis.current_location
+        # Then trigger a limit switch press (which happens after taking the next step)
+        if self._axis.forwards:
+            collision_location = self._axis.current_location + self._axis.millimetres_per_step
+        else:
+            collision_location = self._axis.current_location - self._axis.millimetres_per_step
+
         if self._axis.forwards:
             expected_backoff_location = collision_location - 2
         else:
@@ -109,6 +119,181 @@ class AxisStepTests(BaseTestCases.Axis):
             switch.is_pressed = False
 
 
+class AxisLocationTests(BaseTestCases.Axis):
+    """Tests the tracking of Axis.current_location."""
+
+    def test_location_does_not_drift_over_many_steps(self):
+        self._axis.current_location = 0.1
+        for i in range(5000):
+            self._axis.step()
+        self.assertEqual(self._axis.current_step, 5000)
+        self.assertAlmostEqual(self._axis.current_location, 0.1 + 5000 * self._axis.millimetres_per_step, places=9)
+
+        self._axis.forwards = not self._axis.forwards
+        for i in range(5000):
+            self._axis.step()
+        self.assertEqual(self._axis.current_location, 0.1)
+
+    def test_setting_location_does_not_change_step_count(self):
+        self._axis.step()
+        self._axis.current_location = 12.3
+        self.assertEqual(self._axis.current_step, 1)
+        self.assertEqual(self._axis.current_location, 12.3)
+
+    def test_nearest_reachable_location_is_a_whole_number_of_steps_away(self):
+        self._axis.current_location = 1
+        self.assertAlmostEqual(self._axis.nearest_reachable_location(1.05), 1.04)
+        self.assertAlmostEqual(self._axis.nearest_reachable_location(0.99), 1)
+
+
+class AxisMicrostepTests(unittest.TestCase):
+    """Tests changing the size of the steps taken by an Axis."""
+
+    def setUp(self):
+        self._mock_limit_switches = (MagicMock(name='switch_1', spec_set=LimitSwitch, is_pressed=False),
+                                     MagicMock(name='switch_2', spec_set=LimitSwitch, is_pressed=False))
+        self._motor = StepperMotor(pins=(), sequence=[[]] * 8, steps_per_revolution=200, phases_per_full_step=2)
+        self._motor._step_without_time_check = self._motor._advance_sequence  # Don't touch the GPIO pins
+        self._axis = stepper_control.Axis(self._motor, lead=8, limit_switch_pair=self._mock_limit_switches,
+                                          limit_switch_separation=10000)
+
+    def test_millimetres_per_step_follows_step_size(self):
+        self.assertAlmostEqual(self._axis.millimetres_per_step, 0.04)
+        self._axis.microsteps = 2
+        self.assertAlmostEqual(self._axis.millimetres_per_step, 0.02)
+
+    def test_half_steps_move_half_as_far(self):
+        self._axis.current_location = 0
+        self._axis.microsteps = 2
+        for i in range(3):
+            self._axis.step()
+        self.assertAlmostEqual(self._axis.current_location, 0.06)
+        self.assertEqual(self._axis.current_step, 3)
+
+    def test_changing_to_full_steps_between_full_steps_raises(self):
+        self._axis.current_location = 0
+        self._axis.microsteps = 2
+        self._axis.step()
+
+        with self.assertRaises(ValueError):
+            self._axis.microsteps = 1
+        self.assertEqual(self._axis.microsteps, 2)
+        self.assertAlmostEqual(self._axis.current_location, 0.02)
+
+    def test_finds_the_nearest_location_for_full_steps(self):
+        self._axis.current_location = 0
+        self.assertAlmostEqual(self._axis.nearest_location_for_microsteps(1, towards=-5), 0)
+
+        self._axis.microsteps = 2
+        self._axis.step()
+        self.assertAlmostEqual(self._axis.nearest_location_for_microsteps(1, towards=5), 0.04)
+        self.assertAlmostEqual(self._axis.nearest_location_for_microsteps(1, towards=-5), 0)
+
+    def test_rejects_unsupported_step_sizes(self):
+        with self.assertRaises(ValueError):
+            self._axis.microsteps = 4
+
+
+class AxisPairMicrostepTest(unittest.TestCase):
+    """Tests changing the size of the steps taken by an AxisPair."""
+
+    def setUp(self):
+        def create_axis():
+            motor = StepperMotor(pins=(), sequence=[[]] * 8, steps_per_revolution=200, phases_per_full_step=2)
+            return mock_axes.create_axis(motor)
+
+        self.axes = stepper_control.AxisPair(create_axis(), create_axis())
+        self.axes.current_location = [0, 0]
+
+    def test_moves_to_a_whole_number_of_full_steps_before_taking_full_steps(self):
+        self.axes.move_to([0.02, 0.02], pen_speed=100, microsteps=2)
+
+        with patch.object(self.axes, '_run_step_schedule', wraps=self.axes._run_step_schedule) as run_step_schedule:
+            self.axes.move_to([1, -1], pen_speed=100, microsteps=1)
+
+        # The y-axis carries on forwards, and the x-axis goes back, towards the target, in a half step each
+        realignment = run_step_schedule.call_args_list[0][0][0]
+        self.assertEqual(len(realignment), 1)
+        self.assertEqual((realignment['y_step'][0], realignment['x_step'][0]), (1, -1))
+
+        self.assertEqual((self.axes.y_axis.microsteps, self.axes.x_axis.microsteps), (1, 1))
+        np.testing.assert_allclose(self.axes.current_location, [1, -1])
+
+
+class AxisPairBeforeEndTest(unittest.TestCase):
+    """Tests calling a function shortly before the end of a move."""
+
+    def setUp(self):
+        def create_axis():
+            motor = StepperMotor(pins=(), sequence=[[]] * 4, steps_per_revolution=200)
+            return mock_axes.create_axis(motor)
+
+        self.axes = stepper_control.AxisPair(create_axis(), create_axis(), acceleration=np.inf)
+        self.axes.current_location = [0, 0]
+
+        self.original_clock = timing.clock
+        timing.use_clock(timing.VirtualClock())
+
+        # The location and time at which the function was called
+        self.calls = []
+        self.before_end = lambda: self.calls.append((self.axes.current_location, timing.now()))
+
+    def tearDown(self):
+        timing.use_clock(self.original_clock)
+
+    def test_calls_once_the_move_has_finished_if_it_is_instantaneous(self):
+        self.axes.move_to([0, 10], pen_speed=np.inf)
+        self.axes.follow(curves.LineSegment([0, 10], [10, 0]), pen_speed=np.inf,
+                         before_end=self.before_end, seconds_before_end=0.1)
+
+        self.assertEqual(len(self.calls), 1)
+        np.testing.assert_allclose(self.calls[0][0], [10, 0])
+
+    def test_calls_the_given_time_before_the_end_of_a_timed_move(self):
+        start_time = timing.now()
+        self.axes.follow(curves.LineSegment([0, 0], [0, 10]), pen_speed=10,
+                         before_end=self.before_end, seconds_before_end=0.1)
+
+        self.assertEqual(len(self.calls), 1)
+        location, time = self.calls[0]
+        self.assertAlmostEqual(time - start_time, 0.9, delta=0.01)
+        self.assertAlmostEqual(location[1], 9, delta=0.05)
+        self.assertAlmostEqual(timing.now() - start_time, 1, delta=0.01)
+
+    def test_calls_once_the_move_has_finished_if_it_is_shorter_than_the_time_given(self):
+        self.axes.follow(curves.LineSegment([0, 0], [0, 0.4]), pen_speed=10,
+                         before_end=self.before_end, seconds_before_end=0.1)
+
+        self.assertEqual(len(self.calls), 1)
+        np.testing.assert_allclose(self.calls[0][0], [0, 0.4])
+
+
+class AxisPairMoveLinearlyTest(unittest.TestCase):
+    def setUp(self):
+        def create_axis():
+            motor = StepperMotor(pins=(), sequence=[[]] * 4, steps_per_revolution=200)
+            return mock_axes.create_axis(motor)
+
+        self.axes = stepper_control.AxisPair(create_axis(), create_axis())
+        self.axes.current_location = [0, 0]
+
+        self.original_clock = timing.clock
+        timing.use_clock(timing.VirtualClock())
+
+    def tearDown(self):
+        timing.use_clock(self.original_clock)
+
+    def test_finishes_at_the_target_time(self):
+        self.axes.move_linearly(np.array([0, 10]), target_completion_time=timing.now() + 2)
+        np.testing.assert_allclose(self.axes.current_location, [0, 10])
+        self.assertAlmostEqual(timing.now(), 2, delta=0.01)
+
+    def test_waits_until_the_target_time_when_already_at_the_target(self):
+        self.axes.move_linearly(np.array([0, 0]), target_completion_time=timing.now() + 2)
+        np.testing.assert_allclose(self.axes.current_location, [0, 0])
+        self.assertAlmostEqual(timing.now(), 2)
+
+
 class AxisHomingTest(BaseTestCases.Axis):
     """Tests the behaviour of the Axis.home() method."""
 
@@ -163,6 +348,28 @@ class AxisHomingTest(BaseTestCases.Axis):
                                200 * self._axis.millimetres_per_step,
                                delta=self._axis.millimetres_per_step/2)
 
+    def test_retouches_limit_switch_when_retouch_speed_is_given(self):
+        self._axis.home_position = roboplot.core.home_position.HomePosition(
+            forwards=False, location=0, approach_speed=1000, approach_acceleration=100000, retouch_speed=1000)
+        num_presses = 0
+
+        def count_presses():
+            nonlocal num_presses
+            was_pressed = self._mock_limit_switches[0].is_pressed
+            self._default_motor_side_effect()
+            if self._mock_limit_switches[0].is_pressed and not was_pressed:
+                num_presses += 1
+
+        self._mock_motor.step.side_effect = count_presses
+        self._axis.home()
+
+        self.assertEqual(num_presses, 2)
+        steps_in_2mm = 2 / self._axis.millimetres_per_step
+        self.assertEqual(self.true_motor_location_in_steps, steps_in_2mm)
+        true_motor_location_mm = self.true_motor_location_in_steps * self._axis.millimetres_per_step
+        self.assertAlmostEqual(self._axis.current_location, true_motor_location_mm,
+                               delta=self._axis.millimetres_per_step / 2)
+
 
 class AxisPairHomingTest(unittest.TestCase):
     def setUp(self):
@@ -196,6 +403,12 @@ class AxisPairHomingTest(unittest.TestCase):
         self._both_axes.home()
         self.assertTrue(self._both_axes.is_homed)
 
+    def test_reports_time_taken_to_home(self):
+        report = self._both_axes.home()
+        self.assertGreaterEqual(report.total_seconds, report.x_axis_seconds)
+        self.assertGreaterEqual(report.total_seconds, report.y_axis_seconds)
+        self.assertGreaterEqual(report.y_axis_seconds, 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import os
+import tempfile
 import time
 import unittest
 
@@ -8,6 +9,7 @@ import numpy as np
 
 import context
 import roboplot.config as config
+import test_curves
 import roboplot.svg.svg_parsing as svg
 
 
@@ -55,6 +57,73 @@ class SVGTest(unittest.TestCase):
 
         self.assertTrue(np.allclose(total_points_array, expected_points, atol=2e-1))
 
+    def test_bounding_box_contains_whole_path(self):
+        for filename in ('cubeBezier.svg', 'arc.svg', 'hackspaceSample.svg'):
+            for curve in svg.parse(os.path.join(self.path_to_test_data, filename)):
+                points = curve.to_series_of_points(self.millimetres_per_linear_interval)
+                np.testing.assert_allclose(curve.bounding_box, [np.min(points, axis=0), np.max(points, axis=0)],
+                                           atol=self.millimetres_per_linear_interval)
+
+    def test_arc_length_table_agrees_with_svgpathtools(self):
+        for filename in ('cubeBezier.svg', 'closedArcAndLine.svg', 'stickFigBezier.svg'):
+            for curve in svg.parse(os.path.join(self.path_to_test_data, filename)):
+                path = curve._path
+                arc_lengths = np.linspace(0, path.length(), 50)
+                segment_indices, t_values = svg.ArcLengthTable(path, tolerance=0.01).parameters_at(arc_lengths)
+
+                points = [path[i].point(t) for i, t in zip(segment_indices, t_values)]
+                expected_points = [path.point(path.ilength(s, s_tol=1e-6)) for s in arc_lengths]
+                np.testing.assert_allclose(points, expected_points, atol=0.01)
+
+    def test_points_within_tolerance_stay_close_to_the_path(self):
+        tolerance = 0.1
+        for filename in ('cubeBezier.svg', 'quadBezier.svg', 'arc.svg', 'straightLine.svg'):
+            for curve in svg.parse(os.path.join(self.path_to_test_data, filename)):
+                points = curve.to_series_of_points_within_tolerance(tolerance)
+                dense_points = curve.to_series_of_points(self.millimetres_per_linear_interval / 10)
+                self.assertLess(len(points), len(dense_points) / 5)
+                self.assertLessEqual(test_curves.max_distance_from_polyline(dense_points, points), tolerance)
+
+    def test_native_curves_follow_the_path(self):
+        for filename in ('arc.svg', 'closedArcAndLine.svg', 'cubeBezier.svg', 'quadBezier.svg', 'stickFigBezier.svg'):
+            for curve in svg.parse(os.path.join(self.path_to_test_data, filename)):
+                native_curves = curve.to_native_curves()
+                self.assertAlmostEqual(sum(c.total_millimetres for c in native_curves), curve.total_millimetres,
+                                       places=2)
+
+                points = np.vstack([c.to_series_of_points(self.millimetres_per_linear_interval) for c in native_curves])
+                np.testing.assert_allclose(points[[0, -1]], curve.evaluate_at([0, curve.total_millimetres]), atol=1e-6)
+                path_points = curve.to_series_of_points(self.millimetres_per_linear_interval / 10)
+                self.assertLess(test_curves.max_distance_from_polyline(points, path_points), 0.05)
+
+    def test_iterparse_finds_the_same_paths_as_parse(self):
+        for filename in os.listdir(self.path_to_test_data):
+            if filename.endswith('.svg'):
+                with self.subTest(filename=filename):
+                    filepath = os.path.join(self.path_to_test_data, filename)
+                    parsed_paths = svg.parse(filepath)
+                    iterparsed_paths = list(svg.iterparse(filepath))
+
+                    self.assertListEqual(sorted(p._geometry_key for p in iterparsed_paths),
+                                         sorted(p._geometry_key for p in parsed_paths))
+                    self.assertSetEqual({type(p) for p in iterparsed_paths}, {type(p) for p in parsed_paths})
+
+    def test_iterparse_converts_other_elements(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'shapes.svg')
+            with open(filepath, 'w') as file:
+                file.write('<svg xmlns="http://www.w3.org/2000/svg" width="100mm" height="200mm" viewBox="0 0 50 100">'
+                           '<g><line x1="0" y1="0" x2="10" y2="0"/></g>'
+                           '<polyline points="0,10 10,10 10,20"/>'
+                           '<circle cx="25" cy="50" r="5"/>'
+                           '</svg>')
+
+            paths = list(svg.iterparse(filepath))
+            self.assertEqual(len(paths), 3)
+            self.assertAlmostEqual(paths[0].total_millimetres, 20)
+            self.assertAlmostEqual(paths[1].total_millimetres, 40)
+            self.assertAlmostEqual(paths[2].total_millimetres, 2 * np.pi * 10, places=3)
+
     @staticmethod
     def _overwrite_expected_results_file(expected_results_file, total_points_array):
         # Save point to 5 decimal points, this stops most small numerical changes from causing the tests to fail.
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+import unittest
+
+import context
+import roboplot.core.timing as timing
+
+
+class WallClockTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = timing.WallClock()
+
+    def test_sleep_margin_is_calibrated(self):
+        self.assertGreaterEqual(timing.sleep_margin, 0)
+        self.assertLessEqual(timing.sleep_margin, 0.01)
+
+    def test_does_not_wake_early(self):
+        for seconds in (0, 0.0005, 0.002, 0.02):
+            wake_time = self.clock.now() + seconds
+            self.clock.sleep_until(wake_time)
+            self.assertGreaterEqual(self.clock.now(), wake_time)
+
+    def test_returns_immediately_for_a_time_in_the_past(self):
+        start_time = self.clock.now()
+        self.clock.sleep_until(start_time - 10)
+        self.assertLess(self.clock.now() - start_time, 0.01)
+
+    def test_sleeps_for_most_of_a_long_wait(self):
+        start_cpu_time = time.process_time()
+        self.clock.sleep_until(self.clock.now() + 0.2)
+        self.assertLess(time.process_time() - start_cpu_time, 0.1)
+
+
+class VirtualClockTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = timing.VirtualClock(start_time=10)
+
+    def test_jumps_to_the_wake_time_without_waiting(self):
+        start_time = time.perf_counter()
+        self.clock.sleep_until(3610)
+        self.assertEqual(self.clock.now(), 3610)
+        self.assertLess(time.perf_counter() - start_time, 0.1)
+
+    def test_never_goes_backwards(self):
+        self.clock.sleep_until(5)
+        self.assertEqual(self.clock.now(), 10)
+
+    def test_waits_from_a_common_start_on_different_threads_overlap(self):
+        threads = [threading.Thread(target=self.clock.sleep_until, args=(10 + seconds,)) for seconds in (2, 5, 3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.clock.now(), 15)
+
+
+class ModuleClockTest(unittest.TestCase):
+    def tearDown(self):
+        timing.use_clock(self.original_clock)
+
+    def setUp(self):
+        self.original_clock = timing.clock
+
+    def test_functions_use_the_chosen_clock(self):
+        timing.use_clock(timing.VirtualClock())
+        timing.sleep(2.5)
+        timing.sleep_until(1)
+        self.assertEqual(timing.now(), 2.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
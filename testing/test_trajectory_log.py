@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import context
+import roboplot.core.trajectory_log as trajectory_log
+
+
+class TrajectoryLogTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, 'test.trj')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write_log(self, num_samples, samples_per_batch=4):
+        log = trajectory_log.TrajectoryLog(self.file_path, samples_per_batch)
+        for i in range(num_samples):
+            log.pen_is_down = i % 3 == 0
+            log.record(i / 10, i, -i)
+        return log
+
+    def test_loads_what_was_recorded(self):
+        self._write_log(10).close()
+
+        samples = trajectory_log.load(self.file_path)
+        self.assertIsInstance(samples, np.memmap)
+        np.testing.assert_allclose(samples['time'], np.arange(10) / 10)
+        np.testing.assert_array_equal(samples['location'], [(i, -i) for i in range(10)])
+        np.testing.assert_array_equal(samples['pen_is_down'], [i % 3 == 0 for i in range(10)])
+
+    def test_writes_whole_batches_before_being_closed(self):
+        log = self._write_log(10)
+        self.assertEqual(len(trajectory_log.load(self.file_path)), 8)
+
+        log.flush()
+        self.assertEqual(len(trajectory_log.load(self.file_path)), 10)
+        log.close()
+
+    def test_ignores_a_partly_written_sample(self):
+        self._write_log(3).close()
+        with open(self.file_path, 'ab') as file:
+            file.write(b'\0' * (trajectory_log.trajectory_sample_dtype.itemsize - 1))
+
+        self.assertEqual(len(trajectory_log.load(self.file_path)), 3)
+
+    def test_loads_an_empty_log(self):
+        self._write_log(0).close()
+        self.assertEqual(len(trajectory_log.load(self.file_path)), 0)
+
+    def test_rejects_other_files(self):
+        with open(self.file_path, 'wb') as file:
+            file.write(b'Not a trajectory file at all')
+        with self.assertRaises(ValueError):
+            trajectory_log.load(self.file_path)
+
+
+if __name__ == '__main__':
+    unittest.main()